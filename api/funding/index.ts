@@ -8,6 +8,9 @@ const pool = new Pool({
   }
 });
 
+// funding_totals_global is only trusted while funding_rollup.py keeps refreshing it
+const ROLLUP_MAX_AGE = '15 minutes';
+
 export default async function handler(req: VercelRequest, res: VercelResponse) {
   
   // Set CORS headers
@@ -39,14 +42,31 @@ async function handleGet(req: VercelRequest, res: VercelResponse) {
     console.log('Funding API GET request:', { action, id, owner });
 
     if (action === 'total-raised') {
-      // Get total funds raised across all projects
-      const totalQuery = `
-        SELECT COALESCE(SUM(current_funding), 0) as total_raised
-        FROM project_funding 
-        WHERE is_active = true
-      `;
-      
-      const result = await pool.query(totalQuery);
+      // Get total funds raised across all projects, precomputed by funding_rollup.py
+      let result = null;
+      try {
+        result = await pool.query(`
+          SELECT total_raised
+          FROM funding_totals_global
+          WHERE refreshed_at > NOW() - INTERVAL '${ROLLUP_MAX_AGE}'
+        `);
+      } catch (error: any) {
+        if (error.code !== '42P01') throw error; // undefined_table: rollup not installed
+      }
+      if (!result || result.rows.length === 0) {
+        // Rollup missing, never refreshed or stale; aggregate live (same definition,
+        // archived campaigns of projects that still exist included)
+        result = await pool.query(`
+          SELECT COALESCE(SUM(current_funding), 0) as total_raised
+          FROM (
+            SELECT current_funding, is_active FROM project_funding
+            UNION ALL
+            SELECT a.current_funding, a.is_active FROM project_funding_archive a
+            WHERE EXISTS (SELECT 1 FROM projects p WHERE p.id = a.project_id)
+          ) campaigns
+          WHERE is_active = true
+        `);
+      }
       const totalRaised = parseFloat(result.rows[0].total_raised) || 0;
       
       return res.status(200).json({ totalRaised: Math.round(totalRaised) });
@@ -73,17 +73,48 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
   }
 }
 
+// funding_totals is only trusted while funding_rollup.py keeps refreshing it
+const ROLLUP_MAX_AGE = '15 minutes';
+
+// Every campaign, including the ones archive_expired.py moved to project_funding_archive
+const ALL_CAMPAIGNS = `(
+  SELECT project_id, current_funding FROM project_funding
+  UNION ALL
+  SELECT project_id, current_funding FROM project_funding_archive
+)`;
+
+async function rollupIsFresh(): Promise<boolean> {
+  try {
+    const result = await getPool().query(`
+      SELECT 1
+      FROM funding_totals_global
+      WHERE refreshed_at > NOW() - INTERVAL '${ROLLUP_MAX_AGE}'
+    `);
+    return result.rows.length > 0;
+  } catch (error: any) {
+    if (error.code === '42P01') return false; // undefined_table: rollup not installed
+    throw error;
+  }
+}
+
 async function handleGet(req: VercelRequest, res: VercelResponse) {
   const { id, wallet, status, category, active } = req.query;
 
-  let query = `
+  // Per-project totals precomputed by funding_rollup.py, or aggregated live while it isn't available
+  let query = await rollupIsFresh() ? `
+    SELECT p.*, 
+           COALESCE(ft.total_raised, 0) as current_funding,
+           COALESCE(ft.campaign_count, 0) as backers
+    FROM projects p
+    LEFT JOIN funding_totals ft ON p.id = ft.project_id
+  ` : `
     SELECT p.*, 
            COALESCE(pf_sum.total_funding, 0) as current_funding,
            COALESCE(pf_sum.backer_count, 0) as backers
     FROM projects p
     LEFT JOIN (
       SELECT project_id, SUM(current_funding) as total_funding, COUNT(*) as backer_count
-      FROM project_funding 
+      FROM ${ALL_CAMPAIGNS} campaigns
       GROUP BY project_id
     ) pf_sum ON p.id = pf_sum.project_id
   `;
@@ -315,7 +346,7 @@ async function handlePut(req: VercelRequest, res: VercelResponse) {
 
     // Update project funding totals
     const fundingResult = await getPool().query(
-      'SELECT SUM(current_funding) as total_funding, COUNT(*) as backer_count FROM project_funding WHERE project_id = $1',
+      `SELECT SUM(current_funding) as total_funding, COUNT(*) as backer_count FROM ${ALL_CAMPAIGNS} campaigns WHERE project_id = $1`,
       [id]
     );
 
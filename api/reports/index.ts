@@ -195,8 +195,8 @@ async function handleGetReports(req: any, res: any) {
                  ELSE r.scam_type
                END as item_type
         FROM scam_reports r
-        LEFT JOIN projects p ON (r.scam_identifier ~ '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' AND CAST(r.scam_identifier AS UUID) = p.id AND r.scam_type = 'project')
-        LEFT JOIN job_listings j ON (r.scam_identifier ~ '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' AND CAST(r.scam_identifier AS UUID) = j.id AND r.scam_type = 'user')
+        LEFT JOIN projects p ON p.id = r.project_id
+        LEFT JOIN job_listings j ON j.id = r.job_id
         WHERE r.status = 'verified'
         ORDER BY r.updated_at DESC
       `;
@@ -217,8 +217,8 @@ async function handleGetReports(req: any, res: any) {
                  ELSE r.scam_type
                END as item_type
         FROM scam_reports r
-        LEFT JOIN projects p ON (r.scam_identifier ~ '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' AND CAST(r.scam_identifier AS UUID) = p.id AND r.scam_type = 'project')
-        LEFT JOIN job_listings j ON (r.scam_identifier ~ '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' AND CAST(r.scam_identifier AS UUID) = j.id AND r.scam_type = 'user')
+        LEFT JOIN projects p ON p.id = r.project_id
+        LEFT JOIN job_listings j ON j.id = r.job_id
         WHERE r.status IN ('pending', 'verified')
         ORDER BY r.created_at DESC
       `;
@@ -370,8 +370,8 @@ async function handleUpdateReport(req: any, res: any) {
                    ELSE r.scam_identifier
                  END as project_name
           FROM scam_reports r
-          LEFT JOIN projects p ON (r.scam_identifier ~ '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' AND CAST(r.scam_identifier AS UUID) = p.id AND r.scam_type = 'project')
-          LEFT JOIN job_listings j ON (r.scam_identifier ~ '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' AND CAST(r.scam_identifier AS UUID) = j.id AND r.scam_type = 'user')
+          LEFT JOIN projects p ON p.id = r.project_id
+          LEFT JOIN job_listings j ON j.id = r.job_id
           WHERE r.status = 'verified'
         `;
         const testResult = await client.query(testPausedQuery);
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Archiver
+Moves job listings and funding campaigns that finished longer ago than the
+retention period, with their saved_jobs and funding_contributions rows, into
+*_archive tables in bounded batches so the live tables stay small
+"""
+
+import argparse
+import sys
+
+from psycopg2 import sql
+
+from ops_catalog import SchemaCatalog
+from ops_db import connect_to_database, release_connection
+from ops_throttle import Throttle, add_throttle_args
+
+# Days a listing or campaign stays in the live tables after it finished
+DEFAULT_RETENTION_DAYS = 90
+
+# Parent rows moved per transaction (their children move with them)
+DEFAULT_BATCH_SIZE = 500
+
+# Batches give up rather than queue behind a long transaction on the live tables
+ARCHIVE_LOCK_TIMEOUT = '5s'
+
+ARCHIVE_SUFFIX = '_archive'
+
+# Each archive job: the parent table (aliased as p), which of its rows are eligible and in what
+# order, and the child tables (with their foreign key column) whose rows move first in the
+# same transaction
+JOBS = {
+    'jobs': {
+        'table': 'job_listings',
+        'children': [('saved_jobs', 'job_id')],
+        # Listings with open reports (scam_reports.job_id, no foreign key) are kept
+        'handled': {'saved_jobs'},
+        'eligible': """
+            p.status = 'expired'
+            AND p.expires_at < %(cutoff)s
+        """,
+        'order': "p.expires_at, p.id",
+    },
+    'funding': {
+        'table': 'project_funding',
+        'children': [('funding_contributions', 'project_funding_id')],
+        'handled': {'funding_contributions'},
+        # Archived campaigns still count towards the project totals: funding_rollup.py and the
+        # API's live fallback both read project_funding_archive alongside project_funding
+        'eligible': """
+            (p.is_active = false OR p.is_funded = true)
+            AND p.funding_deadline < %(cutoff)s
+        """,
+        'order': "p.funding_deadline, p.id",
+    },
+}
+
+OPEN_REPORTS_FILTER = """
+            AND NOT EXISTS (
+                SELECT 1 FROM scam_reports r
+                WHERE r.job_id = p.id AND r.status IN ('pending', 'verified')
+            )
+"""
+
+# Live columns (with their types) missing from the archive table
+MISSING_COLUMNS_QUERY = """
+    SELECT a.attname, format_type(a.atttypid, a.atttypmod)
+    FROM pg_attribute a
+    WHERE a.attrelid = %(live)s::regclass
+    AND a.attnum > 0 AND NOT a.attisdropped
+    AND NOT EXISTS (
+        SELECT 1 FROM pg_attribute b
+        WHERE b.attrelid = %(archive)s::regclass
+        AND b.attname = a.attname AND NOT b.attisdropped
+    )
+    ORDER BY a.attnum
+"""
+
+
+def archive_table(table):
+    return f"{table}{ARCHIVE_SUFFIX}"
+
+
+def archived_tables():
+    """Every live table the archiver moves rows out of, children first"""
+    tables = []
+    for job in JOBS.values():
+        tables.extend(child for child, _ in job['children'])
+        tables.append(job['table'])
+    return tables
+
+
+def ensure_archive_tables(conn):
+    """Create the archive tables and add any columns the live tables gained since"""
+    cursor = conn.cursor()
+    try:
+        for table in archived_tables():
+            archive = archive_table(table)
+            cursor.execute(sql.SQL("""
+                CREATE TABLE IF NOT EXISTS {archive} (
+                    LIKE {table} INCLUDING DEFAULTS,
+                    archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+                )
+            """).format(archive=sql.Identifier(archive), table=sql.Identifier(table)))
+            cursor.execute(sql.SQL("CREATE UNIQUE INDEX IF NOT EXISTS {} ON {} (id)").format(
+                sql.Identifier(f"{archive}_id"), sql.Identifier(archive)))
+
+            cursor.execute(MISSING_COLUMNS_QUERY, {'live': table, 'archive': archive})
+            for column, column_type in cursor.fetchall():
+                cursor.execute(sql.SQL("ALTER TABLE {} ADD COLUMN {} {}").format(
+                    sql.Identifier(archive), sql.Identifier(column), sql.SQL(column_type)))
+                print(f"ℹ️  Added {column} to {archive}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def unhandled_references(catalog, job):
+    """Return tables with a foreign key into the job's parent table that the archiver doesn't move.
+
+    Deleting the parent would cascade into (or fail on) those tables without
+    archiving them, so such jobs are skipped.
+    """
+    table = job['table']
+    return [src for src in catalog.referencing(table)
+            if src not in job['handled'] and not src.endswith(ARCHIVE_SUFFIX)]
+
+
+def eligible_clause(catalog, job):
+    """Return the FROM/WHERE selecting the job's archivable parent rows"""
+    where = job['eligible']
+    if job['table'] == 'job_listings' and catalog.has_column('scam_reports', 'job_id'):
+        where += OPEN_REPORTS_FILTER
+    return f"FROM {job['table']} p WHERE {where}"
+
+
+def move_statement(catalog, table, key):
+    """DELETE rows of table whose key is in %(ids)s and insert them into its archive"""
+    columns = sql.SQL(', ').join(sql.Identifier(column) for column in catalog.columns[table])
+    return sql.SQL("""
+        WITH moved AS (
+            DELETE FROM {table} WHERE {key} = ANY(%(ids)s::uuid[])
+            RETURNING {columns}
+        )
+        INSERT INTO {archive} ({columns})
+        SELECT {columns} FROM moved
+        ON CONFLICT (id) DO NOTHING
+    """).format(table=sql.Identifier(table), key=sql.Identifier(key),
+                archive=sql.Identifier(archive_table(table)), columns=columns)
+
+
+def archive_job(conn, catalog, name, cutoff, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, throttle=None):
+    """Move one job's eligible parent rows and their children, one batch per transaction.
+
+    Returns {table: rows moved}. With dry_run each batch is rolled back, so
+    the counts show what would move.
+    """
+    job = JOBS[name]
+    table = job['table']
+    blockers = unhandled_references(catalog, job)
+    if blockers:
+        print(f"⚠️  Skipping {table}: referenced by {', '.join(blockers)}, which the archiver doesn't move")
+        return {}
+
+    batch_query = f"""
+        SELECT p.id {eligible_clause(catalog, job)}
+        ORDER BY {job['order']}
+        LIMIT %(batch_size)s
+        FOR UPDATE SKIP LOCKED
+    """
+    steps = [(child, move_statement(catalog, child, key)) for child, key in job['children']
+             if catalog.has_table(child)]
+    steps.append((table, move_statement(catalog, table, 'id')))
+    params = {'cutoff': cutoff, 'batch_size': batch_size}
+
+    throttle = throttle or Throttle()
+    moved = {step_table: 0 for step_table, _ in steps}
+    cursor = conn.cursor()
+    try:
+        while True:
+            throttle.before_statement(conn)
+            cursor.execute("SELECT set_config('lock_timeout', %s, true)", (ARCHIVE_LOCK_TIMEOUT,))
+            cursor.execute(batch_query, params)
+            ids = [str(row[0]) for row in cursor.fetchall()]
+            if not ids:
+                conn.rollback()
+                break
+            batch_rows = 0
+            for step_table, statement in steps:
+                cursor.execute(statement, {'ids': ids})
+                moved[step_table] += cursor.rowcount
+                batch_rows += cursor.rowcount
+            if dry_run:
+                conn.rollback()
+                # Rolled-back rows would be picked again; one batch is enough to report on
+                print(f"   (dry run: stopped after the first batch of {len(ids)} {table} rows)")
+                break
+            conn.commit()
+            throttle.after_statement(batch_rows)
+            if len(ids) < batch_size:
+                break
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    summary = ", ".join(f"{count} {step_table}" for step_table, count in moved.items())
+    print(f"✅ {'Would archive' if dry_run else 'Archived'} {summary}")
+    return moved
+
+
+def count_eligible(conn, catalog, cutoff):
+    """Return {job: parent rows currently eligible for archiving}"""
+    cursor = conn.cursor()
+    counts = {}
+    try:
+        for name, job in JOBS.items():
+            cursor.execute(f"SELECT COUNT(*) {eligible_clause(catalog, job)}",
+                           {'cutoff': cutoff})
+            counts[name] = cursor.fetchone()[0]
+    finally:
+        conn.rollback()
+        cursor.close()
+    return counts
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard expired listing and campaign archiver")
+    parser.add_argument("--retention-days", type=int, default=DEFAULT_RETENTION_DAYS,
+                        help=f"keep finished rows live for N days (default {DEFAULT_RETENTION_DAYS})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"parent rows moved per transaction (default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--only", choices=tuple(JOBS), default=None,
+                        help="archive only job listings or only funding campaigns")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="count eligible rows and roll back a single batch instead of archiving")
+    add_throttle_args(parser)
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_args()
+
+    print("📦 BoneBoard Archiver")
+    print("=" * 50)
+
+    conn = connect_to_database()
+    if not conn:
+        sys.exit(1)
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT NOW() - make_interval(days => %s)", (args.retention_days,))
+        cutoff = cursor.fetchone()[0]
+        cursor.close()
+        conn.commit()
+        print(f"🗓️  Archiving rows that finished before {cutoff:%Y-%m-%d %H:%M:%S}")
+
+        ensure_archive_tables(conn)
+        catalog = SchemaCatalog.load(conn.cursor())
+        if args.dry_run:
+            for name, count in count_eligible(conn, catalog, cutoff).items():
+                print(f"   {JOBS[name]['table']}: {count} eligible")
+
+        throttle = Throttle.from_args(args)
+        for name in ([args.only] if args.only else JOBS):
+            archive_job(conn, catalog, name, cutoff, args.batch_size, args.dry_run, throttle)
+        throttle.report()
+    except Exception as e:
+        print(f"❌ Error during archiving: {e}")
+        sys.exit(1)
+    finally:
+        release_connection(conn)
+        print("\n🔌 Database connection closed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Query Benchmark
+Times the API's hot listing queries against a local PostgreSQL at several data
+sizes, captures EXPLAIN (ANALYZE, BUFFERS) plans and compares with a baseline
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from datetime import datetime, timezone
+
+from generate_load_data import is_local_database, load_data, scaled_counts
+from ops_db import connect_to_database, get_database_url, release_connection
+
+DEFAULT_ITERATIONS = 50
+DEFAULT_WARMUP = 5
+
+# A query regresses when its p95 grows by more than this fraction and by more than MIN_REGRESSION_MS
+DEFAULT_THRESHOLD = 0.20
+MIN_REGRESSION_MS = 1.0
+
+# Regex test used by the report queries to decide whether scam_identifier is a UUID
+UUID_PATTERN = "'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'"
+
+JOBS_SELECT = """
+    SELECT
+      j.*,
+      p.is_verified as project_verified,
+      p.status as project_status
+    FROM job_listings j
+    LEFT JOIN projects p ON j.project_id = p.id
+"""
+
+FUNDING_LIST_SELECT = """
+    SELECT
+      pf.*,
+      p.title,
+      p.title as project_title,
+      p.description,
+      p.category,
+      p.logo,
+      p.website,
+      p.twitter_link,
+      p.discord_link,
+      p.discord_invite,
+      p.is_verified,
+      CASE
+        WHEN pf.funding_goal > 0 THEN
+          LEAST(COALESCE((pf.current_funding / pf.funding_goal) * 100, 0), 100)
+        ELSE 0
+      END as progress_percentage,
+      (
+        SELECT COUNT(*)
+        FROM funding_contributions fc
+        WHERE fc.project_funding_id = pf.id
+      ) as contributor_count
+    FROM project_funding pf
+    LEFT JOIN projects p ON pf.project_id = p.id
+    LEFT JOIN users u ON p.user_id = u.id
+"""
+
+REPORTS_COLUMNS = """
+    SELECT r.*,
+           CASE
+             WHEN r.scam_type = 'project' THEN p.title
+             WHEN r.scam_type = 'user' THEN j.title
+             ELSE r.scam_identifier
+           END as project_name,
+           CASE
+             WHEN r.scam_type = 'project' THEN 'project'
+             WHEN r.scam_type = 'job' THEN 'job'
+             WHEN r.scam_type = 'user' THEN 'job'
+             ELSE r.scam_type
+           END as item_type
+    FROM scam_reports r
+"""
+
+# The API joins on the typed targets report_targets.py maintains
+REPORTS_SELECT = REPORTS_COLUMNS + """
+    LEFT JOIN projects p ON p.id = r.project_id
+    LEFT JOIN job_listings j ON j.id = r.job_id
+"""
+
+# The join the API used before the typed targets, kept as a comparison. AND doesn't fix
+# evaluation order, so the cast sits behind a CASE or non-UUID identifiers fail the query
+REPORT_TARGET = f"CASE WHEN r.scam_identifier ~ {UUID_PATTERN} THEN CAST(r.scam_identifier AS UUID) END"
+
+LEGACY_REPORTS_SELECT = REPORTS_COLUMNS + f"""
+    LEFT JOIN projects p ON ({REPORT_TARGET} = p.id AND r.scam_type = 'project')
+    LEFT JOIN job_listings j ON ({REPORT_TARGET} = j.id AND r.scam_type = 'user')
+"""
+
+# Queries to find realistic parameter values in the loaded data
+SAMPLE_QUERIES = {
+    'job_id': "SELECT id FROM job_listings ORDER BY id LIMIT 1",
+    'wallet': "SELECT user_id FROM job_listings ORDER BY id LIMIT 1",
+    'status': "SELECT 'confirmed'",
+    'funding_id': """
+        SELECT project_funding_id FROM funding_contributions
+        GROUP BY project_funding_id ORDER BY COUNT(*) DESC, project_funding_id LIMIT 1
+    """,
+    'funding_owner': "SELECT wallet_address FROM project_funding ORDER BY id LIMIT 1",
+}
+
+# Hot statements from api/, translated to psycopg2 placeholders: name -> (sql, sample params)
+HOT_QUERIES = {
+    # api/jobs/index.ts handleGet
+    'jobs_list_all': (JOBS_SELECT + " ORDER BY j.created_at DESC", ()),
+    'jobs_list_active': (JOBS_SELECT + """
+        WHERE j.expires_at > NOW() AND j.status IN ('confirmed', 'pending') AND j.status != 'paused'
+        ORDER BY j.created_at DESC""", ()),
+    'jobs_by_wallet': (JOBS_SELECT + " WHERE j.user_id = %s ORDER BY j.created_at DESC", ('wallet',)),
+    'jobs_by_status': (JOBS_SELECT + " WHERE j.status = %s ORDER BY j.created_at DESC", ('status',)),
+    'jobs_by_id': (JOBS_SELECT + " WHERE j.id = %s ORDER BY j.created_at DESC", ('job_id',)),
+    # api/funding/index.ts handleGet
+    'funding_total_raised': ("""
+        SELECT COALESCE(SUM(current_funding), 0) as total_raised
+        FROM project_funding
+        WHERE is_active = true""", ()),
+    'funding_list_active': (FUNDING_LIST_SELECT + " WHERE pf.is_active = true ORDER BY pf.created_at DESC", ()),
+    'funding_list_owner': (FUNDING_LIST_SELECT + " WHERE pf.wallet_address = %s ORDER BY pf.created_at DESC",
+                           ('funding_owner',)),
+    'funding_single': ("""
+        SELECT
+          pf.*,
+          p.title,
+          p.description,
+          p.category,
+          p.logo,
+          p.website,
+          p.twitter_link,
+          p.discord_link,
+          p.discord_invite,
+          p.is_verified,
+          p.user_id as project_owner_id,
+          u.wallet_address as owner_wallet
+        FROM project_funding pf
+        LEFT JOIN projects p ON pf.project_id = p.id
+        LEFT JOIN users u ON p.user_id = u.id
+        WHERE pf.id = %s""", ('funding_id',)),
+    'funding_contributions': ("""
+        SELECT
+          fc.*,
+          u.username,
+          CASE
+            WHEN fc.is_anonymous = true THEN 'Anonymous'
+            WHEN u.username IS NOT NULL AND u.username != '' THEN u.username
+            ELSE SUBSTRING(fc.contributor_wallet, 1, 8) || '...' || SUBSTRING(fc.contributor_wallet, -6)
+          END as display_name
+        FROM funding_contributions fc
+        LEFT JOIN users u ON fc.contributor_wallet = u.wallet_address
+        WHERE fc.project_funding_id = %s
+        ORDER BY fc.created_at DESC""", ('funding_id',)),
+    # api/reports/index.ts admin listings
+    'reports_active': (REPORTS_SELECT + " WHERE r.status IN ('pending', 'verified') ORDER BY r.created_at DESC", ()),
+    'reports_paused': (REPORTS_SELECT + " WHERE r.status = 'verified' ORDER BY r.updated_at DESC", ()),
+    # Pre-report_targets.py join of reports_active, for comparison
+    'reports_active_legacy': (LEGACY_REPORTS_SELECT + """
+        WHERE r.status IN ('pending', 'verified') ORDER BY r.created_at DESC""", ()),
+}
+
+
+def resolve_params(cursor, names):
+    """Look up sample values for a query's parameter names"""
+    params = []
+    for name in names:
+        cursor.execute(SAMPLE_QUERIES[name])
+        row = cursor.fetchone()
+        params.append(row[0] if row else None)
+    return tuple(params)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize_plan(plan):
+    """Pull the numbers worth diffing out of an EXPLAIN (FORMAT JSON) plan"""
+    seq_scans = []
+
+    def walk(node):
+        if node.get('Node Type') == 'Seq Scan':
+            seq_scans.append(node.get('Relation Name'))
+        for child in node.get('Plans', ()):
+            walk(child)
+
+    root = plan['Plan']
+    walk(root)
+    return {
+        'execution_ms': plan.get('Execution Time'),
+        'planning_ms': plan.get('Planning Time'),
+        'root_node': root.get('Node Type'),
+        'rows': root.get('Actual Rows'),
+        'shared_hit_blocks': root.get('Shared Hit Blocks'),
+        'shared_read_blocks': root.get('Shared Read Blocks'),
+        'seq_scans': sorted(set(seq_scans)),
+    }
+
+
+def explain(cursor, query, params):
+    """Run EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) and return the plan document"""
+    cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query, params)
+    return cursor.fetchone()[0][0]
+
+
+def benchmark_query(conn, query, params, iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP):
+    """Time execute + fetch of one query; return latency stats in milliseconds and the plan"""
+    cursor = conn.cursor()
+    try:
+        for _ in range(warmup):
+            cursor.execute(query, params)
+            cursor.fetchall()
+
+        timings = []
+        rows = 0
+        for _ in range(iterations):
+            start = time.perf_counter()
+            cursor.execute(query, params)
+            rows = len(cursor.fetchall())
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+
+        plan = explain(cursor, query, params)
+        conn.rollback()
+    finally:
+        cursor.close()
+
+    return {
+        'rows': rows,
+        'p50_ms': round(percentile(timings, 0.50), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'mean_ms': round(sum(timings) / len(timings), 3) if timings else 0.0,
+        'plan_summary': summarize_plan(plan),
+        'plan': plan,
+    }
+
+
+def run_benchmarks(conn, names, iterations, warmup):
+    """Benchmark the named hot queries against whatever data is loaded"""
+    cursor = conn.cursor()
+    results = {}
+    for name in names:
+        query, param_names = HOT_QUERIES[name]
+        params = resolve_params(cursor, param_names)
+        conn.rollback()
+        try:
+            result = benchmark_query(conn, query, params, iterations, warmup)
+        except Exception as e:
+            # Record the failure (e.g. a cast the planner evaluates before its guard) and keep going
+            conn.rollback()
+            results[name] = {'error': str(e).strip()}
+            print(f"  {name:<24} ❌ {str(e).strip()}")
+            continue
+        results[name] = result
+        seq = f" seq scans: {', '.join(result['plan_summary']['seq_scans'])}" if result['plan_summary']['seq_scans'] else ""
+        print(f"  {name:<24} p50 {result['p50_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms  "
+              f"p99 {result['p99_ms']:>9.2f} ms  rows {result['rows']:>7}{seq}")
+    cursor.close()
+    return results
+
+
+def compare_with_baseline(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return a list of regression messages for p95 latencies that grew past the threshold"""
+    regressions = []
+    for size, queries in results['sizes'].items():
+        for name, result in queries.items():
+            before = baseline.get('sizes', {}).get(size, {}).get(name)
+            if 'error' in result:
+                if before and 'error' not in before:
+                    regressions.append(f"{name} @ scale {size}: now fails: {result['error']}")
+                continue
+            if not before or 'error' in before:
+                continue
+            old, new = before['p95_ms'], result['p95_ms']
+            if new - old > MIN_REGRESSION_MS and new > old * (1 + threshold):
+                regressions.append(f"{name} @ scale {size}: p95 {old:.2f} ms → {new:.2f} ms "
+                                   f"(+{(new / old - 1) * 100 if old else float('inf'):.0f}%)")
+    return regressions
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard hot query benchmark")
+    parser.add_argument("--sizes", default="0.1,1",
+                        help="comma-separated generate_load_data.py scale factors to benchmark (default 0.1,1)")
+    parser.add_argument("--no-load", action="store_true",
+                        help="benchmark the data already in the database instead of loading each size")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated data")
+    parser.add_argument("--queries", default=",".join(HOT_QUERIES),
+                        help="comma-separated subset of queries to run")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS,
+                        help=f"timed runs per query (default {DEFAULT_ITERATIONS})")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP,
+                        help=f"untimed runs per query first (default {DEFAULT_WARMUP})")
+    parser.add_argument("--output", default=None, help="write results (with plans) to this JSON file")
+    parser.add_argument("--baseline", default=None, help="compare against a previous results file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"allowed p95 growth before failing, as a fraction (default {DEFAULT_THRESHOLD})")
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="allow loading benchmark data into a non-local database")
+    return parser.parse_args()
+
+
+def main():
+    """Main function to run the benchmarks"""
+    args = parse_args()
+
+    print("⏱️  BoneBoard Query Benchmark")
+    print("=" * 50)
+
+    names = [name.strip() for name in args.queries.split(",") if name.strip()]
+    unknown = [name for name in names if name not in HOT_QUERIES]
+    if unknown:
+        print(f"❌ Unknown queries: {', '.join(unknown)}")
+        sys.exit(1)
+
+    database_url = get_database_url()
+    if not args.no_load and database_url and not args.allow_remote and not is_local_database(database_url):
+        print("❌ Refusing to load benchmark data into a non-local database (use --allow-remote or --no-load)")
+        sys.exit(1)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    conn = connect_to_database()
+    if not conn:
+        sys.exit(1)
+
+    sizes = ["current"] if args.no_load else [size.strip() for size in args.sizes.split(",")]
+    results = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'iterations': args.iterations,
+        'sizes': {},
+    }
+    try:
+        for size in sizes:
+            if size != "current":
+                print(f"\n📦 Loading data at scale {size}...")
+                load_data(conn, scaled_counts(float(size)), seed=args.seed, truncate=True)
+            print(f"\n📊 Scale {size}:")
+            results['sizes'][size] = run_benchmarks(conn, names, args.iterations, args.warmup)
+    except Exception as e:
+        print(f"❌ Error during benchmark: {e}")
+        conn.rollback()
+        sys.exit(1)
+    finally:
+        release_connection(conn)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"\n💾 Results written to {args.output}")
+
+    if baseline:
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -350,3 +350,132 @@ CREATE INDEX idx_admin_activity_log_created_at ON admin_activity_log(created_at
 CREATE TRIGGER update_scam_reports_updated_at BEFORE UPDATE ON scam_reports FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_project_funding_updated_at BEFORE UPDATE ON project_funding FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_platform_settings_updated_at BEFORE UPDATE ON platform_settings FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Expiry daemon (expire.py --daemon)
+CREATE TABLE expiry_watermarks (
+    name VARCHAR(50) PRIMARY KEY,
+    swept_to TIMESTAMP WITH TIME ZONE NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX idx_job_listings_expires_at ON job_listings(expires_at);
+CREATE INDEX idx_project_funding_deadline ON project_funding(funding_deadline);
+
+-- Duplicate listing detection (dedup_jobs.py)
+CREATE INDEX idx_job_listings_tx_hash ON job_listings USING hash (tx_hash);
+CREATE INDEX idx_job_listings_content_fingerprint ON job_listings USING hash (md5(title || '|' || company || '|' || user_id));
+
+-- Funding rollup (funding_rollup.py)
+CREATE TABLE funding_totals (
+    project_id UUID PRIMARY KEY REFERENCES projects(id) ON DELETE CASCADE,
+    total_raised DECIMAL(20,6) NOT NULL DEFAULT 0,
+    campaign_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE TABLE funding_totals_global (
+    id BOOLEAN PRIMARY KEY DEFAULT true CHECK (id),
+    total_raised DECIMAL(20,6) NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+INSERT INTO funding_totals_global (id) VALUES (true);
+
+-- Typed scam report targets (report_targets.py); no foreign keys, so TRUNCATE ... CASCADE
+-- on projects or job_listings leaves the reports alone
+ALTER TABLE scam_reports
+    ADD COLUMN project_id UUID,
+    ADD COLUMN job_id UUID;
+
+CREATE INDEX idx_scam_reports_project_id ON scam_reports(project_id) WHERE project_id IS NOT NULL;
+CREATE INDEX idx_scam_reports_job_id ON scam_reports(job_id) WHERE job_id IS NOT NULL;
+
+CREATE OR REPLACE FUNCTION resolve_scam_report_target()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.project_id = NULL;
+    NEW.job_id = NULL;
+    IF NEW.scam_identifier ~ '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' THEN
+        IF NEW.scam_type = 'project' THEN
+            SELECT id INTO NEW.project_id FROM projects WHERE id = NEW.scam_identifier::uuid;
+        ELSIF NEW.scam_type = 'user' THEN
+            SELECT id INTO NEW.job_id FROM job_listings WHERE id = NEW.scam_identifier::uuid;
+        END IF;
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER resolve_scam_report_target BEFORE INSERT OR UPDATE OF scam_type, scam_identifier ON scam_reports FOR EACH ROW EXECUTE FUNCTION resolve_scam_report_target();
+
+-- Resolving a target alone doesn't bump updated_at (the admin views sort by it)
+DROP TRIGGER update_scam_reports_updated_at ON scam_reports;
+CREATE TRIGGER update_scam_reports_updated_at BEFORE UPDATE ON scam_reports FOR EACH ROW
+    WHEN (NOT ((OLD.project_id, OLD.job_id) IS DISTINCT FROM (NEW.project_id, NEW.job_id))
+          OR to_jsonb(OLD) - 'project_id' - 'job_id' - 'updated_at' IS DISTINCT FROM to_jsonb(NEW) - 'project_id' - 'job_id' - 'updated_at')
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Archived listings and campaigns (archive_expired.py)
+CREATE TABLE job_listings_archive (LIKE job_listings INCLUDING DEFAULTS, archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW());
+CREATE TABLE saved_jobs_archive (LIKE saved_jobs INCLUDING DEFAULTS, archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW());
+CREATE TABLE project_funding_archive (LIKE project_funding INCLUDING DEFAULTS, archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW());
+CREATE TABLE funding_contributions_archive (LIKE funding_contributions INCLUDING DEFAULTS, archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW());
+
+CREATE UNIQUE INDEX job_listings_archive_id ON job_listings_archive(id);
+CREATE UNIQUE INDEX saved_jobs_archive_id ON saved_jobs_archive(id);
+CREATE UNIQUE INDEX project_funding_archive_id ON project_funding_archive(id);
+CREATE UNIQUE INDEX funding_contributions_archive_id ON funding_contributions_archive(id);
+
+-- Incremental snapshot refresh (ops_cache.py)
+CREATE INDEX idx_projects_updated_at ON projects(updated_at);
+CREATE INDEX idx_job_listings_updated_at ON job_listings(updated_at);
+CREATE INDEX idx_project_funding_updated_at ON project_funding(updated_at);
+
+-- Change feed notifications (change_feed.py)
+CREATE OR REPLACE FUNCTION notify_boneboard_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed_count BIGINT;
+    changed_ids TEXT[];
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM pg_notify('boneboard_changes', json_build_object(
+            'table', TG_TABLE_NAME,
+            'op', TG_OP,
+            'count', NULL,
+            'ids', NULL,
+            'at', clock_timestamp()
+        )::text);
+        RETURN NULL;
+    END IF;
+    SELECT COUNT(*) INTO changed_count FROM changed_rows;
+    IF changed_count = 0 THEN
+        RETURN NULL;
+    END IF;
+    IF changed_count <= 100 THEN
+        SELECT array_agg(id::text) INTO changed_ids FROM changed_rows;
+    END IF;
+    PERFORM pg_notify('boneboard_changes', json_build_object(
+        'table', TG_TABLE_NAME,
+        'op', TG_OP,
+        'count', changed_count,
+        'ids', changed_ids,
+        'at', clock_timestamp()
+    )::text);
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER job_listings_change_feed_insert AFTER INSERT ON job_listings REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_boneboard_change();
+CREATE TRIGGER job_listings_change_feed_update AFTER UPDATE ON job_listings REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_boneboard_change();
+CREATE TRIGGER job_listings_change_feed_delete AFTER DELETE ON job_listings REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_boneboard_change();
+CREATE TRIGGER job_listings_change_feed_truncate AFTER TRUNCATE ON job_listings FOR EACH STATEMENT EXECUTE FUNCTION notify_boneboard_change();
+CREATE TRIGGER project_funding_change_feed_insert AFTER INSERT ON project_funding REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_boneboard_change();
+CREATE TRIGGER project_funding_change_feed_update AFTER UPDATE ON project_funding REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_boneboard_change();
+CREATE TRIGGER project_funding_change_feed_delete AFTER DELETE ON project_funding REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_boneboard_change();
+CREATE TRIGGER project_funding_change_feed_truncate AFTER TRUNCATE ON project_funding FOR EACH STATEMENT EXECUTE FUNCTION notify_boneboard_change();
+CREATE TRIGGER funding_contributions_change_feed_insert AFTER INSERT ON funding_contributions REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_boneboard_change();
+CREATE TRIGGER funding_contributions_change_feed_update AFTER UPDATE ON funding_contributions REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_boneboard_change();
+CREATE TRIGGER funding_contributions_change_feed_delete AFTER DELETE ON funding_contributions REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_boneboard_change();
+CREATE TRIGGER funding_contributions_change_feed_truncate AFTER TRUNCATE ON funding_contributions FOR EACH STATEMENT EXECUTE FUNCTION notify_boneboard_change();
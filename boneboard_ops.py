@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Ops CLI
+check, expire, clear and fill-funding commands on the asyncio core, with
+independent statements pipelined on one connection
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+
+from check_database import JOBS_QUERY, PROJECTS_QUERY
+from clear_database import REFERENCING_QUERY, RESET_LOCK_TIMEOUT, RESET_TABLES, cascade_blockers
+from expire import DEFAULT_BATCH_SIZE, EXPIRE_FUNDING_QUERY, EXPIRE_JOBS_QUERY
+from fill_funding_goals import ACTIVE_FUNDING_QUERY
+from ops_async import connect_async, fetch_pipelined, psycopg, run_pipeline
+
+# Everything the check command shows, fetched in a single pipeline
+CHECK_QUERIES = {
+    'project_count': ("SELECT COUNT(*) FROM projects", None),
+    'job_count': ("SELECT COUNT(*) FROM job_listings", None),
+    'job_status': ("""
+        SELECT status, COUNT(*) FROM job_listings
+        GROUP BY status ORDER BY COUNT(*) DESC
+    """, None),
+    'funding_status': ("""
+        SELECT CASE
+                   WHEN is_funded = true THEN 'completed'
+                   WHEN funding_deadline < NOW() THEN 'expired'
+                   ELSE 'active'
+               END AS status,
+               COUNT(*)
+        FROM project_funding
+        GROUP BY 1 ORDER BY 2 DESC
+    """, None),
+    'associations': ("SELECT COUNT(project_id), COUNT(*) - COUNT(project_id) FROM job_listings", None),
+}
+
+FILL_FUNDING_QUERY = """
+    UPDATE project_funding pf
+    SET current_funding = pf.funding_goal, is_funded = true
+    FROM projects p
+    WHERE p.id = pf.project_id
+    AND pf.is_active = true AND pf.is_funded = false
+    AND pf.id = ANY(%s::uuid[])
+    RETURNING pf.id
+"""
+
+
+async def check(conn, args):
+    """Print counts, status breakdowns and the most recent rows from one pipeline"""
+    queries = dict(CHECK_QUERIES)
+    queries['recent_projects'] = (PROJECTS_QUERY + " LIMIT %s", (args.limit,))
+    queries['recent_jobs'] = (JOBS_QUERY + " LIMIT %s", (args.limit,))
+
+    start = time.perf_counter()
+    results = await fetch_pipelined(conn, queries)
+    elapsed = time.perf_counter() - start
+    await conn.rollback()
+
+    print(f"\n📋 PROJECTS ({results['project_count'][0][0]} total)")
+    print("=" * 80)
+    for project_id, title, category, wallet, created_at, verified in results['recent_projects']:
+        print(f"  {created_at:%Y-%m-%d %H:%M}  {title} ({category}) {'✅' if verified else '❌'}  {project_id}")
+
+    print(f"\n💼 JOB LISTINGS ({results['job_count'][0][0]} total)")
+    print("=" * 80)
+    for job_id, title, company, project_id, user_id, created_at, status, project_title in results['recent_jobs']:
+        project = f"🔗 {project_title}" if project_id else "🔗 none"
+        print(f"  {created_at:%Y-%m-%d %H:%M}  {title} @ {company} [{status}] {project}")
+
+    print("\n📊 STATUS")
+    print("=" * 80)
+    print("Job Status Summary:")
+    for status, count in results['job_status']:
+        print(f"  {status}: {count} jobs")
+    print("Funding Project Status Summary:")
+    for status, count in results['funding_status']:
+        print(f"  {status}: {count} projects")
+    with_projects, without_projects = results['associations'][0]
+    print(f"Jobs with project association: {with_projects}")
+    print(f"Jobs without project association: {without_projects}")
+
+    print(f"\n⏱️  {len(queries)} queries in one pipeline: {elapsed * 1000:.1f} ms")
+
+
+async def expire(conn, args):
+    """Expire due jobs and funding projects, pipelining one batch of each per transaction"""
+    params = {'since': '-infinity', 'until': None, 'ids': None, 'batch_size': args.batch_size}
+    pending = {'jobs': EXPIRE_JOBS_QUERY, 'funding': EXPIRE_FUNDING_QUERY}
+    totals = {name: 0 for name in pending}
+
+    print("\n🧹 RUNNING EXPIRY SWEEP:")
+    print("=" * 50)
+    while pending:
+        names = list(pending)
+        results = await run_pipeline(conn, [(pending[name], params) for name in names])
+        await conn.commit()
+        for name, (rows, _) in zip(names, results):
+            totals[name] += len(rows)
+            if len(rows) < args.batch_size:
+                del pending[name]
+
+    print(f"✅ Expired {totals['jobs']} jobs")
+    print(f"✅ Deactivated {totals['funding']} funding projects")
+
+
+async def clear(conn, args):
+    """Count, then TRUNCATE the reset tables in one transaction"""
+    found = await fetch_pipelined(conn, {
+        table: ("SELECT to_regclass(%s) IS NOT NULL", (table,)) for table in RESET_TABLES
+    })
+    tables = [table for table in RESET_TABLES if found[table][0][0]]
+    if not tables:
+        print("ℹ️  No tables to reset")
+        await conn.rollback()
+        return
+
+    queries = {
+        table: (psycopg.sql.SQL("SELECT COUNT(*) FROM {}").format(psycopg.sql.Identifier(table)), None)
+        for table in tables
+    }
+    queries['referencing'] = (REFERENCING_QUERY, (tables,))
+    counts = await fetch_pipelined(conn, queries)
+    kept = cascade_blockers([row[0] for row in counts['referencing']], tables)
+    print("\n📊 Current database state:")
+    for table in tables:
+        print(f"   {table}: {counts[table][0][0]} records")
+    await conn.rollback()
+
+    if not args.yes:
+        confirm = input("\n❓ Are you sure you want to proceed? Type 'YES' to continue: ")
+        if confirm != 'YES':
+            print("❌ Operation cancelled")
+            return
+
+    print("\n⚡ Fast reset (TRUNCATE)...")
+    lock_timeout = ("SELECT set_config('lock_timeout', %s, true)", (RESET_LOCK_TIMEOUT,))
+    if kept:
+        # CASCADE would empty these regardless of their ON DELETE action (see fast_reset)
+        print(f"⚠️  TRUNCATE CASCADE would also empty {', '.join(kept)}; deleting instead")
+        results = await run_pipeline(conn, [lock_timeout] + [
+            (psycopg.sql.SQL("DELETE FROM {}").format(psycopg.sql.Identifier(table)), None) for table in tables
+        ])
+        await conn.commit()
+        for table, (_, deleted) in zip(tables, results[1:]):
+            print(f"✅ Deleted {deleted} rows from {table}")
+        return
+
+    await run_pipeline(conn, [
+        lock_timeout,
+        (psycopg.sql.SQL("TRUNCATE {} RESTART IDENTITY CASCADE").format(
+            psycopg.sql.SQL(', ').join(psycopg.sql.Identifier(table) for table in tables)), None),
+    ])
+    await conn.commit()
+    print(f"✅ Truncated {', '.join(tables)}")
+
+
+async def fill_funding(conn, args):
+    """Fill every active, unfunded campaign's goal in a single UPDATE"""
+    projects = (await fetch_pipelined(conn, {'active': (ACTIVE_FUNDING_QUERY, None)}))['active']
+    await conn.rollback()
+    if not projects:
+        print("ℹ️  No active funding projects found")
+        return
+
+    print(f"\n🎯 Found {len(projects)} active funding projects:")
+    print("-" * 80)
+    for funding_id, project_id, title, funding_goal, current_funding, is_active, is_funded in projects:
+        print(f"📋 {title}: {current_funding}/{funding_goal} ADA  ({funding_id})")
+
+    print("\n⚠️  This will fill ALL funding goals to 100% completion!")
+    if not args.yes:
+        confirm = input("Do you want to proceed? (yes/no): ").lower().strip()
+        if confirm not in ['yes', 'y']:
+            print("❌ Operation cancelled")
+            return
+
+    results = await run_pipeline(conn, [(FILL_FUNDING_QUERY, ([str(project[0]) for project in projects],))])
+    await conn.commit()
+    print(f"\n🎉 Successfully filled {len(results[0][0])}/{len(projects)} funding goals!")
+
+
+COMMANDS = {
+    'check': check,
+    'expire': expire,
+    'clear': clear,
+    'fill-funding': fill_funding,
+}
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard ops commands on the async pipelined core")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check_parser = commands.add_parser("check", help="inspect projects, jobs and funding")
+    check_parser.add_argument("--limit", type=int, default=10,
+                              help="recent projects and jobs to show (default 10)")
+
+    expire_parser = commands.add_parser("expire", help="expire every due job and funding project")
+    expire_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                               help=f"rows updated per statement (default {DEFAULT_BATCH_SIZE})")
+
+    clear_parser = commands.add_parser("clear", help="TRUNCATE jobs, projects and funding data")
+    clear_parser.add_argument("--yes", action="store_true", help="skip the confirmation prompt")
+
+    fill_parser = commands.add_parser("fill-funding", help="fill every active funding goal")
+    fill_parser.add_argument("--yes", action="store_true", help="skip the confirmation prompt")
+    return parser.parse_args()
+
+
+async def run(args):
+    """Connect and run the selected command"""
+    conn = await connect_async()
+    if not conn:
+        return 1
+    try:
+        await COMMANDS[args.command](conn, args)
+        return 0
+    except Exception as e:
+        print(f"❌ Error during {args.command}: {e}")
+        await conn.rollback()
+        return 1
+    finally:
+        await conn.close()
+        print("\n🔌 Database connection closed")
+
+
+def main():
+    """Main function"""
+    args = parse_args()
+
+    print(f"🚀 BoneBoard Ops: {args.command}")
+    print("=" * 50)
+    status = asyncio.run(run(args))
+    print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
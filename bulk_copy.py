@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Bulk Copy
+Exports users, projects, job listings, funding campaigns and contributions with
+COPY ... TO STDOUT into gzipped CSV (or Parquet) files, one table per
+worker, and imports them back with COPY ... FROM STDIN in foreign-key order
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from psycopg2 import sql
+
+try:
+    import pyarrow
+    import pyarrow.csv
+    import pyarrow.parquet
+except ImportError:  # only --format parquet needs pyarrow
+    pyarrow = None
+
+from ops_catalog import SchemaCatalog
+from ops_db import POOL_SIZE, checkout_connection, connect_to_database, release_connection
+
+# Import order: each level only references tables in earlier levels; tables within a level load in parallel
+TABLE_LEVELS = [
+    ['users'],
+    ['projects'],
+    ['job_listings', 'project_funding'],
+    ['funding_contributions'],
+]
+
+TABLES = [table for level in TABLE_LEVELS for table in level]
+
+FORMATS = ("csv", "parquet")
+
+FILE_EXTENSIONS = {"csv": ".csv.gz", "parquet": ".parquet"}
+
+MANIFEST = "manifest.json"
+
+# Bytes per read/write between COPY and the files
+COPY_BUFFER = 1 << 20
+
+# Bytes of CSV per Parquet record batch, which bounds memory during conversion
+PARQUET_BLOCK_SIZE = 16 << 20
+
+# COPY runs far longer than the pool's default statement_timeout allows
+COPY_STATEMENT_TIMEOUT = '0'
+
+# COPY's CSV format tells NULL (unquoted empty) from an empty string (quoted)
+COPY_OPTIONS = sql.SQL("FORMAT csv, HEADER true")
+
+
+def _copy_statement(direction, table, columns):
+    return sql.SQL("COPY {} ({}) {} WITH ({})").format(
+        sql.Identifier(table), sql.SQL(', ').join(sql.Identifier(column) for column in columns),
+        sql.SQL(direction), COPY_OPTIONS)
+
+
+def _copy_out(cursor, table, columns, out):
+    cursor.copy_expert(_copy_statement("TO STDOUT", table, columns), out, COPY_BUFFER)
+    return cursor.rowcount
+
+
+def _export_csv(cursor, table, columns, path):
+    """COPY one table into a gzipped CSV file; returns the row count"""
+    with gzip.open(path, "wb", compresslevel=6) as out:
+        return _copy_out(cursor, table, columns, out)
+
+
+def _csv_to_parquet(csv_path, columns, path):
+    """Convert a COPY CSV file to Parquet in record batches.
+
+    Every column is kept as the text COPY wrote, so values round-trip through
+    the import without type conversion. Only an unquoted empty field is NULL:
+    pyarrow's other default null markers (NA, null, nan, ...) are ordinary text.
+    """
+    reader = pyarrow.csv.open_csv(
+        csv_path,
+        read_options=pyarrow.csv.ReadOptions(block_size=PARQUET_BLOCK_SIZE),
+        convert_options=pyarrow.csv.ConvertOptions(
+            column_types={column: pyarrow.string() for column in columns},
+            null_values=[""],
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+    with pyarrow.parquet.ParquetWriter(path, reader.schema, compression="zstd") as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+
+
+def _export_parquet(cursor, table, columns, path):
+    """COPY one table to a temporary CSV, then convert it to Parquet"""
+    with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as spool:
+        spool_path = spool.name
+    try:
+        with open(spool_path, "wb") as out:
+            rows = _copy_out(cursor, table, columns, out)
+        _csv_to_parquet(spool_path, columns, path)
+    finally:
+        os.remove(spool_path)
+    return rows
+
+
+class _ParquetCSVStream(io.RawIOBase):
+    """Readable CSV byte stream over a Parquet file, holding one record batch at a time.
+
+    Strings are always quoted and NULLs written as unquoted empty fields,
+    matching what the CSV export produces.
+    """
+
+    def __init__(self, path):
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        self.columns = parquet_file.schema_arrow.names
+        self._batches = parquet_file.iter_batches()
+        self._buffer = self._encode([self.columns])
+
+    @staticmethod
+    def _encode(rows):
+        # csv.writer quotes None as "", which COPY reads back as an empty string
+        return "".join(
+            ",".join('' if value is None else '"' + value.replace('"', '""') + '"' for value in row) + "\n"
+            for row in rows
+        ).encode()
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            batch = next(self._batches, None)
+            if batch is None:
+                break
+            self._buffer += self._encode(zip(*(column.to_pylist() for column in batch.columns)))
+        if size < 0:
+            size = len(self._buffer)
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+
+def _csv_header(path):
+    with gzip.open(path, "rt", newline="") as f:
+        return next(csv.reader(f))
+
+
+def export_table(snapshot_id, table, columns, fmt, path):
+    """Export one table inside the shared snapshot on its own pooled connection"""
+    conn = checkout_connection()
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    try:
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot_id,))
+        cursor.execute("SET LOCAL statement_timeout = %s", (COPY_STATEMENT_TIMEOUT,))
+        export = _export_parquet if fmt == "parquet" else _export_csv
+        rows = export(cursor, table, columns, path)
+    finally:
+        cursor.close()
+        conn.rollback()
+        release_connection(conn)
+    return table, rows, time.perf_counter() - start
+
+
+def run_export(directory, fmt="csv", tables=None, workers=None):
+    """Export tables in parallel from one consistent snapshot and write the manifest"""
+    tables = tables or TABLES
+    os.makedirs(directory, exist_ok=True)
+
+    # Every worker reads the coordinator's exported snapshot, so the files are consistent with each other
+    coordinator = connect_to_database()
+    if not coordinator:
+        return None
+    manifest = {'format': fmt, 'tables': {}}
+    try:
+        catalog = SchemaCatalog.load(coordinator.cursor())
+        missing = [table for table in tables if not catalog.has_table(table)]
+        if missing:
+            raise RuntimeError(f"Tables not found: {', '.join(missing)}")
+
+        cursor = coordinator.cursor()
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        cursor.execute("SELECT pg_export_snapshot(), NOW()")
+        snapshot_id, taken_at = cursor.fetchone()
+        manifest['exported_at'] = taken_at.isoformat()
+
+        workers = max(1, min(workers or len(tables), len(tables), POOL_SIZE - 1))
+        print(f"\n📤 Exporting {len(tables)} tables with {workers} workers (snapshot {snapshot_id})")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(export_table, snapshot_id, table, catalog.columns[table], fmt,
+                            os.path.join(directory, table + FILE_EXTENSIONS[fmt]))
+                for table in tables
+            ]
+            for future in futures:
+                table, rows, elapsed = future.result()
+                path = os.path.join(directory, table + FILE_EXTENSIONS[fmt])
+                manifest['tables'][table] = {
+                    'file': os.path.basename(path),
+                    'rows': rows,
+                    'columns': catalog.columns[table],
+                }
+                print(f"✅ {table}: {rows} rows → {path} ({os.path.getsize(path) / 1e6:.1f} MB, {elapsed:.2f}s)")
+    finally:
+        coordinator.rollback()
+        release_connection(coordinator)
+
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def import_table(table, path, fmt):
+    """COPY one file into its table in a single transaction; returns (table, rows, seconds)"""
+    conn = checkout_connection()
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    try:
+        cursor.execute("SET LOCAL statement_timeout = %s", (COPY_STATEMENT_TIMEOUT,))
+        if fmt == "parquet":
+            source = _ParquetCSVStream(path)
+            columns = source.columns
+        else:
+            columns = _csv_header(path)
+            source = gzip.open(path, "rb")
+        with source:
+            cursor.copy_expert(_copy_statement("FROM STDIN", table, columns), source, COPY_BUFFER)
+        rows = cursor.rowcount
+        # Fresh statistics so the planner doesn't keep treating the table as empty
+        cursor.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(table)))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        release_connection(conn)
+    return table, rows, time.perf_counter() - start
+
+
+def run_import(directory, tables=None, workers=None):
+    """Import an export directory level by level, each level's tables in parallel.
+
+    Each table loads in its own transaction; if one fails, later levels
+    (whose foreign keys would point at it) are not attempted.
+    """
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+    fmt = manifest['format']
+    if fmt == "parquet" and pyarrow is None:
+        raise RuntimeError("This export is Parquet; install pyarrow to import it")
+
+    wanted = [table for table in (tables or TABLES) if table in manifest['tables']]
+    imported = {}
+    print(f"\n📥 Importing {len(wanted)} tables from {directory} ({fmt}, exported {manifest.get('exported_at')})")
+    for level in TABLE_LEVELS:
+        batch = [table for table in level if table in wanted]
+        if not batch:
+            continue
+        with ThreadPoolExecutor(max_workers=max(1, min(workers or len(batch), len(batch), POOL_SIZE))) as pool:
+            futures = {
+                table: pool.submit(import_table, table,
+                                   os.path.join(directory, manifest['tables'][table]['file']), fmt)
+                for table in batch
+            }
+            failed = []
+            for table, future in futures.items():
+                try:
+                    _, rows, elapsed = future.result()
+                except Exception as e:
+                    print(f"❌ {table}: {e}")
+                    failed.append(table)
+                    continue
+                imported[table] = rows
+                expected = manifest['tables'][table]['rows']
+                flag = "" if rows == expected else f" (manifest says {expected})"
+                print(f"✅ {table}: {rows} rows in {elapsed:.2f}s{flag}")
+        if failed:
+            raise RuntimeError(f"{', '.join(failed)} failed to load; tables that reference them were skipped")
+    return imported
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard bulk export/import with COPY")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="export tables to a directory")
+    export_parser.add_argument("directory", help="output directory (created if missing)")
+    export_parser.add_argument("--format", choices=FORMATS, default="csv",
+                               help="gzipped CSV (default) or Parquet (needs pyarrow)")
+
+    import_parser = commands.add_parser("import", help="import an export directory")
+    import_parser.add_argument("directory", help="directory written by export")
+
+    for sub in (export_parser, import_parser):
+        sub.add_argument("--tables", default=None,
+                         help=f"comma-separated subset of {', '.join(TABLES)}")
+        sub.add_argument("--workers", type=int, default=None,
+                         help=f"tables copied at once (default one per table, capped by DB_POOL_SIZE={POOL_SIZE})")
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_args()
+
+    print("🚚 BoneBoard Bulk Copy")
+    print("=" * 50)
+
+    tables = None
+    if args.tables:
+        tables = [table.strip() for table in args.tables.split(",") if table.strip()]
+        unknown = [table for table in tables if table not in TABLES]
+        if unknown:
+            print(f"❌ Unknown tables: {', '.join(unknown)} (choose from {', '.join(TABLES)})")
+            sys.exit(2)
+        # Keep foreign-key order whatever order they were given in
+        tables = [table for table in TABLES if table in tables]
+
+    start = time.perf_counter()
+    try:
+        if args.command == "export":
+            if args.format == "parquet" and pyarrow is None:
+                print("❌ Parquet export needs pyarrow: pip install pyarrow")
+                sys.exit(1)
+            if run_export(args.directory, args.format, tables, args.workers) is None:
+                sys.exit(1)
+        else:
+            imported = run_import(args.directory, tables, args.workers)
+            if 'project_funding' in imported:
+                print("ℹ️  Run funding_rollup.py --rebuild to recompute the funding totals")
+    except Exception as e:
+        print(f"❌ Error during {args.command}: {e}")
+        sys.exit(1)
+
+    print(f"\n⏱️  {args.command.capitalize()} finished in {time.perf_counter() - start:.2f}s")
+    print(f"Timestamp: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Change Feed
+Installs statement-level NOTIFY triggers on job_listings, project_funding and
+funding_contributions, listens for them and fans the changes out to
+consumers (snapshot cache refresh, funding rollup, expiry) instead of
+polling on a timer
+"""
+
+import argparse
+import json
+import select
+import signal
+import sys
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+import psycopg2
+
+from expire import ensure_watermark_table, expire_due_funding, expire_due_jobs, run_incremental_sweep
+from funding_rollup import ensure_rollup_tables, refresh_rollup
+from ops_cache import Snapshot
+from ops_db import connect_to_database, release_connection
+
+CHANNEL = 'boneboard_changes'
+
+WATCHED_TABLES = ('job_listings', 'project_funding', 'funding_contributions')
+
+# Statements touching more rows than this notify a count without the ids (NOTIFY payloads max out at 8000 bytes)
+MAX_IDS = 100
+
+# Longest wait between checks for due consumer work
+MAX_WAIT = 30.0
+
+# One notification per statement, read from its transition table. Transition tables can only
+# be attached to single-event triggers, so each table gets an insert, update and delete trigger,
+# plus a truncate trigger that has no transition table and notifies without a count or ids.
+CREATE_FUNCTION = f"""
+    CREATE OR REPLACE FUNCTION notify_boneboard_change()
+    RETURNS TRIGGER AS $$
+    DECLARE
+        changed_count BIGINT;
+        changed_ids TEXT[];
+    BEGIN
+        IF TG_OP = 'TRUNCATE' THEN
+            PERFORM pg_notify('{CHANNEL}', json_build_object(
+                'table', TG_TABLE_NAME,
+                'op', TG_OP,
+                'count', NULL,
+                'ids', NULL,
+                'at', clock_timestamp()
+            )::text);
+            RETURN NULL;
+        END IF;
+        SELECT COUNT(*) INTO changed_count FROM changed_rows;
+        IF changed_count = 0 THEN
+            RETURN NULL;
+        END IF;
+        IF changed_count <= {MAX_IDS} THEN
+            SELECT array_agg(id::text) INTO changed_ids FROM changed_rows;
+        END IF;
+        PERFORM pg_notify('{CHANNEL}', json_build_object(
+            'table', TG_TABLE_NAME,
+            'op', TG_OP,
+            'count', changed_count,
+            'ids', changed_ids,
+            'at', clock_timestamp()
+        )::text);
+        RETURN NULL;
+    END;
+    $$ language 'plpgsql';
+"""
+
+TRIGGER_EVENTS = (
+    ('insert', 'INSERT', 'NEW'),
+    ('update', 'UPDATE', 'NEW'),
+    ('delete', 'DELETE', 'OLD'),
+    ('truncate', 'TRUNCATE', None),
+)
+
+# A change notification: ids is None when the statement touched more than MAX_IDS rows,
+# and count is None too for a TRUNCATE
+ChangeEvent = namedtuple('ChangeEvent', ['table', 'op', 'count', 'ids', 'at'])
+
+
+def install_triggers(conn):
+    """Create the notify function and the change-feed triggers on every watched table"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(CREATE_FUNCTION)
+        for table in WATCHED_TABLES:
+            for suffix, event, transition in TRIGGER_EVENTS:
+                trigger = f"{table}_change_feed_{suffix}"
+                referencing = f"REFERENCING {transition} TABLE AS changed_rows" if transition else ""
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+                cursor.execute(f"""
+                    CREATE TRIGGER {trigger}
+                    AFTER {event} ON {table}
+                    {referencing}
+                    FOR EACH STATEMENT EXECUTE FUNCTION notify_boneboard_change()
+                """)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    print(f"✅ Change-feed triggers installed on {', '.join(WATCHED_TABLES)}")
+
+
+def uninstall_triggers(conn):
+    """Drop the change-feed triggers and the notify function"""
+    cursor = conn.cursor()
+    try:
+        for table in WATCHED_TABLES:
+            for suffix, _, _ in TRIGGER_EVENTS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {table}_change_feed_{suffix} ON {table}")
+        cursor.execute("DROP FUNCTION IF EXISTS notify_boneboard_change()")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    print("✅ Change-feed triggers removed")
+
+
+def parse_event(payload):
+    """Turn a notification payload into a ChangeEvent"""
+    data = json.loads(payload)
+    return ChangeEvent(data['table'], data['op'], data['count'], data.get('ids'), data.get('at'))
+
+
+class Consumer:
+    """Receives the events for its tables and does its work in flush once delay seconds have passed.
+
+    Events arriving while work is pending are folded into the same flush, so
+    a burst of changes costs one refresh. With max_delay set, every event
+    pushes the flush back to delay seconds after it (but no later than
+    max_delay after the first), so the flush starts after the last event of
+    a burst instead of in the middle of it.
+    """
+
+    name = None
+    tables = WATCHED_TABLES
+    delay = 0.0
+    max_delay = None
+
+    def __init__(self):
+        self.pending_since = None
+        self.last_event = None
+        self.events = 0
+
+    def setup(self, conn):
+        """Prepare anything flush needs; called once the worker connection is open"""
+
+    def handle(self, event):
+        self.events += 1
+        self.last_event = time.monotonic()
+        if self.pending_since is None:
+            self.pending_since = self.last_event
+
+    def resync(self):
+        """Schedule a flush after notifications may have been missed"""
+        self.last_event = time.monotonic()
+        if self.pending_since is None:
+            self.pending_since = self.last_event
+
+    def due_at(self):
+        """Monotonic time the next flush is due, or None if there is nothing to do"""
+        if self.pending_since is None:
+            return None
+        if self.max_delay is None or self.last_event is None:
+            return self.pending_since + self.delay
+        return min(self.last_event + self.delay, self.pending_since + self.max_delay)
+
+    def flush(self, conn):
+        # Events handled from here on arm the next flush
+        self.pending_since = None
+        self.last_event = None
+
+
+class LogConsumer(Consumer):
+    """Prints every event as it arrives"""
+
+    name = 'log'
+
+    def handle(self, event):
+        self.events += 1
+        ids = ", ".join(event.ids[:3]) + (", ..." if len(event.ids) > 3 else "") if event.ids else "bulk"
+        count = "all" if event.count is None else event.count
+        print(f"📨 {event.at} {event.table} {event.op} x{count} [{ids}]")
+
+
+class CacheConsumer(Consumer):
+    """Keeps the inspectors' snapshot (ops_cache.py) current"""
+
+    name = 'cache'
+    tables = ('job_listings', 'project_funding')
+    delay = 2.0
+
+    def flush(self, conn):
+        super().flush(conn)
+        snapshot = Snapshot.for_database()
+        try:
+            snapshot.refresh(conn)
+        finally:
+            snapshot.close()
+
+
+class RollupConsumer(Consumer):
+    """Refreshes the funding totals (funding_rollup.py) once changes to project_funding go quiet.
+
+    Contributions only reach the totals through project_funding.current_funding,
+    so that is the table watched. The refresh recomputes every total from the
+    snapshot its flush starts with; a notification only arrives once its
+    transaction has committed, so a change the snapshot missed is received
+    after the flush began and arms the next one.
+    """
+
+    name = 'rollup'
+    tables = ('project_funding',)
+    delay = 5.0
+    max_delay = 30.0
+
+    def setup(self, conn):
+        ensure_rollup_tables(conn)
+
+    def flush(self, conn):
+        super().flush(conn)
+        refresh_rollup(conn)
+
+
+class ExpiryConsumer(Consumer):
+    """Runs an incremental expiry pass when the next listing or campaign falls due.
+
+    Changes to the watched tables only move the next due time; nothing is
+    polled while nothing is due. Inserted or updated rows are also checked
+    directly, since one confirmed or reactivated after its deadline is already
+    below the watermark and no incremental pass would reach it.
+    """
+
+    name = 'expiry'
+    tables = ('job_listings', 'project_funding')
+    delay = 1.0
+
+    # Wait before retrying rows a pass left due (locked by a concurrent update)
+    RETRY_DELAY = 5.0
+
+    # Earliest deadline still to sweep: above the watermark, possibly already past
+    NEXT_DUE_QUERY = """
+        SELECT LEAST(
+            (SELECT MIN(expires_at) FROM job_listings
+             WHERE status IN ('pending', 'confirmed', 'active')
+             AND expires_at > COALESCE(
+                 (SELECT swept_to FROM expiry_watermarks WHERE name = 'job_listings'), '-infinity')),
+            (SELECT MIN(funding_deadline) FROM project_funding
+             WHERE is_active = true AND is_funded = false
+             AND funding_deadline > COALESCE(
+                 (SELECT swept_to FROM expiry_watermarks WHERE name = 'project_funding'), '-infinity'))
+        )
+    """
+
+    EXPIRE_CHANGED = {'job_listings': expire_due_jobs, 'project_funding': expire_due_funding}
+
+    def __init__(self):
+        super().__init__()
+        self.next_due = None
+        self.changed_ids = {table: set() for table in self.tables}
+        # Catch up on anything that fell due while the feed wasn't running
+        self.pending_since = time.monotonic()
+        self.full = True
+
+    def setup(self, conn):
+        ensure_watermark_table(conn)
+
+    def handle(self, event):
+        super().handle(event)
+        # Removed rows can't fall due; the flush still recomputes next_due without them
+        if event.op in ('DELETE', 'TRUNCATE'):
+            return
+        if event.ids is None:
+            self.full = True
+        else:
+            self.changed_ids[event.table].update(event.ids)
+
+    def resync(self):
+        super().resync()
+        self.full = True
+
+    def due_at(self):
+        times = [t for t in (super().due_at(), self.next_due) if t is not None]
+        return min(times) if times else None
+
+    def flush(self, conn):
+        super().flush(conn)
+        full, self.full = self.full, False
+        changed, self.changed_ids = self.changed_ids, {table: set() for table in self.tables}
+        if full or self.next_due is None or time.monotonic() >= self.next_due:
+            run_incremental_sweep(conn, full=full)
+        if not full:
+            for table, ids in changed.items():
+                if ids:
+                    self.EXPIRE_CHANGED[table](conn, ids=ids)
+
+        cursor = conn.cursor()
+        cursor.execute(self.NEXT_DUE_QUERY)
+        due = cursor.fetchone()[0]
+        conn.commit()
+        cursor.close()
+        if due is None:
+            self.next_due = None
+        else:
+            # Small margin so the pass runs after the row is due by the server's clock;
+            # a deadline already past means the last pass left locked rows behind
+            wait = (due - datetime.now(timezone.utc)).total_seconds() + 1.0
+            self.next_due = time.monotonic() + (wait if wait > 1.0 else self.RETRY_DELAY)
+
+
+CONSUMERS = {consumer.name: consumer for consumer in (LogConsumer, CacheConsumer, RollupConsumer, ExpiryConsumer)}
+
+
+def open_listener():
+    """Return an autocommit connection listening on the change channel, or None"""
+    conn = connect_to_database()
+    if not conn:
+        return None
+    conn.autocommit = True
+    cursor = conn.cursor()
+    cursor.execute(f"LISTEN {CHANNEL}")
+    cursor.close()
+    return conn
+
+
+def close_listener(conn):
+    if conn is None:
+        return
+    if not conn.closed:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("UNLISTEN *")
+            cursor.close()
+            conn.autocommit = False
+        except psycopg2.Error:
+            pass
+    release_connection(conn)
+
+
+def run_feed(consumers, max_events=None, duration=None):
+    """Listen for changes and dispatch them to consumers until signalled to stop.
+
+    If the listening connection drops, every consumer is flushed once after
+    reconnecting, since notifications sent in between are lost.
+    """
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        print(f"\n🛑 Received {signal.Signals(signum).name}, stopping...")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    print(f"📡 Change feed listening on {CHANNEL} ({', '.join(consumer.name for consumer in consumers)})")
+    deadline = time.monotonic() + duration if duration else None
+    listener = worker = None
+    received = 0
+    while not stop.is_set():
+        try:
+            if listener is None:
+                listener = open_listener()
+                if listener is None:
+                    stop.wait(MAX_WAIT)
+                    continue
+                if received:
+                    for consumer in consumers:
+                        consumer.resync()
+            if worker is None:
+                worker = connect_to_database()
+                if worker is None:
+                    stop.wait(MAX_WAIT)
+                    continue
+                for consumer in consumers:
+                    consumer.setup(worker)
+
+            now = time.monotonic()
+            due = [t for t in (consumer.due_at() for consumer in consumers) if t is not None]
+            timeout = min([MAX_WAIT] + [max(t - now, 0.0) for t in due])
+            if deadline is not None:
+                timeout = min(timeout, max(deadline - now, 0.0))
+
+            if select.select([listener], [], [], timeout) != ([], [], []):
+                listener.poll()
+                while listener.notifies:
+                    event = parse_event(listener.notifies.pop(0).payload)
+                    received += 1
+                    for consumer in consumers:
+                        if event.table in consumer.tables:
+                            consumer.handle(event)
+
+            now = time.monotonic()
+            for consumer in consumers:
+                due_at = consumer.due_at()
+                if due_at is not None and due_at <= now:
+                    try:
+                        consumer.flush(worker)
+                    except psycopg2.OperationalError:
+                        consumer.resync()
+                        raise
+                    except Exception as e:
+                        print(f"❌ {consumer.name} consumer failed: {e}")
+                        worker.rollback()
+
+            if (max_events is not None and received >= max_events) or (deadline is not None and now >= deadline):
+                break
+        except psycopg2.OperationalError as e:
+            print(f"❌ Lost database connection: {e}")
+            close_listener(listener)
+            release_connection(worker)
+            listener = worker = None
+            stop.wait(1.0)
+
+    close_listener(listener)
+    release_connection(worker)
+    print(f"🔌 Change feed stopped after {received} events")
+    return received
+
+
+def send_probe(conn):
+    """Touch one row of each watched table so the feed can be checked end to end.
+
+    The no-op UPDATEs still fire the triggers (and bump updated_at where a
+    trigger maintains it), so only use this against local or staging databases.
+    """
+    cursor = conn.cursor()
+    try:
+        for table in WATCHED_TABLES:
+            cursor.execute(f"UPDATE {table} SET id = id WHERE id = (SELECT id FROM {table} LIMIT 1)")
+        conn.commit()
+    finally:
+        cursor.close()
+    print(f"🧪 Probe updates committed on {', '.join(WATCHED_TABLES)}")
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard change feed")
+    parser.add_argument("--install", action="store_true",
+                        help="create (or replace) the notify triggers and exit")
+    parser.add_argument("--uninstall", action="store_true",
+                        help="drop the notify triggers and exit")
+    parser.add_argument("--consumers", default="log,cache,rollup,expiry",
+                        help=f"comma-separated consumers to run (default all: {', '.join(CONSUMERS)})")
+    parser.add_argument("--probe", action="store_true",
+                        help="after subscribing, touch one row per watched table (local/staging only)")
+    parser.add_argument("--max-events", type=int, default=None,
+                        help="stop after N notifications")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="stop after N seconds")
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_args()
+
+    print("📡 BoneBoard Change Feed")
+    print("=" * 50)
+
+    if args.install or args.uninstall:
+        conn = connect_to_database()
+        if not conn:
+            sys.exit(1)
+        try:
+            if args.install:
+                install_triggers(conn)
+            else:
+                uninstall_triggers(conn)
+        except Exception as e:
+            print(f"❌ Error changing triggers: {e}")
+            sys.exit(1)
+        finally:
+            release_connection(conn)
+        return
+
+    names = [name.strip() for name in args.consumers.split(",") if name.strip()]
+    unknown = [name for name in names if name not in CONSUMERS]
+    if unknown:
+        print(f"❌ Unknown consumers: {', '.join(unknown)} (choose from {', '.join(CONSUMERS)})")
+        sys.exit(2)
+    consumers = [CONSUMERS[name]() for name in names]
+
+    if args.probe:
+        # Send the probe from another thread once the feed has subscribed
+        def probe():
+            time.sleep(1.0)
+            conn = connect_to_database()
+            if conn:
+                try:
+                    send_probe(conn)
+                finally:
+                    release_connection(conn)
+        threading.Thread(target=probe, daemon=True).start()
+
+    run_feed(consumers, args.max_events, args.duration)
+
+
+if __name__ == "__main__":
+    main()
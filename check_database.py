@@ -4,53 +4,64 @@ BoneBoard Database Inspector
 Checks job listings and project listings to view current data and associations
 """
 
-import psycopg2
+import argparse
+import contextlib
+import shutil
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-# Database connection URL
-DATABASE_URL = "postgres://u94m20d9lk1e7b:p73a59938021d84383fb460ad5c478003087a16d6038c9e19d6470d2400f1401e@c3v5n5ajfopshl.cluster-czrs8kj4isg7.us-east-1.rds.amazonaws.com:5432/d6nclr86s438p6"
+from ops_cache import add_cache_args, open_snapshot
+from ops_catalog import get_row_counts
+from ops_db import (DEFAULT_ITERSIZE, POOL_SIZE, checkout_connection, connect_to_database,
+                    release_connection, stream_rows)
+from ops_output import OUTPUT_FORMATS, export_query, write_document
 
-def connect_to_database():
-    """Connect to the PostgreSQL database"""
-    try:
-        print("🔌 Connecting to BoneBoard database...")
-        conn = psycopg2.connect(DATABASE_URL)
-        print("✅ Connected successfully")
-        return conn
-    except ImportError as e:
-        print(f"❌ psycopg2 not installed: {e}")
-        print("💡 Install with: pip install psycopg2-binary")
-        return None
-    except Exception as e:
-        print(f"❌ Connection failed: {e}")
-        return None
+# Listing queries shared by the text report and the --format exports
+PROJECTS_QUERY = """
+    SELECT id, title, category, wallet_address, created_at, is_verified
+    FROM projects 
+    ORDER BY created_at DESC
+"""
 
-def check_projects(conn):
-    """Check all projects in the database"""
+JOBS_QUERY = """
+    SELECT j.id, j.title, j.company, j.project_id, j.user_id, j.created_at, j.status,
+           p.title as project_title
+    FROM job_listings j
+    LEFT JOIN projects p ON j.project_id = p.id
+    ORDER BY j.created_at DESC
+"""
+
+def check_projects(conn, itersize=DEFAULT_ITERSIZE, limit=None, fast_counts=False, snapshot=None):
+    """Check all projects in the database, streaming rows as they arrive.
+
+    With a snapshot (ops_cache.Snapshot) the rows come from the local copy
+    and conn is not used.
+    """
     cursor = None
     try:
-        cursor = conn.cursor()
+        if snapshot:
+            project_count = snapshot.row_count('projects')
+        else:
+            # Get project count (planner estimate with --fast-counts)
+            cursor = conn.cursor()
+            project_count = get_row_counts(cursor, ['projects'], exact=not fast_counts)['projects']
         
-        # Get project count
-        cursor.execute("SELECT COUNT(*) FROM projects")
-        project_count = cursor.fetchone()[0]
-        
-        print(f"\n📋 PROJECTS ({project_count} total)")
+        print(f"\n📋 PROJECTS ({project_count} total, {project_count.label})")
         print("=" * 80)
         
-        if project_count == 0:
+        if project_count.count == 0 and not project_count.estimated:
             print("No projects found in database")
             return
         
-        # Get all projects with key fields (no 'name' column)
-        cursor.execute("""
-            SELECT id, title, category, wallet_address, created_at, is_verified
-            FROM projects 
-            ORDER BY created_at DESC
-        """)
-        
-        projects = cursor.fetchall()
+        # Stream projects with key fields (no 'name' column)
+        if snapshot:
+            projects = snapshot.rows(PROJECTS_QUERY, limit)
+        else:
+            projects = stream_rows(conn, PROJECTS_QUERY, itersize=itersize, limit=limit, name="check_projects")
         
         for i, project in enumerate(projects, 1):
             project_id, title, category, wallet, created_at, verified = project
@@ -63,38 +74,38 @@ def check_projects(conn):
         
     except Exception as e:
         print(f"❌ Error checking projects: {e}")
-        conn.rollback()  # Rollback on error
+        if conn:
+            conn.rollback()  # Rollback on error
     finally:
         if cursor:
             cursor.close()
 
-def check_jobs(conn):
-    """Check all jobs in the database"""
+def check_jobs(conn, itersize=DEFAULT_ITERSIZE, limit=None, fast_counts=False, snapshot=None):
+    """Check all jobs in the database, streaming rows as they arrive.
+
+    With a snapshot the rows come from the local copy and conn is not used.
+    """
     cursor = None
     try:
-        cursor = conn.cursor()
-        
-        # Get job count
-        cursor.execute("SELECT COUNT(*) FROM job_listings")
-        job_count = cursor.fetchone()[0]
+        if snapshot:
+            job_count = snapshot.row_count('job_listings')
+        else:
+            # Get job count (planner estimate with --fast-counts)
+            cursor = conn.cursor()
+            job_count = get_row_counts(cursor, ['job_listings'], exact=not fast_counts)['job_listings']
         
-        print(f"\n💼 JOB LISTINGS ({job_count} total)")
+        print(f"\n💼 JOB LISTINGS ({job_count} total, {job_count.label})")
         print("=" * 80)
         
-        if job_count == 0:
+        if job_count.count == 0 and not job_count.estimated:
             print("No jobs found in database")
             return
         
-        # Get all jobs with project associations (no 'name' column in projects)
-        cursor.execute("""
-            SELECT j.id, j.title, j.company, j.project_id, j.user_id, j.created_at, j.status,
-                   p.title as project_title
-            FROM job_listings j
-            LEFT JOIN projects p ON j.project_id = p.id
-            ORDER BY j.created_at DESC
-        """)
-        
-        jobs = cursor.fetchall()
+        # Stream jobs with project associations (no 'name' column in projects)
+        if snapshot:
+            jobs = snapshot.rows(JOBS_QUERY, limit)
+        else:
+            jobs = stream_rows(conn, JOBS_QUERY, itersize=itersize, limit=limit, name="check_jobs")
         
         for i, job in enumerate(jobs, 1):
             job_id, title, company, project_id, user_id, created_at, status, project_title = job
@@ -113,13 +124,17 @@ def check_jobs(conn):
         
     except Exception as e:
         print(f"❌ Error checking jobs: {e}")
-        conn.rollback()  # Rollback on error
+        if conn:
+            conn.rollback()  # Rollback on error
     finally:
         if cursor:
             cursor.close()
 
 def check_associations(conn):
-    """Check job-project associations summary"""
+    """Check job-project associations summary.
+
+    The queries are plain SQL, so conn may also be a snapshot's SQLite connection.
+    """
     cursor = None
     try:
         cursor = conn.cursor()
@@ -166,19 +181,297 @@ def check_associations(conn):
         if cursor:
             cursor.close()
 
+def fetch_summary_stats(conn, top_n=10):
+    """Fetch every summary number in a single round trip.
+
+    job_listings is aggregated once by status; association totals are
+    derived from the same pass. Returns (stats, elapsed_seconds).
+    """
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    cursor.execute("""
+        WITH job_status AS (
+            SELECT status, COUNT(*) AS total, COUNT(project_id) AS with_project
+            FROM job_listings
+            GROUP BY status
+        ),
+        funding_status AS (
+            SELECT 
+                CASE 
+                    WHEN is_funded = true THEN 'completed'
+                    WHEN funding_deadline < NOW() THEN 'expired'
+                    ELSE 'active'
+                END AS status,
+                COUNT(*) AS total
+            FROM project_funding
+            GROUP BY 1
+        ),
+        top_projects AS (
+            SELECT p.id, p.title, j.job_count
+            FROM (
+                SELECT project_id, COUNT(*) AS job_count
+                FROM job_listings
+                WHERE project_id IS NOT NULL
+                GROUP BY project_id
+                ORDER BY job_count DESC
+                LIMIT %s
+            ) j
+            JOIN projects p ON p.id = j.project_id
+        )
+        SELECT
+            (SELECT COUNT(*) FROM projects),
+            (SELECT COALESCE(json_agg(json_build_array(status, total, with_project) ORDER BY total DESC), '[]')
+             FROM job_status),
+            (SELECT COALESCE(json_agg(json_build_array(status, total) ORDER BY total DESC), '[]')
+             FROM funding_status),
+            (SELECT COALESCE(json_agg(json_build_array(id, title, job_count) ORDER BY job_count DESC), '[]')
+             FROM top_projects)
+    """, (top_n,))
+    project_count, job_status, funding_status, top_projects = cursor.fetchone()
+    elapsed = time.perf_counter() - start
+    cursor.close()
+    
+    jobs_total = sum(total for _, total, _ in job_status)
+    jobs_with_projects = sum(with_project for _, _, with_project in job_status)
+    stats = {
+        'project_count': project_count,
+        'job_count': jobs_total,
+        'job_status': {status: total for status, total, _ in job_status},
+        'funding_status': {status: total for status, total in funding_status},
+        'jobs_with_projects': jobs_with_projects,
+        'jobs_without_projects': jobs_total - jobs_with_projects,
+        'top_projects': top_projects,
+    }
+    return stats, elapsed
+
+def check_stats(conn, top_n=10, snapshot=None):
+    """Print the consolidated summary report, from the snapshot if one is given"""
+    try:
+        if snapshot:
+            stats, elapsed = snapshot.summary_stats(top_n)
+        else:
+            stats, elapsed = fetch_summary_stats(conn, top_n)
+    except Exception as e:
+        print(f"❌ Error fetching stats: {e}")
+        if conn:
+            conn.rollback()
+        return None
+    
+    print("\n📊 DATABASE SUMMARY")
+    print("=" * 80)
+    print(f"Projects: {stats['project_count']}")
+    print(f"Job listings: {stats['job_count']}")
+    
+    print("\nJob Status Summary:")
+    for status, count in stats['job_status'].items():
+        print(f"  {status}: {count} jobs")
+    
+    print("\nFunding Project Status Summary:")
+    for status, count in stats['funding_status'].items():
+        print(f"  {status}: {count} projects")
+    
+    print(f"\nJobs with project association: {stats['jobs_with_projects']}")
+    print(f"Jobs without project association: {stats['jobs_without_projects']}")
+    
+    if stats['top_projects']:
+        print(f"\nTop {top_n} projects by job count:")
+        for project_id, title, job_count in stats['top_projects']:
+            print(f"  • {title} (ID: {project_id}): {job_count} jobs")
+    
+    source = "local snapshot" if snapshot else "1 round trip"
+    print(f"\n⏱️  Summary query: {elapsed * 1000:.1f} ms ({source})")
+    return stats
+
+class _ThreadLocalStdout:
+    """sys.stdout stand-in that sends each thread's prints to its own buffer"""
+    
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+    
+    @contextlib.contextmanager
+    def capture(self, buffer):
+        """Route the current thread's output to buffer for the duration of the block"""
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            del self._local.buffer
+    
+    def write(self, text):
+        return getattr(self._local, 'buffer', self._default).write(text)
+    
+    def flush(self):
+        getattr(self._local, 'buffer', self._default).flush()
+
+def _run_captured(stdout, check, buffer):
+    """Run one check on its own pooled connection, printing into buffer"""
+    with stdout.capture(buffer):
+        try:
+            conn = checkout_connection()
+        except Exception as e:
+            print(f"❌ Database connection failed: {e}")
+            return
+        try:
+            check(conn)
+        finally:
+            release_connection(conn)
+
+def run_checks_parallel(checks, workers=None):
+    """Run independent (name, check) pairs concurrently, each on its own pooled connection.
+    
+    Each check's output is spooled (in memory, then to a temp file once large)
+    and replayed in the order given, so the report reads the same as a
+    sequential run. Wall time is roughly that of the slowest check. A check
+    that raises doesn't cost the others their output: every buffer is
+    replayed first, then the failures are printed and a RuntimeError raised.
+    """
+    workers = min(workers or len(checks), len(checks), POOL_SIZE)
+    original = sys.stdout
+    stdout = _ThreadLocalStdout(original)
+    buffers = [tempfile.SpooledTemporaryFile(max_size=1 << 20, mode="w+", encoding="utf-8") for _ in checks]
+    failures = []
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="check") as executor:
+            futures = [executor.submit(_run_captured, stdout, check, buffer)
+                       for (_, check), buffer in zip(checks, buffers)]
+            for (name, _), future in zip(checks, futures):
+                error = future.exception()
+                if error is not None:
+                    failures.append((name, error))
+    finally:
+        sys.stdout = original
+        for buffer in buffers:
+            buffer.seek(0)
+            shutil.copyfileobj(buffer, sys.stdout)
+            buffer.close()
+    
+    if failures:
+        for name, error in failures:
+            print(f"❌ {name} check failed: {error}")
+        raise RuntimeError(f"{len(failures)} of {len(checks)} checks failed")
+
+def run_inspection_parallel(args):
+    """Run the project, job and association checks concurrently"""
+    start = time.perf_counter()
+    run_checks_parallel([
+        ('projects', lambda conn: check_projects(conn, args.itersize, args.limit, args.fast_counts)),
+        ('jobs', lambda conn: check_jobs(conn, args.itersize, args.limit, args.fast_counts)),
+        ('associations', check_associations),
+    ], args.workers)
+    print(f"\n⏱️  Parallel inspection: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+def run_inspection_cached(args):
+    """Run the text inspection against the local snapshot, refreshing it only when stale"""
+    try:
+        snapshot = open_snapshot(args.cache_ttl)
+    except Exception as e:
+        print(f"❌ Could not refresh snapshot: {e}")
+        sys.exit(1)
+    if not snapshot:
+        sys.exit(1)
+    
+    try:
+        if args.stats:
+            check_stats(None, args.top, snapshot)
+        else:
+            check_projects(None, limit=args.limit, snapshot=snapshot)
+            check_jobs(None, limit=args.limit, snapshot=snapshot)
+            check_associations(snapshot.conn)
+        
+        print("\n✅ Database inspection complete!")
+        print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    finally:
+        snapshot.close()
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard database inspector")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="show at most N projects and N jobs, stopping the stream early (reads live, like --no-cache)")
+    parser.add_argument("--itersize", type=int, default=None,
+                        help=f"rows fetched per round trip while streaming (default {DEFAULT_ITERSIZE}; "
+                             "reads live, like --no-cache)")
+    parser.add_argument("--fast-counts", action="store_true",
+                        help="show planner row estimates instead of exact COUNT(*) totals (reads live, like --no-cache)")
+    parser.add_argument("--stats", action="store_true",
+                        help="print only the summary counts, fetched in a single query")
+    parser.add_argument("--top", type=int, default=10,
+                        help="number of projects to list by job count in --stats (default 10)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="text",
+                        help="output format; non-text formats write only data to stdout")
+    parser.add_argument("--dataset", choices=("projects", "jobs"), default="jobs",
+                        help="rows to export with --format json/ndjson/csv (default jobs)")
+    parser.add_argument("--parallel", action="store_true",
+                        help="run the project, job and association checks concurrently on separate pooled connections "
+                             "(reads live, like --no-cache)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"threads for --parallel (default one per check, capped at DB_POOL_SIZE={POOL_SIZE})")
+    add_cache_args(parser)
+    args = parser.parse_args()
+    # Options that only mean something for a live read; the snapshot would ignore them,
+    # and refreshing a cold one copies whole tables whatever --limit says
+    args.live = args.no_cache or args.parallel or args.fast_counts or args.limit is not None or args.itersize is not None
+    if args.itersize is None:
+        args.itersize = DEFAULT_ITERSIZE
+    return args
+
+def export_data(conn, args, out):
+    """Write the requested dataset (or --stats report) to out in args.format"""
+    if args.stats:
+        stats, elapsed = fetch_summary_stats(conn, args.top)
+        stats['query_ms'] = round(elapsed * 1000, 3)
+        write_document(stats, args.format, out)
+    else:
+        query = PROJECTS_QUERY if args.dataset == "projects" else JOBS_QUERY
+        export_query(conn, query, None, args.format, out, args.itersize, args.limit, name=f"export_{args.dataset}")
+    out.flush()
+
 def main():
     """Main function to run database checks"""
+    args = parse_args()
+    
+    if args.format != "text":
+        # Keep stdout clean for the data; progress messages go to stderr
+        out = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            conn = connect_to_database()
+            if not conn:
+                sys.exit(1)
+            try:
+                export_data(conn, args, out)
+            finally:
+                release_connection(conn)
+        return
+    
     print("🔍 BoneBoard Database Inspector")
     print("=" * 50)
     
+    if not args.live:
+        run_inspection_cached(args)
+        return
+    
+    if args.parallel and not args.stats:
+        try:
+            run_inspection_parallel(args)
+            print("\n✅ Database inspection complete!")
+            print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+        return
+    
     conn = connect_to_database()
     if not conn:
         sys.exit(1)
     
     try:
-        check_projects(conn)
-        check_jobs(conn)
-        check_associations(conn)
+        if args.stats:
+            check_stats(conn, args.top)
+        else:
+            check_projects(conn, args.itersize, args.limit, args.fast_counts)
+            check_jobs(conn, args.itersize, args.limit, args.fast_counts)
+            check_associations(conn)
         
         print(f"\n✅ Database inspection complete!")
         print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -186,7 +479,7 @@ def main():
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
     finally:
-        conn.close()
+        release_connection(conn)
         print("🔌 Database connection closed")
 
 if __name__ == "__main__":
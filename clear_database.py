@@ -4,69 +4,81 @@ BoneBoard Database Cleaner
 Clears all job listings, project listings, and funding data from the database
 """
 
-import psycopg2
+import argparse
 import sys
 
-# Database connection URL
-DATABASE_URL = "postgres://u94m20d9lk1e7b:p73a59938021d84383fb460ad5c478003087a16d6038c9e19d6470d2400f1401e@c3v5n5ajfopshl.cluster-czrs8kj4isg7.us-east-1.rds.amazonaws.com:5432/d6nclr86s438p6"
+from psycopg2 import sql
 
-def connect_to_database():
-    """Connect to the PostgreSQL database"""
-    try:
-        print("🔌 Connecting to BoneBoard database...")
-        conn = psycopg2.connect(DATABASE_URL)
-        print("✅ Connected successfully")
-        return conn
-    except ImportError as e:
-        print(f"❌ psycopg2 not installed: {e}")
-        print("💡 Install with: pip install psycopg2-binary")
-        return None
-    except Exception as e:
-        print(f"❌ Database connection failed: {e}")
-        return None
+from ops_catalog import RowCount, SchemaCatalog, get_row_counts
+from ops_chunked import DEFAULT_CHUNK_SIZE, RANGE_PREDICATE, Checkpoint, ChunkStep, run_chunked
+from ops_db import connect_to_database, release_connection, run_transaction
+from ops_throttle import Throttle, add_throttle_args
 
-def table_exists(cursor, table_name):
-    """Check if a table exists in the database"""
-    try:
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_name = %s
-            );
-        """, (table_name,))
-        return cursor.fetchone()[0]
-    except Exception:
-        return False
-
-def get_table_counts(cursor):
-    """Get current record counts for all tables"""
-    tables = {
-        'job_listings': 'SELECT COUNT(*) FROM job_listings',
-        'projects': 'SELECT COUNT(*) FROM projects', 
-        'project_fundings': 'SELECT COUNT(*) FROM project_fundings',
-        'funding_contributions': 'SELECT COUNT(*) FROM funding_contributions'
-    }
+# Tables wiped by the fast reset, children before parents.
+# Both funding table names are listed; only the ones in the catalog are truncated.
+RESET_TABLES = [
+    'funding_contributions',
+    'project_fundings',
+    'project_funding',
+    'job_listings',
+    'projects',
+]
+
+# Tables outside RESET_TABLES that TRUNCATE ... CASCADE may empty: their rows
+# are meaningless without the reset tables and ON DELETE CASCADE drops them anyway.
+# Anything else referencing a reset table makes the fast reset fall back to DELETE,
+# so the foreign key's own ON DELETE action applies instead.
+CASCADE_TABLES = {
+    'saved_jobs',
+    'project_votes',
+    'funding_totals',
+}
+
+# Tables with a foreign key into any of %s, for callers without a SchemaCatalog
+REFERENCING_QUERY = """
+    SELECT DISTINCT src.relname
+    FROM pg_constraint con
+    JOIN pg_class src ON src.oid = con.conrelid
+    JOIN pg_class dst ON dst.oid = con.confrelid
+    JOIN pg_namespace n ON n.oid = dst.relnamespace
+    WHERE con.contype = 'f'
+    AND n.nspname = current_schema()
+    AND dst.relname = ANY(%s)
+"""
+
+# How long TRUNCATE may wait for its exclusive lock before giving up
+RESET_LOCK_TIMEOUT = '5s'
+
+def get_table_counts(cursor, catalog, fast=False):
+    """Get current record counts for all tables.
+
+    With fast set, counts are planner estimates from pg_class instead of
+    full-table COUNT(*) scans. Returns {table: RowCount}.
+    """
+    tables = ['job_listings', 'projects', catalog.funding_table() or 'project_funding', 'funding_contributions']
     
     counts = {}
-    for table_name, query in tables.items():
-        if table_exists(cursor, table_name):
-            try:
-                cursor.execute(query)
-                count = cursor.fetchone()[0]
-                counts[table_name] = count
-            except Exception as e:
-                print(f"⚠️  Could not get count for {table_name}: {e}")
-                counts[table_name] = 0
+    present = []
+    for table_name in tables:
+        if catalog.has_table(table_name):
+            present.append(table_name)
         else:
             print(f"ℹ️  Table {table_name} does not exist, skipping")
-            counts[table_name] = 0
+            counts[table_name] = RowCount(0, False)
     
-    return counts
+    try:
+        counts.update(get_row_counts(cursor, present, exact=not fast))
+    except Exception as e:
+        print(f"⚠️  Could not get counts: {e}")
+        cursor.connection.rollback()
+        counts.update({table_name: RowCount(0, False) for table_name in present})
+    
+    return {table_name: counts[table_name] for table_name in tables}
 
-def clear_job_listings(cursor):
+def clear_job_listings(cursor, catalog):
     """Clear all job listings"""
     print("\n🗑️  Clearing job listings...")
-    if not table_exists(cursor, 'job_listings'):
+    if not catalog.has_table('job_listings'):
         print("ℹ️  job_listings table does not exist, skipping")
         return 0
     try:
@@ -79,13 +91,13 @@ def clear_job_listings(cursor):
         cursor.connection.rollback()
         return 0
 
-def clear_funding_data(cursor):
+def clear_funding_data(cursor, catalog):
     """Clear all funding-related data"""
     print("\n💰 Clearing funding data...")
     total_deleted = 0
     
     # Clear funding contributions first (foreign key dependency)
-    if table_exists(cursor, 'funding_contributions'):
+    if catalog.has_table('funding_contributions'):
         try:
             cursor.execute("DELETE FROM funding_contributions")
             contributions_deleted = cursor.rowcount
@@ -97,10 +109,11 @@ def clear_funding_data(cursor):
     else:
         print("ℹ️  funding_contributions table does not exist, skipping")
     
-    # Clear project fundings
-    if table_exists(cursor, 'project_fundings'):
+    # Clear project fundings (whichever of project_funding/project_fundings exists)
+    funding_table = catalog.funding_table()
+    if funding_table:
         try:
-            cursor.execute("DELETE FROM project_fundings")
+            cursor.execute(sql.SQL("DELETE FROM {}").format(sql.Identifier(funding_table)))
             fundings_deleted = cursor.rowcount
             print(f"✅ Deleted {fundings_deleted} project fundings")
             total_deleted += fundings_deleted
@@ -108,14 +121,14 @@ def clear_funding_data(cursor):
             print(f"⚠️  Error clearing project fundings: {e}")
             cursor.connection.rollback()
     else:
-        print("ℹ️  project_fundings table does not exist, skipping")
+        print("ℹ️  project funding table does not exist, skipping")
     
     return total_deleted
 
-def clear_projects(cursor):
+def clear_projects(cursor, catalog):
     """Clear all project listings"""
     print("\n📁 Clearing project listings...")
-    if not table_exists(cursor, 'projects'):
+    if not catalog.has_table('projects'):
         print("ℹ️  projects table does not exist, skipping")
         return 0
     try:
@@ -128,35 +141,151 @@ def clear_projects(cursor):
         cursor.connection.rollback()
         return 0
 
-def reset_sequences(cursor):
+def reset_sequences(cursor, catalog):
     """Reset auto-increment sequences for clean IDs"""
     print("\n🔄 Resetting ID sequences...")
     
-    # Get actual sequence names from database
+    if not catalog.sequences:
+        print("ℹ️  No sequences found to reset")
+        return
+        
+    for seq_name in catalog.sequences:
+        try:
+            cursor.execute(sql.SQL("ALTER SEQUENCE {} RESTART WITH 1").format(sql.Identifier(seq_name)))
+            print(f"✅ Reset sequence: {seq_name}")
+        except Exception as e:
+            print(f"⚠️  Could not reset sequence {seq_name}: {e}")
+
+def cascade_blockers(referencing, tables):
+    """Return the tables in referencing that TRUNCATE ... CASCADE of tables must not empty"""
+    return sorted(set(referencing) - set(tables) - CASCADE_TABLES)
+
+def fast_reset(cursor, catalog):
+    """Empty every reset table with a single TRUNCATE ... RESTART IDENTITY CASCADE.
+
+    TRUNCATE drops the table files instead of deleting rows one by one, so
+    it leaves no dead tuples behind and resets owned sequences in the same
+    statement. CASCADE also empties tables that reference these (saved_jobs,
+    project_votes), matching what ON DELETE CASCADE does for DELETE.
+
+    CASCADE empties every referencing table regardless of its ON DELETE
+    action, so when a table outside CASCADE_TABLES references a reset table
+    the reset deletes row by row instead and lets the foreign keys apply.
+    """
+    print("\n⚡ Fast reset (TRUNCATE)...")
+    tables = [table for table in RESET_TABLES if catalog.has_table(table)]
+    for table in RESET_TABLES:
+        if not catalog.has_table(table):
+            print(f"ℹ️  Table {table} does not exist, skipping")
+    
+    if not tables:
+        print("ℹ️  No tables to reset")
+        return []
+    
+    dependents = sorted({ref for table in tables for ref in catalog.referencing(table)} - set(tables))
+    kept = cascade_blockers(dependents, tables)
+    cursor.execute("SET LOCAL lock_timeout = %s", (RESET_LOCK_TIMEOUT,))
+    if kept:
+        print(f"⚠️  TRUNCATE CASCADE would also empty {', '.join(kept)}; deleting instead")
+        for table in tables:
+            cursor.execute(sql.SQL("DELETE FROM {}").format(sql.Identifier(table)))
+            print(f"✅ Deleted {cursor.rowcount} rows from {table}")
+        reset_sequences(cursor, catalog)
+        return tables
+    
+    cursor.execute(sql.SQL("TRUNCATE {} RESTART IDENTITY CASCADE").format(
+        sql.SQL(', ').join(sql.Identifier(table) for table in tables)
+    ))
+    print(f"✅ Truncated {', '.join(tables)}")
+    if dependents:
+        print(f"   (cascaded to {', '.join(dependents)})")
+    return tables
+
+def run_fast_reset():
+    """Connect and run the TRUNCATE-based reset in one transaction"""
+    conn = connect_to_database()
+    if not conn:
+        sys.exit(1)
+    
+    cursor = conn.cursor()
     try:
-        cursor.execute("""
-            SELECT sequence_name 
-            FROM information_schema.sequences 
-            WHERE sequence_schema = 'public'
-        """)
-        sequences = [row[0] for row in cursor.fetchall()]
+        catalog = SchemaCatalog.load(cursor)
+        catalog.print_warnings()
+        tables = run_transaction(conn, fast_reset, catalog)
+        if tables:
+            print("\n🎉 Database successfully reset!")
+    except Exception as e:
+        print(f"\n❌ Error during reset: {e}")
+        conn.rollback()
+        sys.exit(1)
+    finally:
+        cursor.close()
+        release_connection(conn)
+        print("\n🔌 Database connection closed")
+
+def chunked_clear_steps(catalog):
+    """DELETE steps for the chunked clear, children before parents"""
+    tables = ['funding_contributions', catalog.funding_table(), 'job_listings', 'projects']
+    return [
+        ChunkStep(table, table, sql.SQL("DELETE FROM {} WHERE " + RANGE_PREDICATE).format(sql.Identifier(table)))
+        for table in tables
+        if table and catalog.has_table(table)
+    ]
+
+def run_chunked_clear(chunk_size=DEFAULT_CHUNK_SIZE, checkpoint_path=None, restart=False, throttle=None):
+    """Delete every row in committed primary-key chunks, resuming from a checkpoint if one exists"""
+    conn = connect_to_database()
+    if not conn:
+        sys.exit(1)
+    
+    cursor = conn.cursor()
+    try:
+        catalog = SchemaCatalog.load(cursor)
+        catalog.print_warnings()
         
-        if not sequences:
-            print("ℹ️  No sequences found to reset")
-            return
-            
-        for seq_name in sequences:
-            try:
-                cursor.execute(f"ALTER SEQUENCE {seq_name} RESTART WITH 1")
-                print(f"✅ Reset sequence: {seq_name}")
-            except Exception as e:
-                print(f"⚠️  Could not reset sequence {seq_name}: {e}")
-                
+        print(f"\n🗑️  Deleting in chunks of {chunk_size} rows...")
+        checkpoint = Checkpoint.for_job('clear_database', checkpoint_path)
+        run_chunked(conn, 'clear_database', chunked_clear_steps(catalog), None, chunk_size, checkpoint, restart,
+                    throttle)
+        if throttle:
+            throttle.report()
+        
+        reset_sequences(cursor, catalog)
+        conn.commit()
+        print("\n🎉 Database successfully cleared!")
     except Exception as e:
-        print(f"⚠️  Could not get sequence list: {e}")
+        print(f"\n❌ Error during chunked clear: {e}")
+        conn.rollback()
+        sys.exit(1)
+    finally:
+        cursor.close()
+        release_connection(conn)
+        print("\n🔌 Database connection closed")
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard database cleaner")
+    parser.add_argument("--fast", action="store_true",
+                        help="reset with a single TRUNCATE ... RESTART IDENTITY CASCADE instead of per-table DELETEs")
+    parser.add_argument("--chunked", action="store_true",
+                        help="delete in committed primary-key chunks, checkpointing progress so a rerun resumes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"rows per chunk with --chunked (default {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--checkpoint", default=None,
+                        help="checkpoint file for --chunked (default .ops_checkpoints/clear_database.json)")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore an existing checkpoint and start the chunked clear over")
+    parser.add_argument("--fast-counts", action="store_true",
+                        help="show planner row estimates instead of exact COUNT(*) for the initial state")
+    parser.add_argument("--yes", action="store_true",
+                        help="skip the confirmation prompt (for scripted staging resets)")
+    add_throttle_args(parser)
+    return parser.parse_args()
 
 def main():
     """Main execution function"""
+    args = parse_args()
+    
     print("🧹 BoneBoard Database Cleaner")
     print("=" * 50)
     print("⚠️  WARNING: This will DELETE ALL data from:")
@@ -167,9 +296,22 @@ def main():
     print("=" * 50)
     
     # Confirmation prompt
-    confirm = input("\n❓ Are you sure you want to proceed? Type 'YES' to continue: ")
-    if confirm != 'YES':
-        print("❌ Operation cancelled")
+    if not args.yes:
+        confirm = input("\n❓ Are you sure you want to proceed? Type 'YES' to continue: ")
+        if confirm != 'YES':
+            print("❌ Operation cancelled")
+            return
+    
+    if args.fast:
+        run_fast_reset()
+        return
+    
+    throttle = Throttle.from_args(args)
+    if throttle.enabled and not args.chunked:
+        # A single DELETE per table can't be paced; throttled clears always run chunked
+        print("ℹ️  Throttling requested, clearing in chunks")
+    if args.chunked or throttle.enabled:
+        run_chunked_clear(args.chunk_size, args.checkpoint, args.restart, throttle)
         return
     
     # Connect to database
@@ -180,32 +322,37 @@ def main():
     try:
         cursor = conn.cursor()
         
+        # Load the schema once and check for table name mismatches before touching data
+        catalog = SchemaCatalog.load(cursor)
+        catalog.print_warnings()
+        
         # Get initial counts
         print("\n📊 Current database state:")
-        initial_counts = get_table_counts(cursor)
+        initial_counts = get_table_counts(cursor, catalog, fast=args.fast_counts)
         for table, count in initial_counts.items():
-            print(f"   {table}: {count} records")
+            print(f"   {table}: {count} records ({count.label})")
         
-        if sum(initial_counts.values()) == 0:
+        # Estimates can lag behind recent inserts, so only trust an exact zero
+        if all(count.count == 0 and not count.estimated for count in initial_counts.values()):
             print("\n✅ Database is already empty!")
             return
         
         # Clear data
-        jobs_deleted = clear_job_listings(cursor)
-        funding_deleted = clear_funding_data(cursor)
-        projects_deleted = clear_projects(cursor)
+        jobs_deleted = clear_job_listings(cursor, catalog)
+        funding_deleted = clear_funding_data(cursor, catalog)
+        projects_deleted = clear_projects(cursor, catalog)
         
         # Reset sequences for clean start
-        reset_sequences(cursor)
+        reset_sequences(cursor, catalog)
         
         # Commit changes
         conn.commit()
         
         # Verify cleanup
         print("\n🔍 Verifying cleanup...")
-        final_counts = get_table_counts(cursor)
+        final_counts = get_table_counts(cursor, catalog)
         for table, count in final_counts.items():
-            if count == 0:
+            if count.count == 0:
                 print(f"✅ {table}: {count} records (cleared)")
             else:
                 print(f"⚠️  {table}: {count} records (not fully cleared)")
@@ -219,7 +366,7 @@ def main():
         print(f"   Funding records deleted: {funding_deleted}")
         print(f"   Total records deleted: {total_deleted}")
         
-        if sum(final_counts.values()) == 0:
+        if sum(count.count for count in final_counts.values()) == 0:
             print("\n🎉 Database successfully cleared!")
             print("   Ready for fresh job and project postings.")
         else:
@@ -232,7 +379,7 @@ def main():
         
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
         print("\n🔌 Database connection closed")
 
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Duplicate Job Remover
+Checks job listings created since the last run against earlier listings by
+tx_hash and content fingerprint, deletes duplicates in batches and writes a
+report of what was removed
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from expire import ensure_watermark_table, get_watermark, set_watermark
+from ops_db import connect_to_database, release_connection
+from ops_output import OUTPUT_FORMATS, write_rows
+
+# Watermark row in expiry_watermarks
+WATERMARK_NAME = 'dedup_jobs'
+
+# Listings checked per DELETE statement
+DEFAULT_BATCH_SIZE = 500
+
+# Same window the API's removeDuplicateJobs uses for content duplicates
+CONTENT_WINDOW = '5 minutes'
+
+# Rows newer than this are left for the next run so in-flight inserts aren't skipped
+SETTLE_INTERVAL = '1 minute'
+
+# Must match idx_job_listings_content_fingerprint in schema.sql for the hash index to be used
+FINGERPRINT = "md5({0}title || '|' || {0}company || '|' || {0}user_id)"
+
+REPORT_COLUMNS = ('id', 'reason', 'duplicate_of', 'tx_hash', 'title', 'company', 'user_id', 'created_at')
+
+NEXT_BATCH_QUERY = """
+    SELECT id, created_at
+    FROM job_listings
+    WHERE created_at > %(since)s::timestamptz
+    AND (created_at, id) > (%(after_ts)s::timestamptz, %(after_id)s::uuid)
+    AND created_at <= %(until)s
+    ORDER BY created_at, id
+    LIMIT %(batch_size)s
+"""
+
+# A listing is a duplicate if an earlier listing (by created_at, then id) has the
+# same tx_hash, or the same title/company/wallet within CONTENT_WINDOW. Keeping the
+# earliest row means the keeper is never itself deleted by a later batch.
+DELETE_DUPLICATES_QUERY = f"""
+    WITH matches AS (
+        SELECT j.id,
+               tx.id AS tx_match,
+               content.id AS content_match
+        FROM job_listings j
+        LEFT JOIN LATERAL (
+            SELECT o.id FROM job_listings o
+            WHERE j.tx_hash IS NOT NULL AND j.tx_hash != ''
+            AND o.tx_hash = j.tx_hash
+            AND (o.created_at, o.id) < (j.created_at, j.id)
+            ORDER BY o.created_at, o.id
+            LIMIT 1
+        ) tx ON true
+        LEFT JOIN LATERAL (
+            SELECT o.id FROM job_listings o
+            WHERE {FINGERPRINT.format('o.')} = {FINGERPRINT.format('j.')}
+            AND o.title = j.title AND o.company = j.company AND o.user_id = j.user_id
+            AND o.created_at >= j.created_at - INTERVAL '{CONTENT_WINDOW}'
+            AND (o.created_at, o.id) < (j.created_at, j.id)
+            ORDER BY o.created_at, o.id
+            LIMIT 1
+        ) content ON true
+        WHERE j.id = ANY(%(ids)s::uuid[])
+        AND (tx.id IS NOT NULL OR content.id IS NOT NULL)
+    )
+    DELETE FROM job_listings j
+    USING matches m
+    WHERE j.id = m.id
+    RETURNING j.id,
+              CASE WHEN m.tx_match IS NOT NULL THEN 'tx_hash' ELSE 'content' END,
+              COALESCE(m.tx_match, m.content_match),
+              j.tx_hash, j.title, j.company, j.user_id, j.created_at
+"""
+
+
+def get_cutoff(conn):
+    """Return the newest created_at this run will check"""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT NOW() - INTERVAL '{SETTLE_INTERVAL}'")
+    until = cursor.fetchone()[0]
+    conn.commit()
+    cursor.close()
+    return until
+
+
+def remove_duplicates(conn, since, until, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """Delete duplicates among listings created in (since, until], one batch per transaction.
+
+    Returns the removed rows as tuples in REPORT_COLUMNS order. With dry_run
+    every batch is rolled back, so nothing is deleted.
+    """
+    cursor = conn.cursor()
+    removed = []
+    after_ts, after_id = '-infinity', '00000000-0000-0000-0000-000000000000'
+    checked = 0
+    try:
+        while True:
+            cursor.execute(NEXT_BATCH_QUERY, {
+                'since': since or '-infinity', 'until': until,
+                'after_ts': after_ts, 'after_id': after_id, 'batch_size': batch_size,
+            })
+            batch = cursor.fetchall()
+            if not batch:
+                break
+            after_id, after_ts = batch[-1]
+            checked += len(batch)
+
+            cursor.execute(DELETE_DUPLICATES_QUERY, {'ids': [str(row[0]) for row in batch]})
+            rows = cursor.fetchall()
+            removed.extend(rows)
+            if dry_run:
+                conn.rollback()
+            else:
+                conn.commit()
+            if rows:
+                print(f"   🧹 {len(rows)} duplicates in batch ending {after_ts:%Y-%m-%d %H:%M:%S}")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    print(f"   Checked {checked} listings, {'found' if dry_run else 'removed'} {len(removed)} duplicates")
+    return removed
+
+
+def run_dedup(conn, batch_size=DEFAULT_BATCH_SIZE, full=False, dry_run=False):
+    """Check listings created since the watermark and advance it unless dry_run"""
+    ensure_watermark_table(conn)
+    since = None if full else get_watermark(conn, WATERMARK_NAME)
+    until = get_cutoff(conn)
+
+    window = f"since {since:%Y-%m-%d %H:%M:%S}" if since else "across all listings"
+    print(f"🔍 Checking listings {window} up to {until:%Y-%m-%d %H:%M:%S}...")
+    removed = remove_duplicates(conn, since, until, batch_size, dry_run)
+
+    if not dry_run:
+        set_watermark(conn, WATERMARK_NAME, until)
+    return removed
+
+
+def print_summary(removed):
+    """Print a short breakdown of removed listings"""
+    by_tx = sum(1 for row in removed if row[1] == 'tx_hash')
+    print(f"\n📊 By tx_hash: {by_tx}, by content: {len(removed) - by_tx}")
+    for row in removed[:10]:
+        print(f"   {row[0]} {row[1]:<8} dup of {row[2]}  {row[4]} @ {row[5]}")
+    if len(removed) > 10:
+        print(f"   ... and {len(removed) - 10} more")
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard duplicate job remover")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"listings checked per DELETE (default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--full", action="store_true",
+                        help="ignore the watermark and check every listing")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report duplicates without deleting them or moving the watermark")
+    parser.add_argument("--report", default=None,
+                        help="write removed rows to this file (default dedup_report_<timestamp>.<format>)")
+    parser.add_argument("--format", choices=[fmt for fmt in OUTPUT_FORMATS if fmt != "text"], default="csv",
+                        help="report format (default csv)")
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_args()
+
+    print("🧹 BoneBoard Duplicate Job Remover")
+    print("=" * 50)
+
+    conn = connect_to_database()
+    if not conn:
+        sys.exit(1)
+
+    try:
+        removed = run_dedup(conn, args.batch_size, args.full, args.dry_run)
+        if removed:
+            print_summary(removed)
+            report = args.report or f"dedup_report_{datetime.now():%Y%m%d_%H%M%S}.{args.format}"
+            with open(report, "w", newline="") as out:
+                write_rows(removed, REPORT_COLUMNS, args.format, out)
+            print(f"\n💾 Report written to {report}")
+        else:
+            print("\n✅ No duplicate listings found")
+    except Exception as e:
+        print(f"❌ Error during duplicate removal: {e}")
+        sys.exit(1)
+    finally:
+        release_connection(conn)
+        print("\n🔌 Database connection closed")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,55 +4,172 @@ BoneBoard Database Inspector and Expiry Tester
 Checks current jobs and funding projects, then sets some to expired for testing
 """
 
+import argparse
+import contextlib
 import psycopg2
+import signal
 import sys
+import threading
 from datetime import datetime, timedelta, timezone
 
-# Database connection URL
-DATABASE_URL = "postgres://u94m20d9lk1e7b:p73a59938021d84383fb460ad5c478003087a16d6038c9e19d6470d2400f1401e@c3v5n5ajfopshl.cluster-czrs8kj4isg7.us-east-1.rds.amazonaws.com:5432/d6nclr86s438p6"
+from check_database import fetch_summary_stats
+from ops_cache import add_cache_args, open_snapshot
+from ops_chunked import DEFAULT_CHUNK_SIZE, RANGE_PREDICATE, Checkpoint, ChunkStep, run_chunked
+from ops_db import connect_to_database, release_connection, run_transaction
+from ops_output import OUTPUT_FORMATS, export_query
+from ops_throttle import Throttle, add_throttle_args
 
-def connect_to_database():
-    """Connect to the PostgreSQL database"""
-    try:
-        print("🔌 Connecting to BoneBoard database...")
-        conn = psycopg2.connect(DATABASE_URL)
-        print("✅ Connected successfully")
-        return conn
-    except ImportError as e:
-        print(f"❌ psycopg2 not installed: {e}")
-        print("💡 Install with: pip install psycopg2-binary")
-        return None
-    except Exception as e:
-        print(f"❌ Database connection failed: {e}")
-        return None
+# Rows touched per UPDATE statement during an expiry sweep
+DEFAULT_BATCH_SIZE = 1000
+
+# Seconds between passes when running as a daemon
+DEFAULT_INTERVAL = 60
+
+# Daemon passes between full sweeps, which catch rows that became eligible after
+# their deadline had already passed the watermark (late confirms, reactivations)
+DEFAULT_FULL_SWEEP_EVERY = 60
+
+# Listing queries shared by the text report and the --format exports
+JOBS_QUERY = """
+    SELECT id, title, company, status, expires_at, created_at
+    FROM job_listings 
+    ORDER BY created_at DESC
+"""
+
+FUNDING_QUERY = """
+    SELECT id, funding_purpose, funding_goal, current_funding, funding_deadline, created_at
+    FROM project_funding 
+    ORDER BY created_at DESC
+"""
+
+# Export variants add the derived status so consumers don't recompute it
+EXPORT_QUERIES = {
+    'jobs': """
+        SELECT id, title, company, status, expires_at, created_at,
+               COALESCE(expires_at < NOW(), false) AS is_expired
+        FROM job_listings 
+        ORDER BY created_at DESC
+    """,
+    'funding': """
+        SELECT id, funding_purpose, funding_goal, current_funding, funding_deadline, created_at,
+               CASE 
+                   WHEN current_funding >= funding_goal THEN 'completed'
+                   WHEN funding_deadline < NOW() THEN 'expired'
+                   ELSE 'active'
+               END AS status
+        FROM project_funding 
+        ORDER BY created_at DESC
+    """,
+}
+
+# One batch of each expiry sweep; rows due in (since, until] are locked with
+# SKIP LOCKED so concurrent sweeps never wait on each other
+EXPIRE_JOBS_QUERY = """
+    WITH due AS (
+        SELECT id
+        FROM job_listings
+        WHERE status IN ('pending', 'confirmed', 'active')
+        AND expires_at > %(since)s::timestamptz
+        AND expires_at <= COALESCE(%(until)s::timestamptz, NOW())
+        AND (%(ids)s::uuid[] IS NULL OR id = ANY(%(ids)s::uuid[]))
+        LIMIT %(batch_size)s
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE job_listings j
+    SET status = 'expired', updated_at = NOW()
+    FROM due
+    WHERE j.id = due.id
+    RETURNING j.id
+"""
 
-def check_jobs(conn):
-    """Check current jobs in the database"""
+EXPIRE_FUNDING_QUERY = """
+    WITH due AS (
+        SELECT id
+        FROM project_funding
+        WHERE is_active = true
+        AND is_funded = false
+        AND funding_deadline > %(since)s::timestamptz
+        AND funding_deadline <= COALESCE(%(until)s::timestamptz, NOW())
+        AND (%(ids)s::uuid[] IS NULL OR id = ANY(%(ids)s::uuid[]))
+        LIMIT %(batch_size)s
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE project_funding pf
+    SET is_active = false, updated_at = NOW()
+    FROM due
+    WHERE pf.id = due.id
+    RETURNING pf.id
+"""
+
+# Highest watermark an incremental pass may record: just below the oldest row it
+# left due in (since, until], e.g. one skipped because an API update held its lock
+SAFE_WATERMARK_QUERIES = {
+    'job_listings': """
+        SELECT LEAST(%(until)s::timestamptz, MIN(expires_at) - INTERVAL '1 microsecond')
+        FROM job_listings
+        WHERE status IN ('pending', 'confirmed', 'active')
+        AND expires_at > %(since)s::timestamptz
+        AND expires_at <= %(until)s::timestamptz
+    """,
+    'project_funding': """
+        SELECT LEAST(%(until)s::timestamptz, MIN(funding_deadline) - INTERVAL '1 microsecond')
+        FROM project_funding
+        WHERE is_active = true
+        AND is_funded = false
+        AND funding_deadline > %(since)s::timestamptz
+        AND funding_deadline <= %(until)s::timestamptz
+    """,
+}
+
+# Chunked sweep (--sweep --chunked): the same updates restricted to one primary-key
+# range at a time, with the cutoff fixed for the whole (possibly resumed) run
+CHUNKED_EXPIRY_STEPS = [
+    ChunkStep('job_listings', 'job_listings', f"""
+        UPDATE job_listings
+        SET status = 'expired', updated_at = NOW()
+        WHERE {RANGE_PREDICATE}
+        AND status IN ('pending', 'confirmed', 'active')
+        AND expires_at <= %(until)s::timestamptz
+    """),
+    ChunkStep('project_funding', 'project_funding', f"""
+        UPDATE project_funding
+        SET is_active = false, updated_at = NOW()
+        WHERE {RANGE_PREDICATE}
+        AND is_active = true
+        AND is_funded = false
+        AND funding_deadline <= %(until)s::timestamptz
+    """),
+]
+
+def check_jobs(conn, status_counts=None):
+    """Check current jobs in the database.
+
+    status_counts may be passed in from fetch_summary_stats to skip the
+    separate per-status count query.
+    """
     print("\n📋 CHECKING JOBS:")
     print("=" * 50)
     
     cursor = conn.cursor()
     
     # Get job counts by status
-    cursor.execute("""
-        SELECT status, COUNT(*) as count
-        FROM job_listings 
-        GROUP BY status
-        ORDER BY count DESC
-    """)
+    if status_counts is None:
+        cursor.execute("""
+            SELECT status, COUNT(*) as count
+            FROM job_listings 
+            GROUP BY status
+            ORDER BY count DESC
+        """)
+        status_counts = cursor.fetchall()
+    else:
+        status_counts = list(status_counts.items())
     
-    status_counts = cursor.fetchall()
     print("Job Status Summary:")
     for status, count in status_counts:
         print(f"  {status}: {count} jobs")
     
     # Get detailed job info
-    cursor.execute("""
-        SELECT id, title, company, status, expires_at, created_at
-        FROM job_listings 
-        ORDER BY created_at DESC
-        LIMIT 10
-    """)
+    cursor.execute(JOBS_QUERY + " LIMIT 10")
     
     jobs = cursor.fetchall()
     print(f"\nRecent Jobs (showing {len(jobs)} of total):")
@@ -79,39 +196,41 @@ def check_jobs(conn):
     cursor.close()
     return jobs
 
-def check_funding_projects(conn):
-    """Check current funding projects in the database"""
+def check_funding_projects(conn, status_counts=None):
+    """Check current funding projects in the database.
+
+    status_counts may be passed in from fetch_summary_stats to skip the
+    separate status bucket query.
+    """
     print("\n💰 CHECKING FUNDING PROJECTS:")
     print("=" * 50)
     
     cursor = conn.cursor()
     
     # Get project counts by status
-    cursor.execute("""
-        SELECT 
-            CASE 
-                WHEN is_funded = true THEN 'completed'
-                WHEN funding_deadline < NOW() THEN 'expired'
-                ELSE 'active'
-            END as status,
-            COUNT(*) as count
-        FROM project_funding 
-        GROUP BY status
-        ORDER BY count DESC
-    """)
+    if status_counts is None:
+        cursor.execute("""
+            SELECT 
+                CASE 
+                    WHEN is_funded = true THEN 'completed'
+                    WHEN funding_deadline < NOW() THEN 'expired'
+                    ELSE 'active'
+                END as status,
+                COUNT(*) as count
+            FROM project_funding 
+            GROUP BY status
+            ORDER BY count DESC
+        """)
+        status_counts = cursor.fetchall()
+    else:
+        status_counts = list(status_counts.items())
     
-    status_counts = cursor.fetchall()
     print("Funding Project Status Summary:")
     for status, count in status_counts:
         print(f"  {status}: {count} projects")
     
     # Get detailed project info
-    cursor.execute("""
-        SELECT id, funding_purpose, funding_goal, current_funding, funding_deadline, created_at
-        FROM project_funding 
-        ORDER BY created_at DESC
-        LIMIT 10
-    """)
+    cursor.execute(FUNDING_QUERY + " LIMIT 10")
     
     projects = cursor.fetchall()
     print(f"\nRecent Funding Projects (showing {len(projects)} of total):")
@@ -147,36 +266,36 @@ def expire_test_jobs(conn):
     
     cursor = conn.cursor()
     
-    # Find active jobs to expire
+    # Set expiry date to yesterday (timezone-aware)
+    yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+    
+    # Expire the most recent active jobs in a single statement
     cursor.execute("""
-        SELECT id, title, company, expires_at
-        FROM job_listings 
-        WHERE status = 'confirmed' 
-        AND expires_at > NOW()
-        ORDER BY created_at DESC
-        LIMIT 3
-    """)
+        UPDATE job_listings 
+        SET expires_at = %s, updated_at = NOW()
+        WHERE id IN (
+            SELECT id
+            FROM job_listings 
+            WHERE status = 'confirmed' 
+            AND expires_at > NOW()
+            ORDER BY created_at DESC
+            LIMIT 3
+        )
+        RETURNING id, title, company
+    """, (yesterday,))
     
     jobs_to_expire = cursor.fetchall()
     
     if not jobs_to_expire:
         print("❌ No active jobs found to expire")
+        conn.rollback()
         cursor.close()
         return
     
     print(f"Found {len(jobs_to_expire)} active jobs to expire:")
     
-    # Set expiry date to yesterday (timezone-aware)
-    yesterday = datetime.now(timezone.utc) - timedelta(days=1)
-    
     for job in jobs_to_expire:
-        job_id, title, company, current_expires = job
-        
-        cursor.execute("""
-            UPDATE job_listings 
-            SET expires_at = %s, updated_at = NOW()
-            WHERE id = %s
-        """, (yesterday, job_id))
+        job_id, title, company = job
         
         print(f"✅ Expired job: {title} (Company: {company})")
         print(f"   ID: {job_id}")
@@ -194,36 +313,36 @@ def expire_test_funding(conn):
     
     cursor = conn.cursor()
     
-    # Find active funding projects to expire (including completed ones)
+    # Set deadline to yesterday (timezone-aware)
+    yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+    
+    # Expire the most recent funding projects (including completed ones) in a single statement
     cursor.execute("""
-        SELECT id, funding_purpose, funding_goal, current_funding, funding_deadline, 
-               CASE WHEN current_funding >= funding_goal THEN true ELSE false END as is_completed
-        FROM project_funding 
-        WHERE funding_deadline > NOW()
-        ORDER BY created_at DESC
-        LIMIT 3
-    """)
+        UPDATE project_funding 
+        SET funding_deadline = %s, updated_at = NOW()
+        WHERE id IN (
+            SELECT id
+            FROM project_funding 
+            WHERE funding_deadline > NOW()
+            ORDER BY created_at DESC
+            LIMIT 3
+        )
+        RETURNING id, funding_purpose, funding_goal, current_funding,
+                  CASE WHEN current_funding >= funding_goal THEN true ELSE false END as is_completed
+    """, (yesterday,))
     
     projects_to_expire = cursor.fetchall()
     
     if not projects_to_expire:
         print("❌ No funding projects found to expire")
+        conn.rollback()
         cursor.close()
         return
     
     print(f"Found {len(projects_to_expire)} funding projects to expire:")
     
-    # Set deadline to yesterday (timezone-aware)
-    yesterday = datetime.now(timezone.utc) - timedelta(days=1)
-    
     for project in projects_to_expire:
-        proj_id, title, goal, current, current_deadline, is_completed = project
-        
-        cursor.execute("""
-            UPDATE project_funding 
-            SET funding_deadline = %s, updated_at = NOW()
-            WHERE id = %s
-        """, (yesterday, proj_id))
+        proj_id, title, goal, current, is_completed = project
         
         progress = (current / goal * 100) if goal > 0 else 0
         status = "COMPLETED" if is_completed else "ACTIVE"
@@ -237,8 +356,251 @@ def expire_test_funding(conn):
     cursor.close()
     print(f"✅ Successfully expired {len(projects_to_expire)} funding projects for testing")
 
+def _expire_batch(cursor, query, params):
+    cursor.execute(query, params)
+    return len(cursor.fetchall())
+
+def _expire_in_batches(conn, query, params, batch_size, throttle=None):
+    """Run a set-based expiry UPDATE repeatedly until it stops returning rows.
+
+    Each batch is its own short transaction so row locks are released between
+    statements instead of being held for the whole sweep; a batch that hits a
+    deadlock or serialization failure is rerun.
+    """
+    throttle = throttle or Throttle()
+    total = 0
+    while True:
+        throttle.before_statement(conn)
+        expired = run_transaction(conn, _expire_batch, query, {**params, 'batch_size': batch_size})
+        throttle.after_statement(expired)
+        total += expired
+        if expired < batch_size:
+            break
+    return total
+
+def expire_due_jobs(conn, batch_size=DEFAULT_BATCH_SIZE, since=None, until=None, throttle=None, ids=None):
+    """Mark live job listings whose expires_at falls in (since, until] as expired.
+
+    Without bounds every job past its expiry is swept; ids restricts the sweep to those listings.
+    """
+    params = {'since': since or '-infinity', 'until': until, 'ids': list(ids) if ids else None}
+    return _expire_in_batches(conn, EXPIRE_JOBS_QUERY, params, batch_size, throttle)
+
+def expire_due_funding(conn, batch_size=DEFAULT_BATCH_SIZE, since=None, until=None, throttle=None, ids=None):
+    """Deactivate unfunded funding projects whose funding_deadline falls in (since, until].
+
+    Without bounds every funding project past its deadline is swept; ids restricts the sweep to those campaigns.
+    """
+    params = {'since': since or '-infinity', 'until': until, 'ids': list(ids) if ids else None}
+    return _expire_in_batches(conn, EXPIRE_FUNDING_QUERY, params, batch_size, throttle)
+
+def run_expiry_sweep(conn, batch_size=DEFAULT_BATCH_SIZE, throttle=None):
+    """Expire all due jobs and funding projects in bounded batches"""
+    print("\n🧹 RUNNING EXPIRY SWEEP:")
+    print("=" * 50)
+    
+    start = datetime.now(timezone.utc)
+    jobs_expired = expire_due_jobs(conn, batch_size, throttle=throttle)
+    print(f"✅ Expired {jobs_expired} job listings")
+    funding_expired = expire_due_funding(conn, batch_size, throttle=throttle)
+    print(f"✅ Deactivated {funding_expired} funding projects")
+    elapsed = (datetime.now(timezone.utc) - start).total_seconds()
+    print(f"⏱️  Sweep finished in {elapsed:.2f}s (batch size {batch_size})")
+    return jobs_expired, funding_expired
+
+def run_chunked_expiry_sweep(conn, chunk_size=DEFAULT_CHUNK_SIZE, checkpoint_path=None, restart=False,
+                             throttle=None):
+    """Expire everything due as of now, one committed primary-key range at a time.
+    
+    Progress is checkpointed after every chunk; rerunning after an
+    interruption resumes from the last committed range with the original cutoff.
+    """
+    print("\n🧹 RUNNING CHUNKED EXPIRY SWEEP:")
+    print("=" * 50)
+    
+    cursor = conn.cursor()
+    cursor.execute("SELECT NOW()")
+    until = cursor.fetchone()[0]
+    conn.commit()
+    cursor.close()
+    
+    checkpoint = Checkpoint.for_job('expire_sweep', checkpoint_path)
+    totals = run_chunked(conn, 'expire_sweep', CHUNKED_EXPIRY_STEPS, {'until': until.isoformat()},
+                         chunk_size, checkpoint, restart, throttle)
+    return totals.get('job_listings', 0), totals.get('project_funding', 0)
+
+def ensure_watermark_table(conn):
+    """Create the table holding the expiry daemon's sweep watermarks"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS expiry_watermarks (
+            name VARCHAR(50) PRIMARY KEY,
+            swept_to TIMESTAMP WITH TIME ZONE NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+        )
+    """)
+    conn.commit()
+    cursor.close()
+
+def get_watermark(conn, name):
+    """Return the timestamp a sweep last covered, or None if it never ran"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT swept_to FROM expiry_watermarks WHERE name = %s", (name,))
+    row = cursor.fetchone()
+    conn.commit()
+    cursor.close()
+    return row[0] if row else None
+
+def set_watermark(conn, name, swept_to):
+    """Record that a sweep has covered every row due up to swept_to"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO expiry_watermarks (name, swept_to)
+        VALUES (%s, %s)
+        ON CONFLICT (name) DO UPDATE
+        SET swept_to = EXCLUDED.swept_to, updated_at = NOW()
+    """, (name, swept_to))
+    conn.commit()
+    cursor.close()
+
+def safe_watermark(conn, name, since, until):
+    """Return the watermark a pass over (since, until] may record.
+
+    Rows the pass skipped (SKIP LOCKED) are still due afterwards; the
+    watermark stops just short of the oldest of them so the next pass retries it.
+    """
+    cursor = conn.cursor()
+    cursor.execute(SAFE_WATERMARK_QUERIES[name], {'since': since or '-infinity', 'until': until})
+    swept_to = cursor.fetchone()[0]
+    conn.commit()
+    cursor.close()
+    return swept_to
+
+def run_incremental_sweep(conn, batch_size=DEFAULT_BATCH_SIZE, full=False, throttle=None):
+    """Expire rows that became due since the last recorded watermark.
+
+    A full sweep ignores the stored watermarks, which picks up rows whose
+    deadline was moved backwards past an earlier watermark, or that only
+    became eligible (confirmed, reactivated) after their deadline was swept.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT NOW()")
+    until = cursor.fetchone()[0]
+    conn.commit()
+    cursor.close()
+    
+    results = {}
+    for name, expire_fn in (('job_listings', expire_due_jobs), ('project_funding', expire_due_funding)):
+        since = None if full else get_watermark(conn, name)
+        results[name] = expire_fn(conn, batch_size, since=since, until=until, throttle=throttle)
+        swept_to = safe_watermark(conn, name, since, until)
+        if since is None or swept_to > since:
+            set_watermark(conn, name, swept_to)
+        if swept_to < until:
+            print(f"⚠️  {name}: rows due from {swept_to:%Y-%m-%d %H:%M:%S} were locked; retrying them next pass")
+    
+    mode = "full" if full else "incremental"
+    print(f"[{until.strftime('%Y-%m-%d %H:%M:%S')}] {mode} pass: "
+          f"{results['job_listings']} jobs expired, "
+          f"{results['project_funding']} funding projects deactivated")
+    return results
+
+def run_expiry_daemon(interval, batch_size=DEFAULT_BATCH_SIZE, full_sweep_every=DEFAULT_FULL_SWEEP_EVERY,
+                      throttle=None):
+    """Run incremental expiry passes every interval seconds until signalled to stop"""
+    stop = threading.Event()
+    
+    def request_stop(signum, frame):
+        print(f"\n🛑 Received {signal.Signals(signum).name}, stopping after current pass...")
+        stop.set()
+    
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    
+    print(f"⏰ Expiry daemon started (interval {interval}s, batch size {batch_size})")
+    
+    conn = None
+    passes = 0
+    while not stop.is_set():
+        try:
+            if conn is None or conn.closed:
+                conn = connect_to_database()
+                if conn:
+                    ensure_watermark_table(conn)
+            if conn:
+                full = passes == 0 or (full_sweep_every and passes % full_sweep_every == 0)
+                run_incremental_sweep(conn, batch_size, full=bool(full), throttle=throttle)
+                passes += 1
+        except psycopg2.OperationalError as e:
+            print(f"❌ Lost database connection: {e}")
+            if conn:
+                release_connection(conn)
+            conn = None
+        except Exception as e:
+            print(f"❌ Error during expiry pass: {e}")
+            if conn:
+                conn.rollback()
+        stop.wait(interval)
+    
+    if conn:
+        release_connection(conn)
+    print("🔌 Expiry daemon stopped")
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard database inspector and expiry tool")
+    parser.add_argument("--sweep", action="store_true",
+                        help="expire every job and funding project past its deadline, then exit")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"rows updated per statement during a sweep (default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--chunked", action="store_true",
+                        help="with --sweep, walk each table in committed primary-key ranges and checkpoint progress")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"rows per primary-key range with --chunked (default {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--checkpoint", default=None,
+                        help="checkpoint file for --chunked (default .ops_checkpoints/expire_sweep.json)")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore an existing checkpoint and start the chunked sweep over")
+    parser.add_argument("--daemon", action="store_true",
+                        help="run non-interactively, expiring newly due rows every --interval seconds")
+    parser.add_argument("--interval", type=int, default=DEFAULT_INTERVAL,
+                        help=f"seconds between daemon passes (default {DEFAULT_INTERVAL})")
+    parser.add_argument("--full-sweep-every", type=int, default=DEFAULT_FULL_SWEEP_EVERY,
+                        help=f"ignore the watermark every N daemon passes (default {DEFAULT_FULL_SWEEP_EVERY}; "
+                             "0 only on the first pass)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="text",
+                        help="export --dataset rows in this format instead of the interactive report")
+    parser.add_argument("--dataset", choices=tuple(EXPORT_QUERIES), default="jobs",
+                        help="rows to export with --format json/ndjson/csv (default jobs)")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="export at most N rows")
+    add_throttle_args(parser)
+    add_cache_args(parser)
+    return parser.parse_args()
+
 def main():
     """Main function"""
+    args = parse_args()
+    
+    if args.daemon:
+        run_expiry_daemon(args.interval, args.batch_size, args.full_sweep_every, Throttle.from_args(args))
+        return
+    
+    if args.format != "text":
+        # Keep stdout clean for the data; progress messages go to stderr
+        out = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            conn = connect_to_database()
+            if not conn:
+                sys.exit(1)
+            try:
+                export_query(conn, EXPORT_QUERIES[args.dataset], None, args.format, out,
+                             limit=args.limit, name=f"export_{args.dataset}")
+                out.flush()
+            finally:
+                release_connection(conn)
+        return
+    
     print("🚀 BoneBoard Database Inspector and Expiry Tester")
     print("=" * 60)
     
@@ -247,10 +609,38 @@ def main():
     if not conn:
         sys.exit(1)
     
+    if args.sweep:
+        try:
+            throttle = Throttle.from_args(args)
+            if args.chunked:
+                run_chunked_expiry_sweep(conn, args.chunk_size, args.checkpoint, args.restart, throttle)
+            else:
+                run_expiry_sweep(conn, args.batch_size, throttle)
+            throttle.report()
+        except Exception as e:
+            print(f"❌ Error during expiry sweep: {e}")
+            conn.rollback()
+            sys.exit(1)
+        finally:
+            release_connection(conn)
+            print("\n🔌 Database connection closed")
+        return
+    
+    snapshot = None
     try:
-        # Check current state
-        jobs = check_jobs(conn)
-        projects = check_funding_projects(conn)
+        # Check current state from the local snapshot unless --no-cache
+        # (the listing queries are plain SQL, so they run on its SQLite connection)
+        if not args.no_cache:
+            snapshot = open_snapshot(args.cache_ttl, conn)
+        if snapshot:
+            stats, _ = snapshot.summary_stats(top_n=0)
+            source = snapshot.conn
+        else:
+            # Both status summaries come from one consolidated query
+            stats, _ = fetch_summary_stats(conn, top_n=0)
+            source = conn
+        jobs = check_jobs(source, stats['job_status'])
+        projects = check_funding_projects(source, stats['funding_status'])
         
         # Ask user if they want to proceed with expiring test data
         print("\n" + "=" * 60)
@@ -279,7 +669,9 @@ def main():
         conn.rollback()
     
     finally:
-        conn.close()
+        if snapshot:
+            snapshot.close()
+        release_connection(conn)
         print("\n🔌 Database connection closed")
 
 if __name__ == "__main__":
@@ -4,46 +4,34 @@ BoneBoard Funding Goal Filler
 Connects to the database and fills up the funding goals of current funding projects
 """
 
-import psycopg2
+import argparse
 import sys
 from decimal import Decimal
 
-# Database connection URL
-DATABASE_URL = "postgres://u94m20d9lk1e7b:p73a59938021d84383fb460ad5c478003087a16d6038c9e19d6470d2400f1401e@c3v5n5ajfopshl.cluster-czrs8kj4isg7.us-east-1.rds.amazonaws.com:5432/d6nclr86s438p6"
+from psycopg2.extras import execute_values
 
-def connect_to_database():
-    """Connect to the PostgreSQL database"""
-    try:
-        print("🔌 Connecting to BoneBoard database...")
-        conn = psycopg2.connect(DATABASE_URL)
-        print("✅ Connected successfully")
-        return conn
-    except ImportError as e:
-        print(f"❌ psycopg2 not installed: {e}")
-        print("💡 Install with: pip install psycopg2-binary")
-        sys.exit(1)
-    except Exception as e:
-        print(f"❌ Database connection failed: {e}")
-        sys.exit(1)
+from ops_catalog import FUNDING_TABLE, SchemaCatalog
+from ops_db import connect_to_database, release_connection, run_transaction
+from ops_throttle import Throttle, add_throttle_args
+
+ACTIVE_FUNDING_QUERY = """
+SELECT 
+    pf.id,
+    pf.project_id,
+    p.title,
+    pf.funding_goal,
+    pf.current_funding,
+    pf.is_active,
+    pf.is_funded
+FROM project_funding pf
+JOIN projects p ON pf.project_id = p.id
+WHERE pf.is_active = true AND pf.is_funded = false
+ORDER BY p.title
+"""
 
 def get_active_funding_projects(cursor):
     """Get all active funding projects with their current funding and goals"""
-    query = """
-    SELECT 
-        pf.id,
-        pf.project_id,
-        p.title,
-        pf.funding_goal,
-        pf.current_funding,
-        pf.is_active,
-        pf.is_funded
-    FROM project_funding pf
-    JOIN projects p ON pf.project_id = p.id
-    WHERE pf.is_active = true AND pf.is_funded = false
-    ORDER BY p.title;
-    """
-    
-    cursor.execute(query)
+    cursor.execute(ACTIVE_FUNDING_QUERY)
     return cursor.fetchall()
 
 def fill_funding_goal(cursor, funding_id, current_funding, funding_goal):
@@ -64,16 +52,69 @@ def fill_funding_goal(cursor, funding_id, current_funding, funding_goal):
         print(f"❌ Failed to update funding record {funding_id}: {e}")
         return False
 
+def fill_funding_goals_batch(cursor, projects, page_size=1000):
+    """Fill every funding goal with one UPDATE ... FROM (VALUES ...) per page.
+
+    Returns the updated rows (same shape as get_active_funding_projects)
+    straight from RETURNING, so no follow-up query is needed.
+    """
+    update_query = """
+    UPDATE project_funding pf
+    SET current_funding = v.funding_goal, is_funded = true
+    FROM (VALUES %s) AS v(id, funding_goal), projects p
+    WHERE pf.id = v.id::uuid
+    AND p.id = pf.project_id
+    AND pf.is_active = true AND pf.is_funded = false
+    RETURNING pf.id, pf.project_id, p.title, pf.funding_goal, pf.current_funding, pf.is_active, pf.is_funded;
+    """
+    
+    values = [(funding_id, funding_goal) for funding_id, _, _, funding_goal, _, _, _ in projects]
+    return execute_values(cursor, update_query, values, template="(%s, %s::numeric)",
+                          page_size=page_size, fetch=True)
+
+def fill_funding_goals_throttled(conn, projects, throttle, page_size=1000):
+    """Batch fill one page per transaction, pacing the pages with throttle"""
+    updated = []
+    for start in range(0, len(projects), page_size):
+        throttle.before_statement(conn)
+        rows = run_transaction(conn, fill_funding_goals_batch, projects[start:start + page_size], page_size)
+        throttle.after_statement(len(rows))
+        updated.extend(rows)
+    return updated
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard funding goal filler")
+    parser.add_argument("--batch", action="store_true",
+                        help="apply all updates with set-based UPDATE ... FROM (VALUES ...) statements")
+    parser.add_argument("--page-size", type=int, default=1000,
+                        help="rows per UPDATE statement in --batch mode (default 1000)")
+    parser.add_argument("--yes", action="store_true",
+                        help="skip the confirmation prompt (for seeding load-test fixtures)")
+    add_throttle_args(parser)
+    return parser.parse_args()
+
 def main():
     """Main function to fill funding goals"""
+    args = parse_args()
+    
     print("🚀 BoneBoard Funding Goal Filler")
     print("=" * 50)
     
     # Connect to database
     conn = connect_to_database()
+    if not conn:
+        sys.exit(1)
     cursor = conn.cursor()
     
     try:
+        # Check the funding table name before doing any work
+        catalog = SchemaCatalog.load(cursor)
+        catalog.print_warnings()
+        if not catalog.has_table(FUNDING_TABLE):
+            print(f"❌ {FUNDING_TABLE} table not found, nothing to fill")
+            return
+        
         # Get active funding projects
         print("\n📊 Fetching active funding projects...")
         projects = get_active_funding_projects(cursor)
@@ -97,22 +138,52 @@ def main():
         
         # Ask for confirmation
         print("⚠️  This will fill ALL funding goals to 100% completion!")
-        confirm = input("Do you want to proceed? (yes/no): ").lower().strip()
-        
-        if confirm not in ['yes', 'y']:
-            print("❌ Operation cancelled")
-            return
+        if not args.yes:
+            confirm = input("Do you want to proceed? (yes/no): ").lower().strip()
+            
+            if confirm not in ['yes', 'y']:
+                print("❌ Operation cancelled")
+                return
         
         print("\n🔄 Filling funding goals...")
         print("-" * 50)
         
+        throttle = Throttle.from_args(args)
+        if args.batch:
+            if throttle.enabled:
+                updated = fill_funding_goals_throttled(conn, projects, throttle, args.page_size)
+                throttle.report()
+            else:
+                updated = run_transaction(conn, fill_funding_goals_batch, projects, args.page_size)
+            print(f"\n🎉 Successfully filled {len(updated)}/{len(projects)} funding goals in batch mode!")
+            print("💾 Changes committed to database")
+            
+            # RETURNING already tells us what changed; anything missing was not filled
+            updated_ids = {row[0] for row in updated}
+            remaining = [project for project in projects if project[0] not in updated_ids]
+            print("\n📈 Updated funding status:")
+            print("-" * 50)
+            if not remaining:
+                print("✅ All projects are now fully funded!")
+            else:
+                for project in remaining:
+                    funding_id, project_id, title, funding_goal, current_funding, is_active, is_funded = project
+                    print(f"📋 {title}: not updated (changed concurrently)")
+            return
+        
         success_count = 0
         for project in projects:
             funding_id, project_id, title, funding_goal, current_funding, is_active, is_funded = project
             
             print(f"💰 Filling funding for: {title}")
+            throttle.before_statement(conn)
             if fill_funding_goal(cursor, funding_id, current_funding, funding_goal):
                 success_count += 1
+            if throttle.enabled:
+                # Commit per row so a throttled run never holds locks while it sleeps
+                conn.commit()
+                throttle.after_statement(1)
+        throttle.report()
         
         # Commit changes
         conn.commit()
@@ -137,7 +208,7 @@ def main():
         
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
         print("\n🔌 Database connection closed")
 
 if __name__ == "__main__":
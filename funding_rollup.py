@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Funding Rollup
+Maintains precomputed per-project and global funding totals, the same
+numbers the API used to aggregate from project_funding on every request
+"""
+
+import argparse
+import sys
+
+from archive_expired import ensure_archive_tables
+from ops_db import connect_to_database, release_connection, run_transaction
+
+CREATE_TABLES = """
+    CREATE TABLE IF NOT EXISTS funding_totals (
+        project_id UUID PRIMARY KEY REFERENCES projects(id) ON DELETE CASCADE,
+        total_raised DECIMAL(20,6) NOT NULL DEFAULT 0,
+        campaign_count INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+    CREATE TABLE IF NOT EXISTS funding_totals_global (
+        id BOOLEAN PRIMARY KEY DEFAULT true CHECK (id),
+        total_raised DECIMAL(20,6) NOT NULL DEFAULT 0,
+        refreshed_at TIMESTAMP WITH TIME ZONE,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+    INSERT INTO funding_totals_global (id) VALUES (true) ON CONFLICT (id) DO NOTHING;
+"""
+
+# The API's definitions: a project's current_funding and backers are the sum of its campaigns'
+# current_funding and the number of its campaigns; total-raised sums the active campaigns.
+# Campaigns archive_expired.py moved out still count, unless their project has been deleted.
+LIVE_TOTALS_CTE = """
+    campaigns AS (
+        SELECT project_id, current_funding, is_active FROM project_funding
+        UNION ALL
+        SELECT a.project_id, a.current_funding, a.is_active FROM project_funding_archive a
+        WHERE EXISTS (SELECT 1 FROM projects p WHERE p.id = a.project_id)
+    ),
+    live AS (
+        SELECT project_id,
+               COALESCE(SUM(current_funding), 0) AS total_raised,
+               COUNT(*) AS campaign_count,
+               COALESCE(SUM(current_funding) FILTER (WHERE is_active = true), 0) AS active_raised
+        FROM campaigns
+        GROUP BY project_id
+    )
+"""
+
+# Recomputes every total from one snapshot and writes only the rows that changed, so updated
+# and deleted campaigns are picked up however late their transactions commit
+REFRESH_QUERY = f"""
+    WITH {LIVE_TOTALS_CTE},
+    removed AS (
+        DELETE FROM funding_totals ft
+        WHERE NOT EXISTS (SELECT 1 FROM live WHERE live.project_id = ft.project_id)
+        RETURNING 1
+    ),
+    changed AS (
+        INSERT INTO funding_totals AS ft (project_id, total_raised, campaign_count)
+        SELECT project_id, total_raised, campaign_count
+        FROM live
+        WHERE project_id IS NOT NULL
+        ON CONFLICT (project_id) DO UPDATE
+        SET total_raised = EXCLUDED.total_raised,
+            campaign_count = EXCLUDED.campaign_count,
+            updated_at = NOW()
+        WHERE (ft.total_raised, ft.campaign_count) IS DISTINCT FROM (EXCLUDED.total_raised, EXCLUDED.campaign_count)
+        RETURNING 1
+    )
+    UPDATE funding_totals_global
+    SET total_raised = (SELECT COALESCE(SUM(active_raised), 0) FROM live),
+        refreshed_at = NOW(),
+        updated_at = NOW()
+    RETURNING (SELECT COUNT(*) FROM changed), (SELECT COUNT(*) FROM removed), total_raised
+"""
+
+RECOMPUTE_QUERY = f"""
+    WITH {LIVE_TOTALS_CTE}
+    SELECT project_id, total_raised, campaign_count, active_raised
+    FROM live
+"""
+
+
+def ensure_rollup_tables(conn):
+    """Create the rollup tables and their singleton global row, and the archive tables the totals read"""
+    ensure_archive_tables(conn)
+    cursor = conn.cursor()
+    cursor.execute(CREATE_TABLES)
+    conn.commit()
+    cursor.close()
+
+
+def lock_rollup(cursor):
+    """Lock the global row for this transaction so two refreshes don't interleave"""
+    cursor.execute("SELECT refreshed_at FROM funding_totals_global WHERE id FOR UPDATE")
+    return cursor.fetchone()[0]
+
+
+def _refresh(cursor, rebuild=False):
+    lock_rollup(cursor)
+    if rebuild:
+        cursor.execute("DELETE FROM funding_totals")
+    cursor.execute(REFRESH_QUERY)
+    return cursor.fetchone()
+
+
+def refresh_rollup(conn):
+    """Bring the totals up to date, writing only the project rows whose totals changed"""
+    changed, removed, total = run_transaction(conn, _refresh)
+    print(f"✅ Refreshed funding totals: {changed} projects changed, {removed} removed, "
+          f"{total} ADA raised by active campaigns")
+    return changed, removed
+
+
+def rebuild_rollup(conn):
+    """Replace every stored total in one transaction"""
+    changed, removed, total = run_transaction(conn, _refresh, rebuild=True)
+    print(f"✅ Rebuilt totals for {changed} projects ({total} ADA raised by active campaigns)")
+    return changed, removed
+
+
+def check_rollup(conn):
+    """Compare the stored totals with a recompute from the same snapshot.
+
+    Returns a list of (project_id, stored, recomputed) mismatches, where each
+    side is (total_raised, campaign_count); project_id None is the global row,
+    whose count is always None. Totals only match as of the last refresh, so
+    a difference means changes since then or a broken refresh.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        cursor.execute("SELECT total_raised, refreshed_at FROM funding_totals_global")
+        global_total, refreshed_at = cursor.fetchone()
+        if refreshed_at is None:
+            raise RuntimeError("The rollup has never been refreshed")
+        cursor.execute("SELECT project_id, total_raised, campaign_count FROM funding_totals")
+        stored = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        cursor.execute(RECOMPUTE_QUERY)
+        live = cursor.fetchall()
+    finally:
+        conn.rollback()
+        cursor.close()
+
+    recomputed = {project_id: (total, count) for project_id, total, count, _ in live if project_id is not None}
+    expected_global = sum((active for _, _, _, active in live), 0)
+    mismatches = []
+    if global_total != expected_global:
+        mismatches.append((None, (global_total, None), (expected_global, None)))
+    for project_id in sorted(set(stored) | set(recomputed)):
+        a, b = stored.get(project_id, (0, 0)), recomputed.get(project_id, (0, 0))
+        if a != b:
+            mismatches.append((project_id, a, b))
+    return mismatches
+
+
+def print_check(mismatches):
+    """Print the consistency check result"""
+    if not mismatches:
+        print("✅ Rollup matches a full recompute")
+        return
+    print(f"❌ {len(mismatches)} rollup rows differ from a full recompute:")
+    for project_id, (stored_total, stored_count), (total, count) in mismatches[:20]:
+        if project_id is None:
+            print(f"   global: stored {stored_total}, recomputed {total}")
+        else:
+            print(f"   {project_id}: stored {stored_total} / {stored_count} campaigns, "
+                  f"recomputed {total} / {count}")
+    if len(mismatches) > 20:
+        print(f"   ... and {len(mismatches) - 20} more")
+    print("   Run without --no-refresh (or with --rebuild) to update them")
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard funding rollup maintenance")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="delete and rewrite every stored total instead of only the changed ones")
+    parser.add_argument("--check", action="store_true",
+                        help="after refreshing, compare the totals with a full recompute (exit 1 on mismatch)")
+    parser.add_argument("--no-refresh", action="store_true",
+                        help="skip the refresh (use with --check)")
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_args()
+
+    print("📊 BoneBoard Funding Rollup")
+    print("=" * 50)
+
+    conn = connect_to_database()
+    if not conn:
+        sys.exit(1)
+
+    mismatches = []
+    try:
+        ensure_rollup_tables(conn)
+        if args.rebuild:
+            rebuild_rollup(conn)
+        elif not args.no_refresh:
+            refresh_rollup(conn)
+        if args.check:
+            mismatches = check_rollup(conn)
+            print_check(mismatches)
+    except Exception as e:
+        print(f"❌ Error during rollup: {e}")
+        sys.exit(1)
+    finally:
+        release_connection(conn)
+        print("\n🔌 Database connection closed")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Load Data Generator
+Bulk-loads deterministic synthetic users, projects, jobs, funding campaigns,
+contributions and scam reports into a local PostgreSQL database with COPY
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from psycopg2 import sql
+from psycopg2.extensions import parse_dsn
+
+from ops_db import connect_to_database, get_database_url, release_connection
+
+# Row counts at --scale 1; every count is multiplied by the scale factor
+DEFAULT_COUNTS = {
+    'users': 20000,
+    'projects': 5000,
+    'job_listings': 100000,
+    'project_funding': 10000,
+    'scam_reports': 5000,
+}
+
+# Mean contributions per funding campaign (heavy-tailed around this mean)
+DEFAULT_CONTRIBUTIONS_PER_CAMPAIGN = 8
+
+# Days of history the created_at timestamps are spread over
+DEFAULT_HISTORY_DAYS = 365
+
+# Tables in load order (parents before children)
+LOAD_ORDER = ['users', 'projects', 'job_listings', 'project_funding', 'funding_contributions', 'scam_reports']
+
+# Weighted choices; each can be overridden on the command line as value=weight,...
+DEFAULT_WEIGHTS = {
+    'job_status': {'confirmed': 55, 'pending': 10, 'expired': 20, 'paused': 10, 'filled': 5},
+    'job_type': {'Full-time': 50, 'Part-time': 20, 'Contract': 25, 'Internship': 5},
+    'job_category': {
+        'Development': 30, 'Design': 8, 'Marketing': 10, 'Community': 8, 'Business': 5,
+        'Content': 5, 'DeFi': 8, 'NFT': 5, 'Security': 4, 'Research': 3, 'Blockchain': 6,
+        'Smart Contracts': 6, 'DevOps': 2,
+    },
+    'work_arrangement': {'remote': 75, 'hybrid': 15, 'onsite': 10},
+    'project_status': {'active': 80, 'verified': 10, 'completed': 5, 'paused': 4, 'cancelled': 1},
+    'scam_type': {'project': 45, 'user': 25, 'wallet_address': 20, 'website': 7, 'other': 3},
+    'scam_status': {'pending': 60, 'verified': 20, 'rejected': 15, 'resolved': 5},
+}
+
+# Share of jobs linked to a project, and of projects that are verified
+JOB_PROJECT_RATIO = 0.6
+PROJECT_VERIFIED_RATIO = 0.2
+
+# Hosts considered local; anything else needs --allow-remote
+LOCAL_HOSTS = ('', 'localhost', '127.0.0.1', '::1')
+
+
+def row_id(seed, table, index):
+    """Deterministic UUID for row index of table, so children can reference parents without storing ids"""
+    digest = hashlib.blake2b(f"{seed}:{table}:{index}".encode(), digest_size=16).digest()
+    return str(uuid.UUID(bytes=digest, version=4))
+
+
+def wallet(seed, index):
+    """Deterministic wallet address for user index"""
+    digest = hashlib.blake2b(f"{seed}:wallet:{index}".encode(), digest_size=28).hexdigest()
+    return f"addr_test1q{digest}"
+
+
+def tx_hash(seed, table, index):
+    """Deterministic 64-character transaction hash"""
+    return hashlib.blake2b(f"{seed}:tx:{table}:{index}".encode(), digest_size=32).hexdigest()
+
+
+def weighted(rng, weights):
+    """Pick a key from a {value: weight} dict"""
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def campaign_contributions(seed, campaign, mean):
+    """Contribution amounts for one campaign, reproducible from (seed, campaign).
+
+    Both the project_funding and funding_contributions generators call this,
+    so current_funding always equals the sum of the campaign's contributions.
+    """
+    rng = random.Random(f"{seed}:contributions:{campaign}")
+    count = min(int(rng.paretovariate(1.5) * mean / 3), mean * 50)
+    return [round(rng.lognormvariate(3.5, 1.2), 6) for _ in range(count)]
+
+
+def campaign_window(seed, campaign, anchor, days):
+    """Creation time and deadline for one campaign, reproducible from (seed, campaign).
+
+    Shared by the project_funding and funding_contributions generators, so
+    every contribution can be dated within its campaign.
+    """
+    rng = random.Random(f"{seed}:campaign_window:{campaign}")
+    created = anchor - timedelta(seconds=rng.uniform(0, days * 86400))
+    return created, created + timedelta(days=rng.choice((30, 60, 90, 180)))
+
+
+class CopyStream:
+    """File-like object that renders generated rows to CSV on demand for COPY ... FROM STDIN.
+
+    Only one chunk of text is buffered at a time, so memory stays flat no
+    matter how many rows are generated.
+    """
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self.row_count = 0
+
+    def read(self, size=-1):
+        size = size if size and size > 0 else 65536
+        while self._buffer.tell() < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow(row)
+            self.row_count += 1
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._buffer.write(data[size:])
+        return data[:size]
+
+
+def generate_users(seed, counts, weights, anchor, days):
+    """Users with unique wallet addresses"""
+    rng = random.Random(f"{seed}:users")
+    for i in range(counts['users']):
+        created = anchor - timedelta(seconds=rng.uniform(0, days * 86400))
+        yield (row_id(seed, 'users', i), wallet(seed, i), f"user{i}", created,
+               'client' if rng.random() < 0.3 else 'user')
+
+
+def generate_projects(seed, counts, weights, anchor, days):
+    """Projects owned by random users"""
+    rng = random.Random(f"{seed}:projects")
+    for i in range(counts['projects']):
+        owner = rng.randrange(counts['users'])
+        created = anchor - timedelta(seconds=rng.uniform(0, days * 86400))
+        yield (row_id(seed, 'projects', i), row_id(seed, 'users', owner), f"Project {i}",
+               f"Synthetic project {i} for load testing", weighted(rng, weights['job_category']),
+               wallet(seed, owner), weighted(rng, weights['project_status']),
+               rng.random() < PROJECT_VERIFIED_RATIO, created, created)
+
+
+def generate_job_listings(seed, counts, weights, anchor, days):
+    """Job listings, most linked to a project, skewed towards recent dates"""
+    rng = random.Random(f"{seed}:job_listings")
+    for i in range(counts['job_listings']):
+        owner = rng.randrange(counts['users'])
+        project = row_id(seed, 'projects', rng.randrange(counts['projects'])) \
+            if counts['projects'] and rng.random() < JOB_PROJECT_RATIO else None
+        # Skew creation towards recent listings, like real traffic
+        created = anchor - timedelta(seconds=days * 86400 * rng.random() ** 2)
+        duration = rng.choice((7, 14, 30, 30, 30, 60))
+        status = weighted(rng, weights['job_status'])
+        yield (row_id(seed, 'job_listings', i), wallet(seed, owner), project, f"Job {i}",
+               f"Company {owner % 2000}", f"Synthetic job listing {i} for load testing",
+               weighted(rng, weights['job_type']), weighted(rng, weights['job_category']),
+               rng.choice(('ADA', 'fiat', 'fiat', 'custom')), weighted(rng, weights['work_arrangement']),
+               'ADA', 25, tx_hash(seed, 'job_listings', i), status,
+               created + timedelta(days=duration), created, created)
+
+
+def generate_project_funding(seed, counts, weights, anchor, days):
+    """Funding campaigns whose current_funding matches their contributions"""
+    rng = random.Random(f"{seed}:project_funding")
+    for i in range(counts['project_funding']):
+        project = rng.randrange(counts['projects'])
+        created, deadline = campaign_window(seed, i, anchor, days)
+        goal = round(rng.lognormvariate(8, 1), 6)
+        raised = round(sum(campaign_contributions(seed, i, counts['contributions_per_campaign'])), 6)
+        yield (row_id(seed, 'project_funding', i), row_id(seed, 'projects', project), goal, raised, deadline,
+               f"Funding round {i}", rng.random() < 0.9, raised >= goal,
+               wallet(seed, project % max(counts['users'], 1)), created, created)
+
+
+def generate_funding_contributions(seed, counts, weights, anchor, days):
+    """Contributions for every campaign, heavy-tailed per campaign and dated between its start and deadline"""
+    rng = random.Random(f"{seed}:funding_contributions")
+    index = 0
+    for campaign in range(counts['project_funding']):
+        campaign_id = row_id(seed, 'project_funding', campaign)
+        start, deadline = campaign_window(seed, campaign, anchor, days)
+        # Campaigns still running have only taken contributions up to the anchor
+        span = (min(deadline, anchor) - start).total_seconds()
+        for amount in campaign_contributions(seed, campaign, counts['contributions_per_campaign']):
+            created = start + timedelta(seconds=rng.uniform(0, span))
+            yield (row_id(seed, 'funding_contributions', index), campaign_id,
+                   wallet(seed, rng.randrange(counts['users'])), amount,
+                   tx_hash(seed, 'funding_contributions', index), rng.random() < 0.1, created)
+            index += 1
+
+
+def generate_scam_reports(seed, counts, weights, anchor, days):
+    """Scam reports, project/job ones pointing at generated rows"""
+    rng = random.Random(f"{seed}:scam_reports")
+    for i in range(counts['scam_reports']):
+        scam_type = weighted(rng, weights['scam_type'])
+        # Project and job ('user') reports point at real rows, exercising the API's regex-cast joins
+        if scam_type == 'project' and counts['projects']:
+            identifier = row_id(seed, 'projects', rng.randrange(counts['projects']))
+        elif scam_type == 'user' and counts['job_listings']:
+            identifier = row_id(seed, 'job_listings', rng.randrange(counts['job_listings']))
+        elif scam_type == 'website':
+            identifier = f"https://scam{i}.example.com"
+        else:
+            identifier = wallet(seed, counts['users'] + i)
+        created = anchor - timedelta(seconds=rng.uniform(0, days * 86400))
+        yield (row_id(seed, 'scam_reports', i), row_id(seed, 'users', rng.randrange(counts['users'])),
+               scam_type, identifier, f"Report {i}", f"Synthetic scam report {i}",
+               rng.choice(('low', 'medium', 'medium', 'high', 'critical')),
+               weighted(rng, weights['scam_status']), created, created)
+
+
+# Column lists and row generators per table
+GENERATORS = {
+    'users': (('id', 'wallet_address', 'username', 'created_at', 'profile_type'), generate_users),
+    'projects': (('id', 'user_id', 'title', 'description', 'category', 'wallet_address', 'status',
+                  'is_verified', 'created_at', 'updated_at'), generate_projects),
+    'job_listings': (('id', 'user_id', 'project_id', 'title', 'company', 'description', 'type', 'category',
+                      'salary_type', 'work_arrangement', 'payment_currency', 'payment_amount', 'tx_hash',
+                      'status', 'expires_at', 'created_at', 'updated_at'), generate_job_listings),
+    'project_funding': (('id', 'project_id', 'funding_goal', 'current_funding', 'funding_deadline',
+                         'funding_purpose', 'is_active', 'is_funded', 'wallet_address', 'created_at',
+                         'updated_at'), generate_project_funding),
+    'funding_contributions': (('id', 'project_funding_id', 'contributor_wallet', 'ada_amount', 'ada_tx_hash',
+                               'is_anonymous', 'created_at'), generate_funding_contributions),
+    'scam_reports': (('id', 'reporter_id', 'scam_type', 'scam_identifier', 'title', 'description', 'severity',
+                      'status', 'created_at', 'updated_at'), generate_scam_reports),
+}
+
+
+def scaled_counts(scale, contributions_per_campaign=DEFAULT_CONTRIBUTIONS_PER_CAMPAIGN):
+    """Row counts for a scale factor (at least one user so foreign keys resolve)"""
+    counts = {table: int(count * scale) for table, count in DEFAULT_COUNTS.items()}
+    counts['users'] = max(counts['users'], 1)
+    counts['contributions_per_campaign'] = contributions_per_campaign
+    return counts
+
+
+def check_counts(counts):
+    """Reject counts that leave generated rows without a parent to reference"""
+    for table in DEFAULT_COUNTS:
+        if counts[table] < 0:
+            raise ValueError(f"--{table.replace('_', '-')} can't be negative")
+    if counts['users'] == 0 and any(counts[table] for table in DEFAULT_COUNTS if table != 'users'):
+        raise ValueError("Every generated table references users; --users must be at least 1")
+    if counts['project_funding'] and not counts['projects']:
+        raise ValueError("Funding campaigns need a project to belong to; --projects must be at least 1")
+
+
+def is_local_database(database_url):
+    """Return True if the DSN points at a Unix socket or a loopback host"""
+    host = parse_dsn(database_url).get('host', '')
+    return host in LOCAL_HOSTS or host.startswith('/')
+
+
+def load_data(conn, counts, seed=0, weights=None, anchor=None, days=DEFAULT_HISTORY_DAYS, truncate=False):
+    """Generate and COPY every table, returning {table: (rows, seconds)}"""
+    weights = weights or DEFAULT_WEIGHTS
+    anchor = anchor or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    cursor = conn.cursor()
+    results = {}
+    try:
+        if truncate:
+            cursor.execute(sql.SQL("TRUNCATE {} RESTART IDENTITY CASCADE").format(
+                sql.SQL(', ').join(sql.Identifier(table) for table in LOAD_ORDER)))
+            print(f"🗑️  Truncated {', '.join(LOAD_ORDER)}")
+
+        for table in LOAD_ORDER:
+            columns, generator = GENERATORS[table]
+            stream = CopyStream(generator(seed, counts, weights, anchor, days))
+            start = time.perf_counter()
+            cursor.copy_expert(sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+                sql.Identifier(table), sql.SQL(', ').join(sql.Identifier(c) for c in columns)), stream)
+            elapsed = time.perf_counter() - start
+            results[table] = (stream.row_count, elapsed)
+            rate = stream.row_count / elapsed if elapsed else 0
+            print(f"✅ {table}: {stream.row_count} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+        conn.commit()
+
+        # Fresh statistics so planner estimates and benchmarks reflect the new data
+        for table in LOAD_ORDER:
+            cursor.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(table)))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return results
+
+
+def parse_weights(specs):
+    """Apply NAME:value=weight,... overrides on top of DEFAULT_WEIGHTS"""
+    weights = {name: dict(values) for name, values in DEFAULT_WEIGHTS.items()}
+    for spec in specs or ():
+        name, _, pairs = spec.partition(':')
+        if name not in weights:
+            raise ValueError(f"Unknown distribution {name!r}; choose from {', '.join(weights)}")
+        weights[name] = {value: float(weight) for value, weight in
+                         (pair.split('=', 1) for pair in pairs.split(','))}
+    return weights
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard synthetic load data generator")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply the default row counts by this factor (default 1.0, ~180k rows)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed; the same seed yields the same rows")
+    parser.add_argument("--contributions-per-campaign", type=int, default=DEFAULT_CONTRIBUTIONS_PER_CAMPAIGN,
+                        help=f"mean contributions per funding campaign (default {DEFAULT_CONTRIBUTIONS_PER_CAMPAIGN})")
+    parser.add_argument("--days", type=int, default=DEFAULT_HISTORY_DAYS,
+                        help=f"days of history to spread created_at over (default {DEFAULT_HISTORY_DAYS})")
+    parser.add_argument("--anchor", type=datetime.fromisoformat, default=None,
+                        help="timestamp the history ends at (default: today 00:00 UTC)")
+    parser.add_argument("--weights", action="append", metavar="NAME:value=weight,...",
+                        help=f"override a distribution ({', '.join(DEFAULT_WEIGHTS)}); may be repeated")
+    parser.add_argument("--truncate", action="store_true", help="empty the generated tables before loading")
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="allow loading into a non-local database")
+    for table in DEFAULT_COUNTS:
+        parser.add_argument(f"--{table.replace('_', '-')}", type=int, default=None,
+                            help=f"exact {table} row count (overrides --scale)")
+    return parser.parse_args()
+
+
+def main():
+    """Main function to generate load data"""
+    args = parse_args()
+
+    print("🏗️  BoneBoard Load Data Generator")
+    print("=" * 50)
+
+    database_url = get_database_url()
+    if database_url and not args.allow_remote and not is_local_database(database_url):
+        print("❌ Refusing to load synthetic data into a non-local database (use --allow-remote)")
+        sys.exit(1)
+
+    try:
+        weights = parse_weights(args.weights)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    counts = scaled_counts(args.scale, args.contributions_per_campaign)
+    for table in DEFAULT_COUNTS:
+        override = getattr(args, table)
+        if override is not None:
+            counts[table] = override
+    try:
+        check_counts(counts)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    anchor = args.anchor
+    if anchor and anchor.tzinfo is None:
+        anchor = anchor.replace(tzinfo=timezone.utc)
+
+    conn = connect_to_database()
+    if not conn:
+        sys.exit(1)
+
+    try:
+        start = time.perf_counter()
+        results = load_data(conn, counts, args.seed, weights, anchor, args.days, args.truncate)
+        total = sum(rows for rows, _ in results.values())
+        print(f"\n🎉 Loaded {total} rows in {time.perf_counter() - start:.1f}s (seed {args.seed})")
+    except Exception as e:
+        print(f"❌ Error generating load data: {e}")
+        sys.exit(1)
+    finally:
+        release_connection(conn)
+        print("\n🔌 Database connection closed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Index Advisor
+EXPLAINs the API's and ops scripts' known query shapes, reads index and
+statement statistics, and proposes CREATE INDEX CONCURRENTLY statements for
+sequential scans on large tables
+"""
+
+import argparse
+import sys
+
+from ops_catalog import SchemaCatalog
+from ops_db import connect_to_database, release_connection
+
+# Tables smaller than this (planner estimate) are fine to scan sequentially
+DEFAULT_MIN_ROWS = 10000
+
+# Placeholder parameter values for EXPLAIN without ANALYZE
+SAMPLE_UUID = '00000000-0000-0000-0000-000000000000'
+SAMPLE_WALLET = 'addr1sample'
+
+# Known query shapes: name -> (sql, params, [(table, index columns, partial predicate), ...])
+# Each candidate is the index that would let that shape avoid a sequential scan of table.
+QUERY_SHAPES = {
+    'jobs_by_user': (
+        "SELECT * FROM job_listings WHERE user_id = %s ORDER BY created_at DESC",
+        (SAMPLE_WALLET,),
+        [('job_listings', ('user_id', 'created_at DESC'), None)],
+    ),
+    'jobs_by_status': (
+        "SELECT * FROM job_listings WHERE status = %s ORDER BY created_at DESC",
+        ('confirmed',),
+        [('job_listings', ('status', 'created_at DESC'), None)],
+    ),
+    'jobs_by_project': (
+        "SELECT * FROM job_listings WHERE project_id = %s",
+        (SAMPLE_UUID,),
+        [('job_listings', ('project_id',), None)],
+    ),
+    'jobs_by_tx_hash': (
+        "SELECT id FROM job_listings WHERE tx_hash = %s",
+        ('0' * 64,),
+        [('job_listings', ('tx_hash',), None)],
+    ),
+    'jobs_list_active': (
+        """SELECT * FROM job_listings
+           WHERE expires_at > NOW() AND status IN ('confirmed', 'pending')
+           ORDER BY created_at DESC LIMIT 50""",
+        (),
+        [('job_listings', ('created_at DESC',), "status IN ('confirmed', 'pending')")],
+    ),
+    'jobs_expiry_sweep': (
+        """SELECT id FROM job_listings
+           WHERE status IN ('pending', 'confirmed', 'active') AND expires_at <= NOW()""",
+        (),
+        [('job_listings', ('expires_at',), "status IN ('pending', 'confirmed', 'active')")],
+    ),
+    'funding_by_wallet': (
+        "SELECT * FROM project_funding WHERE wallet_address = %s ORDER BY created_at DESC",
+        (SAMPLE_WALLET,),
+        [('project_funding', ('wallet_address',), None)],
+    ),
+    'funding_active': (
+        "SELECT * FROM project_funding WHERE is_active = true ORDER BY created_at DESC",
+        (),
+        [('project_funding', ('created_at DESC',), "is_active = true")],
+    ),
+    'funding_unfunded': (
+        "SELECT id FROM project_funding WHERE is_active = true AND is_funded = false",
+        (),
+        [('project_funding', ('funding_deadline',), "is_active = true AND is_funded = false")],
+    ),
+    'funding_expiry_sweep': (
+        """SELECT id FROM project_funding
+           WHERE is_active = true AND is_funded = false AND funding_deadline <= NOW()""",
+        (),
+        [('project_funding', ('funding_deadline',), "is_active = true AND is_funded = false")],
+    ),
+    'contributions_by_campaign': (
+        "SELECT * FROM funding_contributions WHERE project_funding_id = %s ORDER BY created_at DESC",
+        (SAMPLE_UUID,),
+        [('funding_contributions', ('project_funding_id', 'created_at DESC'), None)],
+    ),
+}
+
+
+def load_indexes(cursor):
+    """Return {table: [(index, [key columns...], predicate), ...]} for the current schema.
+
+    Key columns carry a " DESC" suffix when the index sorts them descending.
+    """
+    cursor.execute("""
+        SELECT t.relname, i.relname,
+               array_agg(COALESCE(a.attname, pg_get_indexdef(ix.indexrelid, k.ord::int, true))
+                         || CASE WHEN ix.indoption[k.ord - 1] & 1 = 1 THEN ' DESC' ELSE '' END
+                         ORDER BY k.ord),
+               pg_get_expr(ix.indpred, ix.indrelid)
+        FROM pg_index ix
+        JOIN pg_class t ON t.oid = ix.indrelid
+        JOIN pg_class i ON i.oid = ix.indexrelid
+        JOIN pg_namespace n ON n.oid = t.relnamespace
+        CROSS JOIN LATERAL unnest(ix.indkey) WITH ORDINALITY AS k(attnum, ord)
+        LEFT JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum AND k.attnum > 0
+        WHERE n.nspname = current_schema()
+        AND k.ord <= ix.indnkeyatts
+        GROUP BY t.relname, i.relname, ix.indpred, ix.indrelid
+    """)
+    indexes = {}
+    for table, index, columns, predicate in cursor.fetchall():
+        indexes.setdefault(table, []).append((index, list(columns), predicate))
+    return indexes
+
+
+def deparse_predicates(conn):
+    """Return {(table, predicate): predicate as pg_get_expr prints it} for every partial candidate.
+
+    Each predicate is put on an index over an empty temporary copy of its
+    table and read back, so it compares equal to an existing index's
+    predicate however either was written. Nothing is kept.
+    """
+    cursor = conn.cursor()
+    deparsed = {}
+    try:
+        for _, _, candidates in QUERY_SHAPES.values():
+            for table, columns, predicate in candidates:
+                if predicate is None or (table, predicate) in deparsed:
+                    continue
+                probe = f"advisor_probe_{table}"
+                cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS {probe} (LIKE {table})")
+                cursor.execute(f"CREATE INDEX {probe}_{len(deparsed)} ON {probe} ({columns[0]}) WHERE {predicate}")
+                cursor.execute("SELECT pg_get_expr(indpred, indrelid) FROM pg_index WHERE indexrelid = %s::regclass",
+                               (f"{probe}_{len(deparsed)}",))
+                deparsed[(table, predicate)] = cursor.fetchone()[0]
+    finally:
+        conn.rollback()
+        cursor.close()
+    return deparsed
+
+
+def _sort_key(column):
+    name, _, direction = column.partition(' ')
+    return name, direction.strip().upper() == 'DESC'
+
+
+def is_covered(indexes, table, columns, predicate=None):
+    """True if an existing index on table can serve the candidate.
+
+    The index's key must start with the candidate's columns, sorted the same
+    way or all reversed (a backward scan gives the same order). A partial
+    candidate is only covered by an index with the same predicate; a plain
+    one by an index that isn't partial.
+    """
+    wanted = [_sort_key(column) for column in columns]
+    for _, index_columns, index_predicate in indexes.get(table, ()):
+        if index_predicate != predicate:
+            continue
+        have = [_sort_key(column) for column in index_columns[:len(wanted)]]
+        if [name for name, _ in have] != [name for name, _ in wanted]:
+            continue
+        directions = {desc == wanted_desc for (_, desc), (_, wanted_desc) in zip(have, wanted)}
+        if len(directions) == 1:
+            return True
+    return False
+
+
+def seq_scanned_tables(plan):
+    """Return {table: filter} for every Seq Scan node in an EXPLAIN (FORMAT JSON) plan"""
+    found = {}
+
+    def walk(node):
+        if node.get('Node Type') == 'Seq Scan':
+            found[node.get('Relation Name')] = node.get('Filter')
+        for child in node.get('Plans', ()):
+            walk(child)
+
+    walk(plan['Plan'])
+    return found
+
+
+def explain_shapes(conn, analyze=False):
+    """EXPLAIN every known query shape, returning {shape: {table: filter}} of seq scans"""
+    cursor = conn.cursor()
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    results = {}
+    for name, (query, params, _) in QUERY_SHAPES.items():
+        try:
+            cursor.execute(f"EXPLAIN ({options}) {query}", params)
+            results[name] = seq_scanned_tables(cursor.fetchone()[0][0])
+        except Exception as e:
+            print(f"⚠️  Could not explain {name}: {e}")
+            results[name] = {}
+        conn.rollback()
+    cursor.close()
+    return results
+
+
+def index_name(table, columns, predicate):
+    """Conventional idx_<table>_<columns>[_partial] name"""
+    parts = [column.split()[0] for column in columns]
+    return f"idx_{table}_{'_'.join(parts)}" + ("_partial" if predicate else "")
+
+
+def index_ddl(table, columns, predicate):
+    """CREATE INDEX CONCURRENTLY statement for a candidate"""
+    ddl = (f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name(table, columns, predicate)} "
+           f"ON {table} ({', '.join(columns)})")
+    return ddl + (f" WHERE {predicate};" if predicate else ";")
+
+
+def propose_indexes(catalog, indexes, scans, min_rows=DEFAULT_MIN_ROWS, predicates=None):
+    """Return [(shape, table, ddl)] for seq-scanned large tables without a suitable index.
+
+    predicates maps (table, predicate) to its deparsed form (deparse_predicates)
+    for comparison with existing partial indexes.
+    """
+    predicates = predicates or {}
+    proposals = []
+    seen = set()
+    for name, (_, _, candidates) in QUERY_SHAPES.items():
+        for table, columns, predicate in candidates:
+            if table not in scans.get(name, {}):
+                continue
+            existing = predicates.get((table, predicate), predicate)
+            if catalog.tables.get(table, 0) < min_rows or is_covered(indexes, table, columns, existing):
+                continue
+            ddl = index_ddl(table, columns, predicate)
+            if ddl not in seen:
+                seen.add(ddl)
+                proposals.append((name, table, ddl))
+    return proposals
+
+
+def table_scan_stats(cursor, min_rows):
+    """Large tables ordered by rows read through sequential scans"""
+    cursor.execute("""
+        SELECT relname, n_live_tup, seq_scan, seq_tup_read, COALESCE(idx_scan, 0)
+        FROM pg_stat_user_tables
+        WHERE schemaname = current_schema() AND n_live_tup >= %s
+        ORDER BY seq_tup_read DESC
+    """, (min_rows,))
+    return cursor.fetchall()
+
+
+def unused_indexes(cursor):
+    """Non-unique indexes that have never been used for a scan"""
+    cursor.execute("""
+        SELECT s.relname, s.indexrelname, pg_size_pretty(pg_relation_size(s.indexrelid))
+        FROM pg_stat_user_indexes s
+        JOIN pg_index ix ON ix.indexrelid = s.indexrelid
+        WHERE s.schemaname = current_schema() AND s.idx_scan = 0 AND NOT ix.indisunique
+        ORDER BY pg_relation_size(s.indexrelid) DESC
+    """)
+    return cursor.fetchall()
+
+
+def top_statements(cursor, limit):
+    """Most expensive statements from pg_stat_statements, or None if the extension is unavailable"""
+    cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+    if not cursor.fetchone():
+        return None
+    try:
+        cursor.execute("""
+            SELECT calls, total_exec_time, mean_exec_time, query
+            FROM pg_stat_statements
+            ORDER BY total_exec_time DESC
+            LIMIT %s
+        """, (limit,))
+        return cursor.fetchall()
+    except Exception:
+        cursor.connection.rollback()
+        return None
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard index advisor")
+    parser.add_argument("--min-rows", type=int, default=DEFAULT_MIN_ROWS,
+                        help=f"ignore tables with fewer estimated rows (default {DEFAULT_MIN_ROWS})")
+    parser.add_argument("--analyze", action="store_true",
+                        help="use EXPLAIN ANALYZE (executes the read-only shapes)")
+    parser.add_argument("--top", type=int, default=10,
+                        help="statements to show from pg_stat_statements (default 10)")
+    parser.add_argument("--sql-out", default=None, help="also write the proposed DDL to this file")
+    return parser.parse_args()
+
+
+def main():
+    """Main function to run the index advisor"""
+    args = parse_args()
+
+    print("🧭 BoneBoard Index Advisor")
+    print("=" * 50)
+
+    conn = connect_to_database()
+    if not conn:
+        sys.exit(1)
+
+    cursor = conn.cursor()
+    try:
+        catalog = SchemaCatalog.load(cursor)
+        indexes = load_indexes(cursor)
+        scans = explain_shapes(conn, args.analyze)
+
+        print("\n🔎 QUERY SHAPES")
+        print("=" * 80)
+        for name, tables in scans.items():
+            large = {table: condition for table, condition in tables.items()
+                     if catalog.tables.get(table, 0) >= args.min_rows}
+            if large:
+                for table, condition in large.items():
+                    print(f"  ❌ {name}: Seq Scan on {table} (~{catalog.tables[table]} rows)"
+                          + (f" filter {condition}" if condition else ""))
+            else:
+                print(f"  ✅ {name}")
+
+        print("\n📈 SEQUENTIAL SCAN ACTIVITY (pg_stat_user_tables)")
+        print("=" * 80)
+        for table, live, seq_scan, seq_read, idx_scan in table_scan_stats(cursor, args.min_rows):
+            print(f"  {table}: {live} rows, {seq_scan} seq scans ({seq_read} rows read), {idx_scan} index scans")
+
+        unused = unused_indexes(cursor)
+        if unused:
+            print("\n🪦 UNUSED INDEXES (pg_stat_user_indexes)")
+            print("=" * 80)
+            for table, index, size in unused:
+                print(f"  {table}.{index} ({size})")
+
+        statements = top_statements(cursor, args.top)
+        print("\n🐢 TOP STATEMENTS (pg_stat_statements)")
+        print("=" * 80)
+        if statements is None:
+            print("  ℹ️  pg_stat_statements is not installed; skipping")
+        else:
+            for calls, total, mean, query in statements:
+                print(f"  {total:>12.1f} ms total  {mean:>9.2f} ms mean  {calls:>8} calls  "
+                      f"{' '.join(query.split())[:100]}")
+
+        proposals = propose_indexes(catalog, indexes, scans, args.min_rows, deparse_predicates(conn))
+        print("\n🛠️  PROPOSED INDEXES")
+        print("=" * 80)
+        if not proposals:
+            print("  ✅ No missing indexes for the known query shapes")
+        for name, table, ddl in proposals:
+            print(f"-- {name}")
+            print(ddl)
+
+        if args.sql_out and proposals:
+            with open(args.sql_out, "w") as f:
+                f.write("-- Generated by index_advisor.py; CONCURRENTLY cannot run inside a transaction block\n")
+                for name, table, ddl in proposals:
+                    f.write(f"-- {name}\n{ddl}\n")
+            print(f"\n💾 DDL written to {args.sql_out}")
+        conn.rollback()
+
+    except Exception as e:
+        print(f"❌ Error during analysis: {e}")
+        conn.rollback()
+        sys.exit(1)
+    finally:
+        cursor.close()
+        release_connection(conn)
+        print("\n🔌 Database connection closed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Async Ops Core
+asyncio execution on psycopg 3, pipelining independent statements so they
+are in flight together on a single connection
+"""
+
+import asyncio
+import random
+
+try:
+    import psycopg
+except ImportError:  # only the async commands need psycopg 3
+    psycopg = None
+
+from ops_db import CONNECT_TIMEOUT, MAX_RETRIES, RETRY_BACKOFF, STATEMENT_TIMEOUT_MS, get_database_url
+
+
+async def connect_async():
+    """Open an async connection to the PostgreSQL database, or return None on failure"""
+    if psycopg is None:
+        print("❌ The async commands need psycopg 3: pip install 'psycopg[binary]'")
+        return None
+    database_url = get_database_url()
+    if not database_url:
+        print("❌ DATABASE_URL or POSTGRES_URL environment variable is required")
+        return None
+
+    print("🔌 Connecting to BoneBoard database...")
+    attempt = 0
+    while True:
+        try:
+            conn = await psycopg.AsyncConnection.connect(
+                database_url,
+                connect_timeout=CONNECT_TIMEOUT,
+                application_name="boneboard-ops",
+                options=f"-c statement_timeout={STATEMENT_TIMEOUT_MS}",
+            )
+            print("✅ Connected successfully")
+            return conn
+        except psycopg.OperationalError as e:
+            if attempt >= MAX_RETRIES:
+                print(f"❌ Database connection failed: {e}")
+                return None
+            delay = RETRY_BACKOFF * (2 ** attempt) * (1 + random.random() * 0.25)
+            attempt += 1
+            print(f"⚠️  Transient database error ({e.__class__.__name__}), retry {attempt}/{MAX_RETRIES} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+async def run_pipeline(conn, statements):
+    """Send every (query, params) pair in one pipeline and return their results in order.
+
+    All statements are on the wire before the first result is read, so the
+    batch costs one round trip instead of one per statement. Each result is
+    (rows, rowcount); rows is None for statements that return no result set.
+    The statements share the connection's current transaction.
+    """
+    cursors = []
+    async with conn.pipeline():
+        for query, params in statements:
+            cursor = conn.cursor()
+            await cursor.execute(query, params)
+            cursors.append(cursor)
+
+    results = []
+    for cursor in cursors:
+        rows = await cursor.fetchall() if cursor.description is not None else None
+        results.append((rows, cursor.rowcount))
+        await cursor.close()
+    return results
+
+
+async def fetch_pipelined(conn, queries):
+    """Run a {name: (query, params)} mapping in one pipeline and return {name: rows}"""
+    results = await run_pipeline(conn, queries.values())
+    return {name: rows for name, (rows, _) in zip(queries, results)}
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Ops Snapshot Cache
+Local SQLite copy of projects, job listings and funding campaigns for the
+inspectors, refreshed incrementally by updated_at and read without touching
+the database while it is fresher than a TTL
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from psycopg2 import sql
+
+from ops_catalog import RowCount
+from ops_db import connect_to_database, get_database_url, release_connection, stream_rows
+
+# One snapshot file per database URL lives here
+CACHE_DIR = ".ops_cache"
+
+# Seconds a snapshot is served without checking the database
+DEFAULT_TTL = 300
+
+# Rows updated this long before the last watermark are pulled again, so a transaction
+# that committed after a later one (with an older updated_at) isn't missed
+SETTLE_INTERVAL = '1 minute'
+
+# Mirrored columns per table. The declared types pick the converters below; the
+# *_TEXT names keep SQLite's type affinity from turning decimals into floats.
+SNAPSHOT_TABLES = {
+    'projects': [
+        ('id', 'TEXT PRIMARY KEY'), ('title', 'TEXT'), ('category', 'TEXT'), ('wallet_address', 'TEXT'),
+        ('is_verified', 'BOOL'), ('created_at', 'TIMESTAMPTZ_TEXT'), ('updated_at', 'TIMESTAMPTZ_TEXT'),
+    ],
+    'job_listings': [
+        ('id', 'TEXT PRIMARY KEY'), ('title', 'TEXT'), ('company', 'TEXT'), ('project_id', 'TEXT'),
+        ('user_id', 'TEXT'), ('status', 'TEXT'), ('expires_at', 'TIMESTAMPTZ_TEXT'),
+        ('created_at', 'TIMESTAMPTZ_TEXT'), ('updated_at', 'TIMESTAMPTZ_TEXT'),
+    ],
+    'project_funding': [
+        ('id', 'TEXT PRIMARY KEY'), ('project_id', 'TEXT'), ('funding_purpose', 'TEXT'),
+        ('funding_goal', 'DECIMAL_TEXT'), ('current_funding', 'DECIMAL_TEXT'),
+        ('funding_deadline', 'TIMESTAMPTZ_TEXT'), ('is_active', 'BOOL'), ('is_funded', 'BOOL'),
+        ('created_at', 'TIMESTAMPTZ_TEXT'), ('updated_at', 'TIMESTAMPTZ_TEXT'),
+    ],
+}
+
+
+def _adapt_datetime(value):
+    # Fixed-width UTC text sorts and compares in time order
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.isoformat(timespec='microseconds')
+
+
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(UUID, str)
+sqlite3.register_converter('TIMESTAMPTZ_TEXT', lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter('DECIMAL_TEXT', lambda value: Decimal(value.decode()))
+sqlite3.register_converter('BOOL', lambda value: bool(int(value)))
+
+
+class Snapshot:
+    """SQLite snapshot of the inspected tables with a per-table updated_at watermark"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES)
+        self._ensure_tables()
+
+    @classmethod
+    def for_database(cls, database_url=None):
+        """Open the snapshot belonging to database_url (default: the configured database)"""
+        key = hashlib.sha256((database_url or get_database_url() or "").encode()).hexdigest()[:16]
+        return cls(os.path.join(CACHE_DIR, f"snapshot_{key}.sqlite3"))
+
+    def _ensure_tables(self):
+        for table, columns in SNAPSHOT_TABLES.items():
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} "
+                              f"({', '.join(f'{name} {kind}' for name, kind in columns)})")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS snapshot_meta (
+                table_name TEXT PRIMARY KEY,
+                watermark TIMESTAMPTZ_TEXT,
+                refreshed_at TIMESTAMPTZ_TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def age(self):
+        """Seconds since the stalest table was refreshed, or None if any table never was"""
+        rows = dict(self.conn.execute("SELECT table_name, refreshed_at FROM snapshot_meta").fetchall())
+        if any(table not in rows for table in SNAPSHOT_TABLES):
+            return None
+        oldest = min(rows[table] for table in SNAPSHOT_TABLES)
+        return (datetime.now(timezone.utc) - oldest).total_seconds()
+
+    def refresh(self, conn):
+        """Pull rows changed since each table's watermark from one consistent database snapshot.
+
+        Deletes can't be seen through updated_at, so whenever the cached and
+        live row counts disagree afterwards the table's ids are reconciled.
+        Returns {table: (rows pulled, rows removed)}.
+        """
+        results = {}
+        cursor = conn.cursor()
+        start = time.perf_counter()
+        try:
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            for table, columns in SNAPSHOT_TABLES.items():
+                results[table] = self._refresh_table(conn, cursor, table, [name for name, _ in columns])
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            conn.rollback()
+            cursor.close()
+
+        summary = ", ".join(f"{table} +{pulled}/-{removed}" for table, (pulled, removed) in results.items())
+        print(f"📦 Snapshot refreshed in {(time.perf_counter() - start) * 1000:.0f} ms ({summary})")
+        return results
+
+    def _refresh_table(self, conn, cursor, table, columns):
+        row = self.conn.execute("SELECT watermark FROM snapshot_meta WHERE table_name = ?", (table,)).fetchone()
+        watermark = row[0] if row else None
+        select = sql.SQL("SELECT {} FROM {}").format(
+            sql.SQL(', ').join(sql.Identifier(column) for column in columns), sql.Identifier(table))
+        if row is None:
+            query, params = select, None
+        else:
+            query = sql.SQL("{} WHERE updated_at >= %s::timestamptz - INTERVAL {}").format(
+                select, sql.Literal(SETTLE_INTERVAL))
+            params = (watermark or '-infinity',)
+
+        insert = (f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                  f"VALUES ({', '.join('?' for _ in columns)})")
+        updated_at = columns.index('updated_at')
+        pulled = 0
+        batch = []
+        for values in stream_rows(conn, query, params, name=f"snapshot_{table}"):
+            batch.append(values)
+            if values[updated_at] is not None and (watermark is None or values[updated_at] > watermark):
+                watermark = values[updated_at]
+            if len(batch) >= 1000:
+                self.conn.executemany(insert, batch)
+                pulled += len(batch)
+                batch = []
+        self.conn.executemany(insert, batch)
+        pulled += len(batch)
+
+        removed = 0
+        cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(table)))
+        if cursor.fetchone()[0] != self.row_count(table).count:
+            added, removed = self._reconcile(conn, cursor, table, select, insert)
+            pulled += added
+
+        self.conn.execute("INSERT OR REPLACE INTO snapshot_meta VALUES (?, ?, ?)",
+                          (table, watermark, datetime.now(timezone.utc)))
+        return pulled, removed
+
+    def _reconcile(self, conn, cursor, table, select, insert):
+        """Make the cached ids match the live table: drop deleted rows and pull any that were missed"""
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS live_ids (id TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM live_ids")
+        id_query = sql.SQL("SELECT id::text FROM {}").format(sql.Identifier(table))
+        self.conn.executemany("INSERT INTO live_ids VALUES (?)",
+                              stream_rows(conn, id_query, name=f"snapshot_{table}_ids"))
+        removed = self.conn.execute(f"DELETE FROM {table} WHERE id NOT IN (SELECT id FROM live_ids)").rowcount
+        missing = [row[0] for row in self.conn.execute(
+            f"SELECT id FROM live_ids WHERE id NOT IN (SELECT id FROM {table})").fetchall()]
+        if missing:
+            cursor.execute(sql.SQL("{} WHERE id = ANY(%s::uuid[])").format(select), (missing,))
+            self.conn.executemany(insert, cursor.fetchall())
+        return len(missing), removed
+
+    def row_count(self, table):
+        """Cached row count, as a RowCount like ops_catalog.get_row_counts returns"""
+        return RowCount(self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0], False)
+
+    def rows(self, query, limit=None):
+        """Run a listing query (plain SQL such as check_database.PROJECTS_QUERY) against the snapshot"""
+        if limit is not None:
+            query = f"{query} LIMIT {int(limit)}"
+        return self.conn.execute(query).fetchall()
+
+    def summary_stats(self, top_n=10):
+        """The same report as check_database.fetch_summary_stats, computed from the snapshot"""
+        start = time.perf_counter()
+        job_status = self.conn.execute("""
+            SELECT status, COUNT(*), COUNT(project_id)
+            FROM job_listings
+            GROUP BY status
+            ORDER BY COUNT(*) DESC
+        """).fetchall()
+        funding_status = self.conn.execute("""
+            SELECT CASE
+                       WHEN is_funded THEN 'completed'
+                       WHEN funding_deadline < ? THEN 'expired'
+                       ELSE 'active'
+                   END AS status,
+                   COUNT(*)
+            FROM project_funding
+            GROUP BY 1
+            ORDER BY 2 DESC
+        """, (datetime.now(timezone.utc),)).fetchall()
+        top_projects = self.conn.execute("""
+            SELECT p.id, p.title, j.job_count
+            FROM (
+                SELECT project_id, COUNT(*) AS job_count
+                FROM job_listings
+                WHERE project_id IS NOT NULL
+                GROUP BY project_id
+                ORDER BY job_count DESC
+                LIMIT ?
+            ) j
+            JOIN projects p ON p.id = j.project_id
+            ORDER BY j.job_count DESC
+        """, (top_n,)).fetchall()
+        elapsed = time.perf_counter() - start
+
+        jobs_total = sum(total for _, total, _ in job_status)
+        jobs_with_projects = sum(with_project for _, _, with_project in job_status)
+        stats = {
+            'project_count': self.row_count('projects').count,
+            'job_count': jobs_total,
+            'job_status': {status: total for status, total, _ in job_status},
+            'funding_status': {status: total for status, total in funding_status},
+            'jobs_with_projects': jobs_with_projects,
+            'jobs_without_projects': jobs_total - jobs_with_projects,
+            'top_projects': [list(row) for row in top_projects],
+        }
+        return stats, elapsed
+
+
+def open_snapshot(ttl=DEFAULT_TTL, conn=None):
+    """Return a Snapshot no older than ttl seconds, refreshing it first if needed.
+
+    A fresh snapshot is returned without connecting to the database. When a
+    refresh is needed, conn is used if given, otherwise a pooled connection.
+    Returns None if the snapshot is stale and the database can't be reached.
+    """
+    snapshot = Snapshot.for_database()
+    age = snapshot.age()
+    if age is not None and age <= ttl:
+        print(f"📦 Reading snapshot {snapshot.path} ({age:.0f}s old, TTL {ttl}s; --no-cache for live data)")
+        return snapshot
+
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_to_database()
+        if not conn:
+            snapshot.close()
+            return None
+    try:
+        snapshot.refresh(conn)
+    except Exception:
+        snapshot.close()
+        raise
+    finally:
+        if own_conn:
+            release_connection(conn)
+    return snapshot
+
+
+def add_cache_args(parser):
+    """Add the shared snapshot cache options to an argparse parser"""
+    group = parser.add_argument_group("snapshot cache")
+    group.add_argument("--no-cache", action="store_true",
+                       help="read live from the database instead of the local snapshot")
+    group.add_argument("--cache-ttl", type=int, default=DEFAULT_TTL,
+                       help=f"seconds a snapshot is used before it is refreshed (default {DEFAULT_TTL}; 0 always refreshes)")
+    return group
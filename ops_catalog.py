@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Schema Catalog
+Loads tables, columns, sequences and foreign keys from pg_catalog once per run
+and answers existence checks from memory
+"""
+
+from collections import namedtuple
+
+from psycopg2 import sql
+
+# Current funding table and the legacy name older scripts still refer to
+FUNDING_TABLE = 'project_funding'
+LEGACY_FUNDING_TABLE = 'project_fundings'
+
+
+class RowCount(namedtuple('RowCount', ['count', 'estimated'])):
+    """A table row count and whether it came from planner statistics"""
+
+    @property
+    def label(self):
+        return "estimated" if self.estimated else "exact"
+
+    def __str__(self):
+        return f"~{self.count}" if self.estimated else str(self.count)
+
+
+def get_row_counts(cursor, tables, exact=False):
+    """Return {table: RowCount} for each table.
+
+    Unless exact is set, counts come from pg_class the same way the planner
+    estimates them: reltuples per page scaled to the table's current size.
+    Tables that have never been analyzed (or whose stats show no pages while
+    the table has data) fall back to an exact COUNT(*).
+    """
+    counts = {}
+    pending = list(tables)
+    if not exact and pending:
+        cursor.execute("""
+            SELECT c.relname,
+                   CASE
+                       WHEN c.reltuples < 0 THEN NULL
+                       WHEN c.relpages = 0 THEN
+                           CASE WHEN pg_relation_size(c.oid) = 0 THEN 0 END
+                       ELSE (c.reltuples / c.relpages
+                             * (pg_relation_size(c.oid) / current_setting('block_size')::int))::bigint
+                   END
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = current_schema()
+            AND c.relname = ANY(%s)
+        """, (pending,))
+        for table, estimate in cursor.fetchall():
+            if estimate is not None:
+                counts[table] = RowCount(estimate, True)
+        pending = [table for table in pending if table not in counts]
+
+    for table in pending:
+        cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(table)))
+        counts[table] = RowCount(cursor.fetchone()[0], False)
+    return counts
+
+
+class SchemaCatalog:
+    """In-memory snapshot of the current schema's tables, columns, sequences and foreign keys"""
+
+    def __init__(self, tables, columns, sequences, foreign_keys):
+        self.tables = tables              # {table: estimated row count}
+        self.columns = columns            # {table: [column, ...]} in ordinal order
+        self.sequences = sequences        # [sequence, ...]
+        self.foreign_keys = foreign_keys  # [(table, column, referenced_table, referenced_column), ...]
+
+    @classmethod
+    def load(cls, cursor):
+        """Read the catalog for the current schema"""
+        cursor.execute("""
+            SELECT c.relname, c.reltuples::bigint
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = current_schema()
+            AND c.relkind IN ('r', 'p')
+        """)
+        tables = {name: estimate for name, estimate in cursor.fetchall()}
+
+        cursor.execute("""
+            SELECT c.relname, a.attname
+            FROM pg_attribute a
+            JOIN pg_class c ON c.oid = a.attrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = current_schema()
+            AND c.relkind IN ('r', 'p')
+            AND a.attnum > 0
+            AND NOT a.attisdropped
+            ORDER BY c.relname, a.attnum
+        """)
+        columns = {}
+        for table, column in cursor.fetchall():
+            columns.setdefault(table, []).append(column)
+
+        cursor.execute("""
+            SELECT c.relname
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = current_schema()
+            AND c.relkind = 'S'
+            ORDER BY c.relname
+        """)
+        sequences = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT src.relname, src_col.attname, dst.relname, dst_col.attname
+            FROM pg_constraint con
+            JOIN pg_class src ON src.oid = con.conrelid
+            JOIN pg_class dst ON dst.oid = con.confrelid
+            JOIN pg_namespace n ON n.oid = src.relnamespace
+            CROSS JOIN LATERAL unnest(con.conkey, con.confkey) AS k(src_attnum, dst_attnum)
+            JOIN pg_attribute src_col ON src_col.attrelid = con.conrelid AND src_col.attnum = k.src_attnum
+            JOIN pg_attribute dst_col ON dst_col.attrelid = con.confrelid AND dst_col.attnum = k.dst_attnum
+            WHERE con.contype = 'f'
+            AND n.nspname = current_schema()
+            ORDER BY src.relname, src_col.attname
+        """)
+        foreign_keys = cursor.fetchall()
+
+        cursor.connection.commit()
+        return cls(tables, columns, sequences, foreign_keys)
+
+    def has_table(self, table):
+        """Return True if table exists"""
+        return table in self.tables
+
+    def has_column(self, table, column):
+        """Return True if table has column"""
+        return column in self.columns.get(table, ())
+
+    def referencing(self, table):
+        """Return the tables with a foreign key pointing at table"""
+        return sorted({src for src, _, dst, _ in self.foreign_keys if dst == table and src != table})
+
+    def resolve_table(self, *candidates):
+        """Return the first candidate table name that exists, or None"""
+        for table in candidates:
+            if self.has_table(table):
+                return table
+        return None
+
+    def funding_table(self):
+        """Return the funding table name this database actually uses"""
+        return self.resolve_table(FUNDING_TABLE, LEGACY_FUNDING_TABLE)
+
+    def schema_warnings(self):
+        """Describe mismatches the ops scripts should know about before doing work"""
+        warnings = []
+        has_current = self.has_table(FUNDING_TABLE)
+        has_legacy = self.has_table(LEGACY_FUNDING_TABLE)
+        if has_current and has_legacy:
+            warnings.append(f"Both {FUNDING_TABLE} and legacy {LEGACY_FUNDING_TABLE} exist; "
+                            f"using {FUNDING_TABLE}")
+        elif has_legacy:
+            warnings.append(f"Only legacy {LEGACY_FUNDING_TABLE} exists; "
+                            f"the API and scripts expect {FUNDING_TABLE}")
+        elif not has_current:
+            warnings.append(f"Neither {FUNDING_TABLE} nor {LEGACY_FUNDING_TABLE} exists")
+        return warnings
+
+    def print_warnings(self):
+        """Print schema warnings, returning True if there were none"""
+        warnings = self.schema_warnings()
+        for warning in warnings:
+            print(f"⚠️  Schema: {warning}")
+        return not warnings
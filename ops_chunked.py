@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Chunked Executor
+Runs destructive maintenance statements over primary-key ranges, committing
+after each chunk and recording progress in a checkpoint file so an
+interrupted run resumes where it stopped
+"""
+
+import json
+import os
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from psycopg2 import sql
+
+from ops_db import run_transaction
+
+# Rows per primary-key range
+DEFAULT_CHUNK_SIZE = 5000
+
+# Where checkpoints live unless --checkpoint is given
+CHECKPOINT_DIR = ".ops_checkpoints"
+
+# UUID primary keys are walked in order; ranges are (lo, hi] so the nil UUID starts the walk
+MIN_UUID = '00000000-0000-0000-0000-000000000000'
+MAX_UUID = 'ffffffff-ffff-ffff-ffff-ffffffffffff'
+
+# One unit of chunked work: statement runs once per range of table's primary key and must
+# restrict itself with RANGE_PREDICATE (it receives %(lo)s and %(hi)s plus the run's params)
+ChunkStep = namedtuple('ChunkStep', ['label', 'table', 'statement'])
+
+RANGE_PREDICATE = "id > %(lo)s::uuid AND id <= %(hi)s::uuid"
+
+
+class Checkpoint:
+    """JSON file recording which step and primary key a chunked run last committed"""
+
+    def __init__(self, path):
+        self.path = path
+
+    @classmethod
+    def for_job(cls, job, path=None):
+        return cls(path or os.path.join(CHECKPOINT_DIR, f"{job}.json"))
+
+    def load(self):
+        """Return the saved state, or None if there is no checkpoint"""
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, state):
+        """Atomically replace the checkpoint with state"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = {**state, 'updated_at': datetime.now(timezone.utc).isoformat()}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f, indent=2, default=str)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        """Remove the checkpoint once the run has finished"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def next_boundary(cursor, table, lo, chunk_size):
+    """Return the primary key closing the chunk after lo, or None if fewer than chunk_size rows remain"""
+    cursor.execute(sql.SQL("""
+        SELECT id FROM {}
+        WHERE id > %s::uuid
+        ORDER BY id
+        OFFSET %s LIMIT 1
+    """).format(sql.Identifier(table)), (lo, chunk_size - 1))
+    row = cursor.fetchone()
+    return str(row[0]) if row else None
+
+
+def _run_chunk(cursor, step, params, lo, chunk_size):
+    hi = next_boundary(cursor, step.table, lo, chunk_size)
+    cursor.execute(step.statement, {**params, 'lo': lo, 'hi': hi or MAX_UUID})
+    return hi, max(cursor.rowcount, 0)
+
+
+def run_chunked(conn, job, steps, params=None, chunk_size=DEFAULT_CHUNK_SIZE, checkpoint=None, restart=False,
+                throttle=None):
+    """Run each step over its table in primary-key chunks, committing and checkpointing after every chunk.
+
+    params are passed to every statement and saved with the checkpoint, so a
+    resumed run uses the same values (e.g. the expiry cutoff) as the run it
+    continues; the saved params win over the ones passed in. Returns
+    {step label: rows affected} and removes the checkpoint when every step
+    has finished. A throttle (ops_throttle.Throttle) paces the chunks, and a
+    chunk that hits a deadlock or serialization failure is rerun.
+    """
+    checkpoint = checkpoint or Checkpoint.for_job(job)
+    state = None if restart else checkpoint.load()
+    if state and state.get('job') != job:
+        raise ValueError(f"Checkpoint {checkpoint.path} belongs to job {state.get('job')!r}, not {job!r}")
+
+    if state:
+        params = state['params']
+        print(f"▶️  Resuming {job} from {checkpoint.path}: step {state['step'] + 1}/{len(steps)}, "
+              f"after id {state['last_id']}")
+    else:
+        state = {'job': job, 'params': params or {}, 'step': 0, 'last_id': MIN_UUID,
+                 'totals': {}, 'started_at': datetime.now(timezone.utc).isoformat()}
+        params = state['params']
+
+    try:
+        for index in range(state['step'], len(steps)):
+            step = steps[index]
+            lo = state['last_id'] if index == state['step'] else MIN_UUID
+            total = state['totals'].get(step.label, 0)
+            chunks = 0
+            start = time.perf_counter()
+            while True:
+                if throttle:
+                    throttle.before_statement(conn)
+                hi, affected = run_transaction(conn, _run_chunk, step, params, lo, chunk_size)
+                total += affected
+                chunks += 1
+                if throttle:
+                    throttle.after_statement(affected)
+
+                state.update(step=index, last_id=hi or MAX_UUID, totals={**state['totals'], step.label: total})
+                checkpoint.save(state)
+                if hi is None:
+                    break
+                lo = hi
+
+            print(f"✅ {step.label}: {total} rows in {chunks} chunks ({time.perf_counter() - start:.2f}s)")
+            state.update(step=index + 1, last_id=MIN_UUID)
+            checkpoint.save(state)
+    except (Exception, KeyboardInterrupt):
+        conn.rollback()
+        print(f"💾 Progress saved to {checkpoint.path}; rerun to resume")
+        raise
+
+    checkpoint.clear()
+    return state['totals']
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Ops Database Layer
+Shared pooled PostgreSQL connections for the database maintenance scripts
+"""
+
+import atexit
+import os
+import random
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+
+# Connection settings (read from the environment, like the api/ handlers)
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "4"))
+STATEMENT_TIMEOUT_MS = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", "60000"))
+CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", "10"))
+MAX_RETRIES = int(os.environ.get("DB_MAX_RETRIES", "3"))
+RETRY_BACKOFF = float(os.environ.get("DB_RETRY_BACKOFF", "0.5"))
+
+# Query profiling (see ops_profile.py): DB_PROFILE=1 prints a per-statement timing table at exit,
+# DB_PROFILE_OUTPUT=path also writes every span there as JSON (or OTLP/JSON with DB_PROFILE_FORMAT=otel)
+PROFILE = os.environ.get("DB_PROFILE", "").lower() in ("1", "true", "yes") or bool(os.environ.get("DB_PROFILE_OUTPUT"))
+PROFILE_OUTPUT = os.environ.get("DB_PROFILE_OUTPUT")
+PROFILE_FORMAT = os.environ.get("DB_PROFILE_FORMAT", "json")
+
+# Rows fetched per network round trip by server-side cursors
+DEFAULT_ITERSIZE = 2000
+
+# Errors worth retrying when connecting or checking out: dropped connections and failovers
+TRANSIENT_ERRORS = (
+    psycopg2.OperationalError,
+    psycopg2.InterfaceError,
+)
+
+# Errors after which a transaction can be rolled back and rerun on the same connection:
+# serialization failures and deadlocks
+RETRYABLE_TRANSACTION_ERRORS = (
+    psycopg2.extensions.TransactionRollbackError,
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_database_url():
+    """Return the database URL from the environment"""
+    return os.environ.get("DATABASE_URL") or os.environ.get("POSTGRES_URL")
+
+
+def _retry_delay(attempt, backoff):
+    return backoff * (2 ** attempt) * (1 + random.random() * 0.25)
+
+
+def with_retry(func, *args, retries=None, backoff=None, **kwargs):
+    """Call func, retrying transient connection errors with exponential backoff"""
+    retries = MAX_RETRIES if retries is None else retries
+    backoff = RETRY_BACKOFF if backoff is None else backoff
+    attempt = 0
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except TRANSIENT_ERRORS as e:
+            if attempt >= retries:
+                raise
+            delay = _retry_delay(attempt, backoff)
+            attempt += 1
+            print(f"⚠️  Transient database error ({e.__class__.__name__}), retry {attempt}/{retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def run_transaction(conn, func, *args, retries=None, backoff=None, **kwargs):
+    """Call func(cursor, ...) and commit, rerunning the whole transaction on serialization failures and deadlocks.
+
+    func must be safe to run again from the start, since everything it did
+    is rolled back before a retry. Returns what func returned.
+    """
+    retries = MAX_RETRIES if retries is None else retries
+    backoff = RETRY_BACKOFF if backoff is None else backoff
+    attempt = 0
+    while True:
+        cursor = conn.cursor()
+        try:
+            result = func(cursor, *args, **kwargs)
+            conn.commit()
+            return result
+        except RETRYABLE_TRANSACTION_ERRORS as e:
+            conn.rollback()
+            if attempt >= retries:
+                raise
+            delay = _retry_delay(attempt, backoff)
+            attempt += 1
+            print(f"⚠️  {e.__class__.__name__} ({e.pgcode}), rerunning transaction {attempt}/{retries} in {delay:.1f}s")
+            time.sleep(delay)
+        finally:
+            cursor.close()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            database_url = get_database_url()
+            if not database_url:
+                raise RuntimeError("DATABASE_URL or POSTGRES_URL environment variable is required")
+            extra = {}
+            if PROFILE:
+                from ops_profile import enable_profiling
+                extra["cursor_factory"] = enable_profiling(PROFILE_OUTPUT, PROFILE_FORMAT)
+            _pool = with_retry(
+                psycopg2.pool.ThreadedConnectionPool,
+                1,
+                POOL_SIZE,
+                database_url,
+                connect_timeout=CONNECT_TIMEOUT,
+                application_name="boneboard-ops",
+                options=f"-c statement_timeout={STATEMENT_TIMEOUT_MS}",
+                **extra,
+            )
+        return _pool
+
+
+def _checkout():
+    """Take a live connection from the pool, replacing any that went stale"""
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()
+    except TRANSIENT_ERRORS:
+        pool.putconn(conn, close=True)
+        raise
+    return conn
+
+
+def checkout_connection():
+    """Take a pooled connection without printing progress, retrying transient failures"""
+    return with_retry(_checkout)
+
+
+def connect_to_database():
+    """Get a pooled connection to the PostgreSQL database"""
+    try:
+        print("🔌 Connecting to BoneBoard database...")
+        conn = checkout_connection()
+        print("✅ Connected successfully")
+        return conn
+    except Exception as e:
+        print(f"❌ Database connection failed: {e}")
+        return None
+
+
+def release_connection(conn):
+    """Return a connection to the pool, discarding it if it is broken"""
+    if conn is None or _pool is None:
+        return
+    if conn.closed:
+        _pool.putconn(conn, close=True)
+        return
+    try:
+        conn.rollback()
+        _pool.putconn(conn)
+    except TRANSIENT_ERRORS:
+        _pool.putconn(conn, close=True)
+
+
+def stream_rows(conn, query, params=None, itersize=DEFAULT_ITERSIZE, limit=None, name="ops_stream"):
+    """Yield rows from a named server-side cursor, itersize rows per round trip.
+
+    Only one batch is held in memory at a time. Stopping after limit rows
+    closes the cursor without fetching the remainder of the result set.
+    """
+    cursor = conn.cursor(name=name)
+    cursor.itersize = itersize if limit is None else min(itersize, limit)
+    try:
+        cursor.execute(query, params)
+        for count, row in enumerate(cursor, 1):
+            yield row
+            if limit is not None and count >= limit:
+                break
+    finally:
+        cursor.close()
+
+
+def close_pool():
+    """Close every pooled connection"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+atexit.register(close_pool)
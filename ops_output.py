@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Ops Output Writers
+Streams query results to stdout as JSON, NDJSON or CSV for monitoring jobs
+"""
+
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import chain, islice
+from uuid import UUID
+
+from ops_db import DEFAULT_ITERSIZE
+
+OUTPUT_FORMATS = ("text", "json", "ndjson", "csv")
+
+
+def _json_default(value):
+    """Encode the non-JSON types psycopg2 returns"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        # As a string: a float can't hold every DECIMAL(15,6) ADA amount exactly
+        return str(value)
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+def write_rows(rows, columns, fmt, out):
+    """Write an iterable of row tuples in the given format, one row at a time"""
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        writer.writerows(rows)
+        return
+
+    encoder = json.JSONEncoder(default=_json_default, ensure_ascii=False)
+    if fmt == "ndjson":
+        for row in rows:
+            out.write(encoder.encode(dict(zip(columns, row))))
+            out.write("\n")
+    elif fmt == "json":
+        out.write("[")
+        for i, row in enumerate(rows):
+            out.write(",\n" if i else "\n")
+            out.write(encoder.encode(dict(zip(columns, row))))
+        out.write("\n]\n")
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
+
+
+def write_document(document, fmt, out):
+    """Write a single nested dict (e.g. a stats report) in the given format.
+
+    CSV output flattens nested keys into metric,value rows.
+    """
+    if fmt == "csv":
+        write_rows(_flatten(document), ("metric", "value"), fmt, out)
+    else:
+        out.write(json.dumps(document, default=_json_default, ensure_ascii=False))
+        out.write("\n")
+
+
+def _flatten(value, prefix=""):
+    """Yield (dotted_key, scalar) pairs for a nested dict/list"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{prefix}{key}.")
+    elif isinstance(value, (list, tuple)):
+        for i, item in enumerate(value):
+            yield from _flatten(item, f"{prefix}{i}.")
+    else:
+        yield prefix.rstrip("."), value
+
+
+def export_query(conn, query, params, fmt, out, itersize=DEFAULT_ITERSIZE, limit=None, name="ops_export"):
+    """Stream a query's rows from a server-side cursor straight to out"""
+    cursor = conn.cursor(name=name)
+    cursor.itersize = itersize if limit is None else min(itersize, limit)
+    try:
+        cursor.execute(query, params)
+        rows = iter(cursor)
+        # The column list is only known once the first batch has been fetched
+        first = next(rows, None)
+        columns = [column[0] for column in cursor.description] if cursor.description else []
+        rows = chain([first], rows) if first is not None else iter(())
+        if limit is not None:
+            rows = islice(rows, limit)
+        write_rows(rows, columns, fmt, out)
+    finally:
+        cursor.close()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Ops Query Profiler
+A psycopg2 cursor that records every statement's execution and fetch time,
+printing a summary table at exit and optionally writing the spans to a file
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import psycopg2.extensions
+from psycopg2 import sql
+
+# Enabled with DB_PROFILE=1; spans go to DB_PROFILE_OUTPUT as plain JSON or OTLP/JSON
+PROFILE_FORMATS = ("json", "otel")
+
+# Statement text shown in the summary table
+SUMMARY_WIDTH = 70
+
+_spans = []
+_spans_lock = threading.Lock()
+_trace_id = os.urandom(16).hex()
+
+
+def _statement_text(cursor, query):
+    """Return a query's SQL text (without parameter values) on one line"""
+    if isinstance(query, sql.Composable):
+        query = query.as_string(cursor)
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "replace")
+    return " ".join(query.split())
+
+
+def _param_count(params):
+    if params is None:
+        return 0
+    return len(params)
+
+
+def _collapse_values(query, rows):
+    """Put execute_values' %s placeholder back in place of the mogrified rows it joined into query.
+
+    Returns None if query isn't a statement built from rows that way.
+    """
+    if isinstance(query, str):
+        query = query.encode("utf-8")
+    joined = b",".join(rows)
+    start = query.find(joined)
+    if not rows or start < 0:
+        return None
+    return query[:start] + b"%s" + query[start + len(joined):]
+
+
+class QuerySpan:
+    """Timing for one executed statement and the fetches that followed it"""
+
+    __slots__ = ("statement", "params", "rows", "start", "exec_s", "fetch_s", "cursor", "error", "span_id")
+
+    def __init__(self, statement, params, cursor):
+        self.statement = statement
+        self.params = params
+        self.rows = 0
+        self.start = time.time()
+        self.exec_s = 0.0
+        self.fetch_s = 0.0
+        self.cursor = cursor
+        self.error = None
+        self.span_id = os.urandom(8).hex()
+
+    @property
+    def operation(self):
+        return self.statement.split(" ", 1)[0].upper() if self.statement else ""
+
+    def as_dict(self):
+        return {
+            "statement": self.statement,
+            "operation": self.operation,
+            "params": self.params,
+            "rows": self.rows,
+            "start": self.start,
+            "exec_ms": round(self.exec_s * 1000, 3),
+            "fetch_ms": round(self.fetch_s * 1000, 3),
+            "cursor": self.cursor,
+            "error": self.error,
+        }
+
+    def as_otel(self):
+        """Span in OTLP/JSON shape with OpenTelemetry database semantic-convention attributes"""
+        start_ns = int(self.start * 1e9)
+        end_ns = start_ns + int((self.exec_s + self.fetch_s) * 1e9)
+        attributes = {
+            "db.system": "postgresql",
+            "db.statement": self.statement,
+            "db.operation": self.operation,
+            "db.params.count": self.params,
+            "db.rows": self.rows,
+            "db.fetch_ms": round(self.fetch_s * 1000, 3),
+        }
+        return {
+            "traceId": _trace_id,
+            "spanId": self.span_id,
+            "name": f"{self.operation} {self.cursor}" if self.cursor else self.operation,
+            "kind": 3,  # SPAN_KIND_CLIENT
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": [
+                {"key": key, "value": {"intValue": str(value)} if isinstance(value, int) else
+                 {"doubleValue": value} if isinstance(value, float) else {"stringValue": value}}
+                for key, value in attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+
+
+class ProfilingCursor(psycopg2.extensions.cursor):
+    """Cursor that records a QuerySpan for every execute and times the fetches after it.
+
+    Spans hold the statement text and the number of parameters per row, never the values.
+    """
+
+    _span = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Rows mogrified since the last execute, and the parameters in each (see execute)
+        self._mogrified = []
+        self._row_params = 0
+
+    def mogrify(self, query, vars=None):
+        result = super().mogrify(query, vars)
+        self._mogrified.append(result)
+        self._row_params = _param_count(vars)
+        return result
+
+    def _record(self, query, param_count, run):
+        span = QuerySpan(_statement_text(self, query), param_count, self.name)
+        self._span = span
+        with _spans_lock:
+            _spans.append(span)
+        start = time.perf_counter()
+        try:
+            return run()
+        except Exception as e:
+            span.error = f"{e.__class__.__name__}: {str(e).strip()}"
+            raise
+        finally:
+            span.exec_s = time.perf_counter() - start
+            if not self.name and self.rowcount > 0:
+                span.rows = self.rowcount
+
+    def execute(self, query, vars=None):
+        # execute_values mogrifies every row and executes the joined text without parameters;
+        # record the caller's VALUES %s statement instead of one with the values inlined
+        mogrified, self._mogrified = self._mogrified, []
+        template = _collapse_values(query, mogrified) if vars is None and mogrified else None
+        if template is not None:
+            return self._record(template, self._row_params, lambda: super(ProfilingCursor, self).execute(query))
+        return self._record(query, _param_count(vars), lambda: super(ProfilingCursor, self).execute(query, vars))
+
+    def executemany(self, query, vars_list):
+        vars_list = list(vars_list)
+        param_count = _param_count(vars_list[0]) if vars_list else 0
+        return self._record(query, param_count, lambda: super(ProfilingCursor, self).executemany(query, vars_list))
+
+    def copy_expert(self, sql, file, size=8192):
+        return self._record(sql, 0, lambda: super(ProfilingCursor, self).copy_expert(sql, file, size))
+
+    def _timed_fetch(self, fetch, *args):
+        start = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            if self._span is not None:
+                self._span.fetch_s += time.perf_counter() - start
+
+    def fetchone(self):
+        row = self._timed_fetch(super().fetchone)
+        if row is not None and self.name and self._span is not None:
+            self._span.rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed_fetch(super().fetchmany, *(() if size is None else (size,)))
+        if self.name and self._span is not None:
+            self._span.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed_fetch(super().fetchall)
+        if self.name and self._span is not None:
+            self._span.rows += len(rows)
+        return rows
+
+    def __iter__(self):
+        # Batched like the default iterator: one FETCH per itersize rows on named cursors
+        while True:
+            rows = self.fetchmany(self.itersize)
+            if not rows:
+                return
+            yield from rows
+
+
+def get_spans():
+    """Return a snapshot of every recorded span"""
+    with _spans_lock:
+        return list(_spans)
+
+
+def summarize(spans):
+    """Aggregate spans by statement text, slowest total first"""
+    groups = OrderedDict()
+    for span in spans:
+        group = groups.setdefault(span.statement, {"calls": 0, "rows": 0, "exec_s": 0.0, "fetch_s": 0.0,
+                                                   "max_s": 0.0, "errors": 0})
+        group["calls"] += 1
+        group["rows"] += span.rows
+        group["exec_s"] += span.exec_s
+        group["fetch_s"] += span.fetch_s
+        group["max_s"] = max(group["max_s"], span.exec_s + span.fetch_s)
+        group["errors"] += bool(span.error)
+    return sorted(groups.items(), key=lambda item: item[1]["exec_s"] + item[1]["fetch_s"], reverse=True)
+
+
+def print_summary(spans, out=None, limit=20):
+    """Print the per-statement timing table"""
+    out = out or sys.stderr
+    if not spans:
+        return
+    rows = summarize(spans)
+    total = sum(group["exec_s"] + group["fetch_s"] for _, group in rows)
+    print(f"\n⏱️  QUERY PROFILE ({len(spans)} statements, {total * 1000:.1f} ms in the database driver)", file=out)
+    print(f"{'calls':>6} {'rows':>9} {'exec ms':>10} {'fetch ms':>10} {'max ms':>9}  statement", file=out)
+    print("-" * (50 + SUMMARY_WIDTH), file=out)
+    for statement, group in rows[:limit]:
+        text = statement if len(statement) <= SUMMARY_WIDTH else statement[:SUMMARY_WIDTH - 3] + "..."
+        flag = " ❌" if group["errors"] else ""
+        print(f"{group['calls']:>6} {group['rows']:>9} {group['exec_s'] * 1000:>10.1f} "
+              f"{group['fetch_s'] * 1000:>10.1f} {group['max_s'] * 1000:>9.1f}  {text}{flag}", file=out)
+    if len(rows) > limit:
+        print(f"   ... and {len(rows) - limit} more statements", file=out)
+
+
+def write_spans(spans, path, fmt="json"):
+    """Write spans to path as a JSON list or an OTLP/JSON trace document"""
+    if fmt == "otel":
+        document = {"resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": "boneboard-ops"}},
+                {"key": "process.command", "value": {"stringValue": os.path.basename(sys.argv[0])}},
+            ]},
+            "scopeSpans": [{"scope": {"name": "ops_profile"}, "spans": [span.as_otel() for span in spans]}],
+        }]}
+    else:
+        document = [span.as_dict() for span in spans]
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+
+def enable_profiling(output=None, fmt="json"):
+    """Print the summary (and write spans to output) when the process exits"""
+    if fmt not in PROFILE_FORMATS:
+        raise ValueError(f"Unsupported profile format: {fmt}")
+
+    def report():
+        spans = get_spans()
+        print_summary(spans)
+        if output and spans:
+            write_spans(spans, output, fmt)
+            print(f"💾 {len(spans)} query spans written to {output}", file=sys.stderr)
+
+    atexit.register(report)
+    return ProfilingCursor
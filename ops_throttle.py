@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Ops Throttle
+Paces bulk maintenance statements (rows and statements per second) and backs
+off while the database shows lock waits, replication lag or a busy
+connection count, so maintenance yields to API traffic
+"""
+
+import time
+
+# Seconds between pg_stat_activity / replication health checks
+DEFAULT_CHECK_INTERVAL = 2.0
+
+# Backoff while the database is unhealthy: starts here, doubles, capped at MAX_BACKOFF
+MIN_BACKOFF = 1.0
+MAX_BACKOFF = 30.0
+
+HEALTH_QUERY = """
+    SELECT
+        COUNT(*) FILTER (WHERE wait_event_type = 'Lock'),
+        COUNT(*) FILTER (WHERE state = 'active'),
+        COALESCE((SELECT MAX(EXTRACT(EPOCH FROM replay_lag)) FROM pg_stat_replication), 0),
+        COALESCE(EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp()), 0)
+    FROM pg_stat_activity
+    WHERE datname = current_database()
+    AND backend_type = 'client backend'
+    AND pid <> pg_backend_pid()
+"""
+
+
+class Throttle:
+    """Rate limits and load-based backoff for batched maintenance statements.
+
+    Call before_statement(conn) between transactions (it may sleep and runs
+    its health check in a short transaction of its own) and
+    after_statement(rows) once a statement's rows are known. A Throttle with
+    no limits set does nothing.
+    """
+
+    def __init__(self, rows_per_sec=None, statements_per_sec=None, max_lock_waits=None,
+                 max_active=None, max_replication_lag=None, check_interval=DEFAULT_CHECK_INTERVAL):
+        self.rows_per_sec = rows_per_sec
+        self.statements_per_sec = statements_per_sec
+        self.max_lock_waits = max_lock_waits
+        self.max_active = max_active
+        self.max_replication_lag = max_replication_lag
+        self.check_interval = check_interval
+        self.slept = 0.0
+        self.backoffs = 0
+        self._last_statement = None
+        self._last_check = None
+        self._row_debt = 0.0
+        self._row_clock = None
+
+    @classmethod
+    def from_args(cls, args):
+        """Build a Throttle from the options added by add_throttle_args"""
+        return cls(args.max_rows_per_sec, args.max_statements_per_sec, args.max_lock_waits,
+                   args.max_active, args.max_replication_lag)
+
+    @property
+    def enabled(self):
+        return any(limit is not None for limit in (
+            self.rows_per_sec, self.statements_per_sec, self.max_lock_waits,
+            self.max_active, self.max_replication_lag))
+
+    @property
+    def watches_load(self):
+        return any(limit is not None for limit in (self.max_lock_waits, self.max_active, self.max_replication_lag))
+
+    def _sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+            self.slept += seconds
+
+    def check_health(self, conn):
+        """Return a description of the first exceeded load threshold, or None if the database is healthy"""
+        cursor = conn.cursor()
+        try:
+            cursor.execute(HEALTH_QUERY)
+            lock_waits, active, primary_lag, replica_lag = cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.commit()
+        lag = max(float(primary_lag), float(replica_lag))
+        if self.max_lock_waits is not None and lock_waits > self.max_lock_waits:
+            return f"{lock_waits} sessions waiting on locks"
+        if self.max_active is not None and active > self.max_active:
+            return f"{active} active connections"
+        if self.max_replication_lag is not None and lag > self.max_replication_lag:
+            return f"replication lag {lag:.1f}s"
+        return None
+
+    def before_statement(self, conn):
+        """Wait for the statement-rate limit, then until the database is healthy"""
+        if not self.enabled:
+            return
+        if self.statements_per_sec and self._last_statement is not None:
+            self._sleep(self._last_statement + 1.0 / self.statements_per_sec - time.monotonic())
+
+        now = time.monotonic()
+        if self.watches_load and (self._last_check is None or now - self._last_check >= self.check_interval):
+            backoff = MIN_BACKOFF
+            while True:
+                reason = self.check_health(conn)
+                self._last_check = time.monotonic()
+                if reason is None:
+                    break
+                self.backoffs += 1
+                print(f"⏸️  Backing off {backoff:.0f}s: {reason}")
+                self._sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+        self._last_statement = time.monotonic()
+
+    def after_statement(self, rows):
+        """Account for rows just written, sleeping off any excess over the row-rate limit"""
+        if not self.rows_per_sec:
+            return
+        now = time.monotonic()
+        if self._row_clock is not None:
+            self._row_debt = max(0.0, self._row_debt - (now - self._row_clock))
+        self._row_debt += rows / self.rows_per_sec
+        self._row_clock = now
+        # Allow up to a second of burst before pausing
+        if self._row_debt > 1.0:
+            self._sleep(self._row_debt - 1.0)
+            self._row_clock = time.monotonic()
+            self._row_debt = 1.0
+
+    def report(self):
+        """Print how much the throttle held the run back"""
+        if self.enabled and (self.slept or self.backoffs):
+            print(f"🐢 Throttle: slept {self.slept:.1f}s, {self.backoffs} load backoffs")
+
+
+def add_throttle_args(parser):
+    """Add the shared throttling options to an argparse parser"""
+    group = parser.add_argument_group("throttling (yield to API traffic)")
+    group.add_argument("--max-rows-per-sec", type=float, default=None,
+                       help="limit rows written per second")
+    group.add_argument("--max-statements-per-sec", type=float, default=None,
+                       help="limit write statements per second")
+    group.add_argument("--max-lock-waits", type=int, default=None,
+                       help="back off while more than N other sessions wait on locks")
+    group.add_argument("--max-active", type=int, default=None,
+                       help="back off while more than N other connections are active")
+    group.add_argument("--max-replication-lag", type=float, default=None,
+                       help="back off while replication lag exceeds N seconds")
+    return group
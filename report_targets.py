@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+BoneBoard Scam Report Targets
+Adds typed, indexed project_id/job_id columns to scam_reports, backfills
+them in batches and verifies them against the old regex-and-cast join the
+admin report views used
+"""
+
+import argparse
+import sys
+import time
+
+from ops_db import connect_to_database, release_connection
+
+# Reports resolved per UPDATE statement
+DEFAULT_BATCH_SIZE = 1000
+
+# Backfill batches give up rather than queue behind a long transaction on scam_reports
+BACKFILL_LOCK_TIMEOUT = '2s'
+
+# The test the API applied to scam_identifier before casting it
+UUID_PATTERN = '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+
+SAMPLE_LIMIT = 20
+
+# Plain columns without foreign keys: a foreign key would make TRUNCATE ... CASCADE on
+# projects or job_listings (clear_database.py --fast) empty scam_reports too. A target
+# deleted later leaves a stale id behind, which the LEFT JOINs drop the same way the old
+# join dropped a dangling scam_identifier. The constraints an earlier run added are removed.
+ADD_COLUMNS = """
+    ALTER TABLE scam_reports
+        ADD COLUMN IF NOT EXISTS project_id UUID,
+        ADD COLUMN IF NOT EXISTS job_id UUID,
+        DROP CONSTRAINT IF EXISTS scam_reports_project_id_fkey,
+        DROP CONSTRAINT IF EXISTS scam_reports_job_id_fkey
+"""
+
+# Resolves the target when a report is written, so new reports never need the backfill
+CREATE_TRIGGER = f"""
+    CREATE OR REPLACE FUNCTION resolve_scam_report_target()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        NEW.project_id = NULL;
+        NEW.job_id = NULL;
+        IF NEW.scam_identifier ~ '{UUID_PATTERN}' THEN
+            IF NEW.scam_type = 'project' THEN
+                SELECT id INTO NEW.project_id FROM projects WHERE id = NEW.scam_identifier::uuid;
+            ELSIF NEW.scam_type = 'user' THEN
+                SELECT id INTO NEW.job_id FROM job_listings WHERE id = NEW.scam_identifier::uuid;
+            END IF;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ language 'plpgsql';
+
+    DROP TRIGGER IF EXISTS resolve_scam_report_target ON scam_reports;
+    CREATE TRIGGER resolve_scam_report_target
+        BEFORE INSERT OR UPDATE OF scam_type, scam_identifier ON scam_reports
+        FOR EACH ROW EXECUTE FUNCTION resolve_scam_report_target();
+"""
+
+# Recreates the updated_at trigger so it skips updates that only resolve a target: the
+# admin views sort by updated_at, and the backfill must not reorder them. Comparing the
+# rows here means the backfill never has to disable the trigger (ALTER TABLE would block
+# API writes to scam_reports for every batch).
+TARGET_COLUMNS_CHANGED = (
+    "(OLD.project_id, OLD.job_id) IS DISTINCT FROM (NEW.project_id, NEW.job_id)"
+)
+OTHER_COLUMNS_CHANGED = (
+    "to_jsonb(OLD) - 'project_id' - 'job_id' - 'updated_at' "
+    "IS DISTINCT FROM to_jsonb(NEW) - 'project_id' - 'job_id' - 'updated_at'"
+)
+UPDATED_AT_TRIGGER = f"""
+    DROP TRIGGER IF EXISTS update_scam_reports_updated_at ON scam_reports;
+    CREATE TRIGGER update_scam_reports_updated_at
+        BEFORE UPDATE ON scam_reports
+        FOR EACH ROW
+        WHEN (NOT ({TARGET_COLUMNS_CHANGED}) OR {OTHER_COLUMNS_CHANGED})
+        EXECUTE FUNCTION update_updated_at_column();
+"""
+
+# CREATE INDEX CONCURRENTLY can't run inside a transaction block
+CREATE_INDEXES = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_scam_reports_project_id ON scam_reports(project_id) "
+    "WHERE project_id IS NOT NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_scam_reports_job_id ON scam_reports(job_id) "
+    "WHERE job_id IS NOT NULL",
+]
+
+# The joins api/reports/index.ts used before the typed columns existed. The API wrote the
+# regex test and the CAST as sibling AND terms, which Postgres may evaluate in either order
+# (failing on wallet-address identifiers); the CASE here forces the test to run first.
+LEGACY_TARGET = f"CASE WHEN r.scam_identifier ~ '{UUID_PATTERN}' THEN CAST(r.scam_identifier AS UUID) END"
+
+LEGACY_JOINS = f"""
+    LEFT JOIN projects p ON ({LEGACY_TARGET} = p.id AND r.scam_type = 'project')
+    LEFT JOIN job_listings j ON ({LEGACY_TARGET} = j.id AND r.scam_type = 'user')
+"""
+
+TYPED_JOINS = """
+    LEFT JOIN projects p ON p.id = r.project_id
+    LEFT JOIN job_listings j ON j.id = r.job_id
+"""
+
+# Resolves the next batch of reports by id and writes only the ones whose target changed.
+# Returns the last id in the batch (NULL once past the end) and the rows updated.
+BACKFILL_QUERY = f"""
+    WITH batch AS (
+        SELECT r.id, p.id AS project_id, j.id AS job_id
+        FROM scam_reports r
+        {LEGACY_JOINS}
+        WHERE r.id > %(after)s::uuid
+        ORDER BY r.id
+        LIMIT %(batch_size)s
+    ),
+    updated AS (
+        UPDATE scam_reports r
+        SET project_id = b.project_id, job_id = b.job_id
+        FROM batch b
+        WHERE r.id = b.id
+        AND (r.project_id, r.job_id) IS DISTINCT FROM (b.project_id, b.job_id)
+        RETURNING 1
+    )
+    SELECT (SELECT id FROM batch ORDER BY id DESC LIMIT 1), (SELECT COUNT(*) FROM updated)
+"""
+
+# Reports whose typed join finds a different target than the old join; stale ids of
+# deleted targets join to nothing on both sides and so don't count
+VERIFY_QUERY = f"""
+    SELECT r.id, r.scam_type, r.scam_identifier, p.id, j.id, r.project_id, r.job_id
+    FROM scam_reports r
+    {LEGACY_JOINS}
+    LEFT JOIN projects tp ON tp.id = r.project_id
+    LEFT JOIN job_listings tj ON tj.id = r.job_id
+    WHERE (p.id, j.id) IS DISTINCT FROM (tp.id, tj.id)
+    ORDER BY r.id
+"""
+
+# Shape of the admin listing, used to time the old join against the new one
+LISTING_QUERY = """
+    SELECT r.id,
+           CASE
+             WHEN r.scam_type = 'project' THEN p.title
+             WHEN r.scam_type = 'user' THEN j.title
+             ELSE r.scam_identifier
+           END as project_name
+    FROM scam_reports r
+    {joins}
+    WHERE r.status IN ('pending', 'verified')
+    ORDER BY r.created_at DESC
+"""
+
+
+def migrate(conn):
+    """Add the target columns, the resolving and updated_at triggers and the partial indexes"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(ADD_COLUMNS)
+        cursor.execute(CREATE_TRIGGER)
+        cursor.execute(UPDATED_AT_TRIGGER)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    conn.autocommit = True
+    cursor = conn.cursor()
+    try:
+        for statement in CREATE_INDEXES:
+            cursor.execute(statement)
+    finally:
+        cursor.close()
+        conn.autocommit = False
+    print("✅ scam_reports has project_id/job_id, their indexes and triggers")
+
+
+def backfill(conn, batch_size=DEFAULT_BATCH_SIZE):
+    """Resolve every report's target, one batch per transaction.
+
+    Rows that already hold the right target are left alone, so the backfill
+    can be rerun at any time to repair drift. The updated_at trigger ignores
+    target-only updates, so batches leave updated_at alone without touching
+    the table's triggers. Returns the number of reports updated.
+    """
+    cursor = conn.cursor()
+    after = '00000000-0000-0000-0000-000000000000'
+    total = 0
+    batches = 0
+    try:
+        while True:
+            cursor.execute("SELECT set_config('lock_timeout', %s, true)", (BACKFILL_LOCK_TIMEOUT,))
+            cursor.execute(BACKFILL_QUERY, {'after': after, 'batch_size': batch_size})
+            last_id, updated = cursor.fetchone()
+            conn.commit()
+            if last_id is None:
+                break
+            after = last_id
+            total += updated
+            batches += 1
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    print(f"✅ Backfilled {total} report targets in {batches} batches")
+    return total
+
+
+def verify(conn):
+    """Return the reports whose typed targets differ from the old join's.
+
+    Each row is (id, scam_type, scam_identifier, legacy project, legacy job,
+    project_id, job_id).
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(VERIFY_QUERY)
+        return cursor.fetchall()
+    finally:
+        conn.rollback()
+        cursor.close()
+
+
+def time_listing(conn):
+    """Run the admin listing with both joins and return {name: (rows, seconds)}"""
+    cursor = conn.cursor()
+    timings = {}
+    try:
+        for name, joins in (('legacy', LEGACY_JOINS), ('typed', TYPED_JOINS)):
+            start = time.perf_counter()
+            cursor.execute(LISTING_QUERY.format(joins=joins))
+            rows = cursor.fetchall()
+            timings[name] = (rows, time.perf_counter() - start)
+    finally:
+        conn.rollback()
+        cursor.close()
+    return timings
+
+
+def print_verify(mismatches, timings):
+    """Print the verification result"""
+    (legacy_rows, legacy_s), (typed_rows, typed_s) = timings['legacy'], timings['typed']
+    same_listing = legacy_rows == typed_rows
+    print(f"\n⏱️  Admin listing: legacy join {legacy_s * 1000:.1f} ms, typed join {typed_s * 1000:.1f} ms "
+          f"({len(typed_rows)} reports, {'identical' if same_listing else 'DIFFERENT'} results)")
+
+    if not mismatches:
+        print("✅ Typed targets match the legacy join for every report")
+        return
+    print(f"❌ {len(mismatches)} reports differ from the legacy join:")
+    for report_id, scam_type, identifier, project, job, project_id, job_id in mismatches[:SAMPLE_LIMIT]:
+        print(f"   {report_id} [{scam_type}] {identifier}: legacy {project or job}, typed {project_id or job_id}")
+    if len(mismatches) > SAMPLE_LIMIT:
+        print(f"   ... and {len(mismatches) - SAMPLE_LIMIT} more")
+    print("   Rerun with --backfill to repair")
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="BoneBoard scam report target migration")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"reports resolved per UPDATE (default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--backfill", action="store_true",
+                        help="only run the backfill (the migration must already have run)")
+    parser.add_argument("--verify", action="store_true",
+                        help="only compare the typed targets with the legacy join (exit 1 on mismatch)")
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_args()
+
+    print("🛡️  BoneBoard Scam Report Targets")
+    print("=" * 50)
+
+    conn = connect_to_database()
+    if not conn:
+        sys.exit(1)
+
+    # With neither flag: migrate, backfill, then verify
+    everything = not args.backfill and not args.verify
+    mismatches = []
+    try:
+        if everything:
+            migrate(conn)
+        if everything or args.backfill:
+            backfill(conn, args.batch_size)
+        if everything or args.verify:
+            mismatches = verify(conn)
+            print_verify(mismatches, time_listing(conn))
+    except Exception as e:
+        print(f"❌ Error during report target migration: {e}")
+        sys.exit(1)
+    finally:
+        release_connection(conn)
+        print("\n🔌 Database connection closed")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()